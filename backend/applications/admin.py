@@ -1,8 +1,27 @@
 from django.contrib import admin
-from applications.models import Submission
+from applications.models import ApplicantRanking, Submission, SubmissionTicket, ThesisPreference
 
 @admin.register(Submission)
 class SubmissionAdmin(admin.ModelAdmin):
     list_display = ['student', 'thesis', 'status']
     list_filter = ['thesis__thesis_type', 'thesis__status']
     search_fields = ['student__user__username', 'student__user__first_name', 'student__user__last_name', 'thesis__name']
+
+
+@admin.register(ThesisPreference)
+class ThesisPreferenceAdmin(admin.ModelAdmin):
+    list_display = ['student', 'thesis', 'rank']
+    search_fields = ['student__user__username', 'student__user__last_name', 'thesis__name']
+
+
+@admin.register(ApplicantRanking)
+class ApplicantRankingAdmin(admin.ModelAdmin):
+    list_display = ['thesis', 'student', 'rank']
+    search_fields = ['student__user__username', 'student__user__last_name', 'thesis__name']
+
+
+@admin.register(SubmissionTicket)
+class SubmissionTicketAdmin(admin.ModelAdmin):
+    list_display = ['id', 'student', 'thesis', 'status', 'created_at', 'processed_at']
+    list_filter = ['status']
+    search_fields = ['student__user__username', 'student__user__last_name', 'thesis__name']
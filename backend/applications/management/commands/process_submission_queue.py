@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from applications.models import TicketStatus
+from applications.services.submission_service import SubmissionService
+
+
+class Command(BaseCommand):
+    help = 'Przetwarza kolejkę zgłoszeń na prace dyplomowe partiami, w kolejności złożenia. Można uruchomić kilka procesów naraz.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.SUBMISSION_QUEUE_BATCH_SIZE, help='Liczba zgłoszeń w partii.')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Przerwa w sekundach, gdy kolejka jest pusta.')
+        parser.add_argument('--once', action='store_true', help='Kończy pracę, gdy kolejka jest pusta.')
+
+    def handle(self, *args, **options):
+        submission_service = SubmissionService()
+
+        while True:
+            tickets = submission_service.process_submission_queue(options['batch_size'])
+            if tickets:
+                accepted = sum(1 for ticket in tickets if ticket.status == TicketStatus.ACCEPTED)
+                self.stdout.write(f'Przetworzono {len(tickets)} zgłoszeń: przyjęto {accepted}, odrzucono {len(tickets) - accepted}.')
+            elif options['once']:
+                break
+            else:
+                time.sleep(options['sleep'])
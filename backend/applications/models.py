@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from thesis.models import Thesis
 from users.models import StudentProfile
 
@@ -16,3 +17,89 @@ class Submission(models.Model):
         choices=SubmissionStatus.choices,
         default=SubmissionStatus.OPEN
     )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class ThesisPreference(models.Model):
+    """
+        A thesis on a student's ranked list for the assignment round,
+        rank 1 being the most wanted.
+    """
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE)
+    thesis = models.ForeignKey(Thesis, on_delete=models.CASCADE)
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'thesis'], name='unique_thesis_preference'),
+            models.UniqueConstraint(fields=['student', 'rank'], name='unique_thesis_preference_rank'),
+        ]
+
+
+class ApplicantRanking(models.Model):
+    """
+        A student on a supervisor's ranked list for one of their theses.
+        Students left off the list come after the ranked ones.
+    """
+    thesis = models.ForeignKey(Thesis, on_delete=models.CASCADE)
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE)
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['thesis', 'student'], name='unique_applicant_ranking'),
+            models.UniqueConstraint(fields=['thesis', 'rank'], name='unique_applicant_ranking_rank'),
+        ]
+
+
+class TicketStatus(models.TextChoices):
+    PENDING = 'oczekujące', 'Oczekujące'
+    ACCEPTED = 'przyjęte', 'Przyjęte'
+    REJECTED = 'odrzucone', 'Odrzucone'
+
+
+class SubmissionTicket(models.Model):
+    """
+        A submission waiting in the intake queue, used when
+        SUBMISSION_INTAKE_MODE is 'queued'. Tickets are processed in id order;
+        an accepted ticket has created the student's submission.
+    """
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE)
+    thesis = models.ForeignKey(Thesis, on_delete=models.CASCADE)
+    status = models.CharField(
+        max_length=50,
+        choices=TicketStatus.choices,
+        default=TicketStatus.PENDING
+    )
+    error = models.TextField(
+        blank=True,
+        default=''
+    )
+    created_at = models.DateTimeField(
+        default=timezone.now
+    )
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=models.Q(status=TicketStatus.PENDING),
+                name='pending_ticket_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student'],
+                condition=models.Q(status=TicketStatus.PENDING),
+                name='unique_pending_ticket'
+            ),
+        ]
@@ -0,0 +1,26 @@
+from rest_framework import serializers
+from applications.services.assignment_service import MAX_PREFERENCES
+
+
+def _validate_unique(value):
+    if len(set(value)) != len(value):
+        raise serializers.ValidationError("Lista nie może zawierać powtórzeń.")
+    return value
+
+
+class ThesisPreferenceSerializer(serializers.Serializer):
+    thesis_ids = serializers.ListField(child=serializers.IntegerField(), max_length=MAX_PREFERENCES)
+
+    def validate_thesis_ids(self, value):
+        return _validate_unique(value)
+
+
+class ApplicantRankingSerializer(serializers.Serializer):
+    student_ids = serializers.ListField(child=serializers.IntegerField())
+
+    def validate_student_ids(self, value):
+        return _validate_unique(value)
+
+
+class AssignmentRoundSerializer(serializers.Serializer):
+    dry_run = serializers.BooleanField(default=False)
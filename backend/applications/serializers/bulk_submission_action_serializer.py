@@ -0,0 +1,19 @@
+from rest_framework import serializers
+from applications.services.submission_service import BULK_ACTIONS
+
+MAX_BULK_ITEMS = 500
+
+
+class BulkSubmissionItemSerializer(serializers.Serializer):
+    submission_id = serializers.IntegerField()
+    action = serializers.ChoiceField(choices=BULK_ACTIONS)
+
+
+class BulkSubmissionActionSerializer(serializers.Serializer):
+    items = BulkSubmissionItemSerializer(many=True, allow_empty=False, max_length=MAX_BULK_ITEMS)
+
+    def validate_items(self, value):
+        submission_ids = [item['submission_id'] for item in value]
+        if len(set(submission_ids)) != len(submission_ids):
+            raise serializers.ValidationError("Każde zgłoszenie może wystąpić w partii tylko raz.")
+        return value
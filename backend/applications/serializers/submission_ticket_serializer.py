@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from applications.models import SubmissionTicket
+
+class SubmissionTicketSerializer(serializers.ModelSerializer):
+    position = serializers.IntegerField(read_only=True, allow_null=True, default=None)
+    status_url = serializers.HyperlinkedIdentityField(
+        view_name='submission_ticket',
+        lookup_url_kwarg='ticket_id',
+        read_only=True
+    )
+    
+    class Meta:
+        model = SubmissionTicket
+        fields = ['id', 'thesis', 'status', 'position', 'error', 'created_at', 'processed_at', 'status_url']
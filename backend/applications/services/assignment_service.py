@@ -0,0 +1,192 @@
+import heapq
+import sys
+from collections import Counter, deque
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from applications.models import ApplicantRanking, Submission, SubmissionStatus, ThesisPreference
+from applications.services.submission_service import InvalidStudentIdException, InvalidSupervisorIdException, InvalidThesisIdException, StudentAlreadyAssignedException, ThesisNotAvailableException
+from thesis.models import Thesis, ThesisStatus
+from users.models import Logs, StudentProfile, User
+from common.search_cache import search_cache, TOPICS
+
+
+MAX_PREFERENCES = 20
+
+# Applicants the supervisor did not rank come after the ranked ones.
+UNRANKED = sys.maxsize
+
+
+class InvalidDepartmentException(ValueError):
+    pass
+
+
+def stable_matching(preferences: dict[int, list[int]], priorities: dict[int, dict[int, int]],
+                    capacities: dict[int, int]) -> dict[int, int]:
+    """
+        Student-proposing deferred acceptance. `preferences` maps a student
+        to the theses they want, best first; `priorities` maps a thesis to
+        the supervisor's rank of its applicants; `capacities` maps a thesis
+        to its free places. Returns the student-optimal stable assignment
+        as student -> thesis. Ties are broken by the lower student id.
+    """
+    next_choice = dict.fromkeys(preferences, 0)
+    # Per thesis, a heap of the held students with the least wanted on top.
+    held = {thesis_id: [] for thesis_id in capacities}
+    free = deque(preferences)
+
+    while free:
+        student_id = free.popleft()
+        choices = preferences[student_id]
+        while next_choice[student_id] < len(choices):
+            thesis_id = choices[next_choice[student_id]]
+            next_choice[student_id] += 1
+            capacity = capacities.get(thesis_id, 0)
+            if capacity <= 0:
+                continue
+
+            rank = priorities.get(thesis_id, {}).get(student_id, UNRANKED)
+            entry = (-rank, -student_id, student_id)
+            students = held[thesis_id]
+            if len(students) < capacity:
+                heapq.heappush(students, entry)
+                break
+            if entry > students[0]:
+                rejected = heapq.heapreplace(students, entry)
+                free.append(rejected[2])
+                break
+
+    return {
+        student_id: thesis_id
+        for thesis_id, students in held.items()
+        for _, _, student_id in students
+    }
+
+
+class AssignmentService:
+    def set_preferences(self, student: User, thesis_ids: list[int]):
+        try:
+            student_profile = StudentProfile.objects.get(pk=student.pk)
+        except StudentProfile.DoesNotExist:
+            raise InvalidStudentIdException(f"Nie znaleziono studenta o id: {student.pk}")
+
+        if Submission.objects.filter(student=student_profile).exists():
+            raise StudentAlreadyAssignedException("Student jest już zapisany na pracę, nie może zgłaszać preferencji")
+
+        available = set(Thesis.objects.filter(
+            pk__in=thesis_ids,
+            status=ThesisStatus.APP_OPEN
+        ).values_list('pk', flat=True))
+        unavailable = [thesis_id for thesis_id in thesis_ids if thesis_id not in available]
+        if unavailable:
+            raise ThesisNotAvailableException(f"Prace o id {', '.join(map(str, unavailable))} nie są dostępne do zapisów")
+
+        with transaction.atomic():
+            ThesisPreference.objects.filter(student=student_profile).delete()
+            ThesisPreference.objects.bulk_create([
+                ThesisPreference(student=student_profile, thesis_id=thesis_id, rank=rank)
+                for rank, thesis_id in enumerate(thesis_ids, start=1)
+            ])
+
+        return thesis_ids
+
+
+    def get_preferences(self, student: User):
+        return list(ThesisPreference.objects.filter(student_id=student.pk).order_by('rank').values_list('thesis_id', flat=True))
+
+
+    def set_applicant_ranking(self, supervisor: User, thesis_id: int, student_ids: list[int]):
+        try:
+            thesis = Thesis.objects.select_related('supervisor_id').get(pk=thesis_id)
+        except Thesis.DoesNotExist:
+            raise InvalidThesisIdException(f"Nie znaleziono pracy o id: {thesis_id}")
+
+        if thesis.supervisor_id_id != supervisor.pk:
+            raise InvalidSupervisorIdException(f"Praca o id {thesis_id} nie jest prowadzona przez promotora o id: {supervisor.pk}")
+
+        existing = set(StudentProfile.objects.filter(pk__in=student_ids).values_list('pk', flat=True))
+        unknown = [student_id for student_id in student_ids if student_id not in existing]
+        if unknown:
+            raise InvalidStudentIdException(f"Nie znaleziono studentów o id: {', '.join(map(str, unknown))}")
+
+        with transaction.atomic():
+            ApplicantRanking.objects.filter(thesis=thesis).delete()
+            ApplicantRanking.objects.bulk_create([
+                ApplicantRanking(thesis=thesis, student_id=student_id, rank=rank)
+                for rank, student_id in enumerate(student_ids, start=1)
+            ])
+
+        return student_ids
+
+
+    @transaction.atomic
+    def run_assignment_round(self, coordinator: User, dry_run: bool = False):
+        """
+            Assigns the students of the coordinator's department who have no
+            submission yet to open theses of the department, by their ranked
+            preferences and the supervisors' applicant rankings. Matched
+            students get accepted submissions, written in bulk.
+        """
+        if not coordinator.department_id:
+            raise InvalidDepartmentException("Koordynator nie jest przypisany do żadnego wydziału")
+
+        theses = {
+            thesis.pk: thesis
+            for thesis in Thesis.objects.select_for_update(of=('self',)).filter(
+                supervisor_id__user__department_id=coordinator.department_id,
+                status=ThesisStatus.APP_OPEN,
+                accepted_count__lt=F('max_students')
+            ).only('pk', 'name', 'max_students', 'accepted_count')
+        }
+
+        preferences = {}
+        for student_id, thesis_id in ThesisPreference.objects.filter(
+            thesis_id__in=theses,
+            student__user__department_id=coordinator.department_id,
+            student__submission__isnull=True
+        ).order_by('student_id', 'rank').values_list('student_id', 'thesis_id'):
+            preferences.setdefault(student_id, []).append(thesis_id)
+
+        priorities = {}
+        for thesis_id, student_id, rank in ApplicantRanking.objects.filter(
+            thesis_id__in=theses
+        ).values_list('thesis_id', 'student_id', 'rank'):
+            priorities.setdefault(thesis_id, {})[student_id] = rank
+
+        capacities = {thesis.pk: thesis.max_students - thesis.accepted_count for thesis in theses.values()}
+        assignment = stable_matching(preferences, priorities, capacities)
+        assigned = Counter(assignment.values())
+
+        summary = {
+            "dry_run": dry_run,
+            "students": len(preferences),
+            "assigned": len(assignment),
+            "unassigned": len(preferences) - len(assignment),
+            "theses": len(theses),
+            "filled_theses": sum(1 for thesis_id, count in assigned.items() if count >= capacities[thesis_id]),
+        }
+        if dry_run or not assignment:
+            return summary
+
+        Submission.objects.bulk_create([
+            Submission(student_id=student_id, thesis_id=thesis_id, status=SubmissionStatus.ACCEPTED)
+            for student_id, thesis_id in assignment.items()
+        ], batch_size=1000)
+        Thesis.objects.shift_accepted_count(dict(assigned))
+        ThesisPreference.objects.filter(student_id__in=assignment).delete()
+
+        timestamp = timezone.now()
+        Logs.objects.bulk_create([
+            Logs(
+                user_id=coordinator,
+                description=f"Koordynator o ID {coordinator.pk} przydzielił studenta o ID {student_id} do pracy '{theses[thesis_id].name}' (ID: {thesis_id}) w turze przydziału",
+                timestamp=timestamp,
+            )
+            for student_id, thesis_id in assignment.items()
+        ], batch_size=1000)
+
+        if summary["filled_theses"]:
+            search_cache.invalidate(TOPICS)
+
+        return summary
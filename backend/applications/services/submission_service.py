@@ -1,7 +1,11 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
 from django.utils import timezone
-from applications.models import Submission, SubmissionStatus
+from applications.models import Submission, SubmissionStatus, SubmissionTicket, TicketStatus
 from thesis.models import Thesis, ThesisStatus
 from users.models import StudentProfile, SupervisorProfile, User, Logs
+from common.search_cache import search_cache, TOPICS
 
 
 class InvalidStudentIdException(ValueError):
@@ -36,6 +40,21 @@ class SubmissionNotAcceptedException(ValueError):
     pass
 
 
+class SubmissionAlreadyQueuedException(ValueError):
+    pass
+
+
+ACCEPT = 'accept'
+REJECT = 'reject'
+REMOVE = 'remove'
+
+BULK_ACTIONS = (ACCEPT, REJECT, REMOVE)
+
+# Values of the SUBMISSION_INTAKE_MODE setting.
+DIRECT = 'direct'
+QUEUED = 'queued'
+
+
 class SubmissionService:
     def submit_to_thesis(self, student: User, thesis_id: int):
         try:
@@ -51,8 +70,8 @@ class SubmissionService:
         if thesis.status != ThesisStatus.APP_OPEN:
             raise ThesisNotAvailableException(f"Praca o id {thesis_id} nie jest dostępna do zapisów. Status: {thesis.status}")
         
-        if Submission.objects.filter(student=student_profile).exists():
-            existing_submission = Submission.objects.get(student=student_profile)
+        existing_submission = Submission.objects.select_related('thesis').filter(student=student_profile).first()
+        if existing_submission is not None:
             raise StudentAlreadyAssignedException(
                 f"Student jest już zapisany na pracę: {existing_submission.thesis.name} (ID: {existing_submission.thesis.id})"
             )
@@ -76,6 +95,111 @@ prowadzoną przez {thesis.supervisor_id.user.get_full_name()}"""
         return submission
     
 
+    def enqueue_submission(self, student: User, thesis_id: int):
+        """
+            Queues a submission. Only the student and the thesis are looked up
+            here, the checks of `submit_to_thesis` run when the ticket is
+            processed. A student has at most one pending ticket.
+        """
+        if not StudentProfile.objects.filter(pk=student.pk).exists():
+            raise InvalidStudentIdException(f"Nie znaleziono studenta o id: {student.pk}")
+
+        if not Thesis.objects.filter(pk=thesis_id).exists():
+            raise InvalidThesisIdException(f"Nie znaleziono pracy o id: {thesis_id}")
+
+        try:
+            with transaction.atomic():
+                return SubmissionTicket.objects.create(student_id=student.pk, thesis_id=thesis_id)
+        except IntegrityError:
+            raise SubmissionAlreadyQueuedException("Student ma już zgłoszenie oczekujące w kolejce")
+
+
+    @transaction.atomic
+    def process_submission_queue(self, batch_size: int):
+        """
+            Processes the oldest pending tickets that no other worker holds,
+            with the checks of `submit_to_thesis`, and writes their submissions
+            and logs in bulk. Returns the processed tickets.
+        """
+        tickets = list(
+            SubmissionTicket.objects.select_for_update(skip_locked=True, of=('self',)).select_related(
+                'student__user', 'thesis__supervisor_id__user'
+            ).filter(
+                status=TicketStatus.PENDING
+            ).order_by('pk')[:batch_size]
+        )
+        if not tickets:
+            return tickets
+
+        assigned = {
+            student_id: (thesis_id, thesis_name)
+            for student_id, thesis_id, thesis_name in Submission.objects.filter(
+                student_id__in={ticket.student_id for ticket in tickets}
+            ).values_list('student_id', 'thesis_id', 'thesis__name')
+        }
+
+        accepted = []
+        for ticket in tickets:
+            thesis = ticket.thesis
+            ticket.status = TicketStatus.REJECTED
+            if thesis.status != ThesisStatus.APP_OPEN:
+                ticket.error = f"Praca o id {thesis.id} nie jest dostępna do zapisów. Status: {thesis.status}"
+            elif ticket.student_id in assigned:
+                thesis_id, thesis_name = assigned[ticket.student_id]
+                ticket.error = f"Student jest już zapisany na pracę: {thesis_name} (ID: {thesis_id})"
+            else:
+                ticket.status = TicketStatus.ACCEPTED
+                assigned[ticket.student_id] = (thesis.id, thesis.name)
+                accepted.append(ticket)
+
+        def new_submission(ticket):
+            return Submission(student_id=ticket.student_id, thesis=ticket.thesis, status=SubmissionStatus.OPEN)
+
+        try:
+            with transaction.atomic():
+                Submission.objects.bulk_create([new_submission(ticket) for ticket in accepted])
+        except IntegrityError:
+            # A submission was created outside the queue in the meantime.
+            for ticket in list(accepted):
+                try:
+                    with transaction.atomic():
+                        new_submission(ticket).save()
+                except IntegrityError:
+                    ticket.status = TicketStatus.REJECTED
+                    ticket.error = "Student jest już zapisany na pracę"
+                    accepted.remove(ticket)
+
+        processed_at = timezone.now()
+        for ticket in tickets:
+            ticket.processed_at = processed_at
+        SubmissionTicket.objects.bulk_update(tickets, ['status', 'error', 'processed_at'])
+
+        Logs.objects.bulk_create([
+            Logs(
+                user_id=ticket.student.user,
+                description=f"""Student o ID {ticket.student_id} ({ticket.student.index_number}) 
+zapisał się na pracę dyplomową '{ticket.thesis.name}' (ID: {ticket.thesis.id}) 
+prowadzoną przez {ticket.thesis.supervisor_id.user.get_full_name()}""",
+                timestamp=processed_at,
+            )
+            for ticket in accepted
+        ])
+
+        return tickets
+
+
+    def get_ticket(self, student: User, ticket_id: int):
+        try:
+            ticket = SubmissionTicket.objects.get(pk=ticket_id, student_id=student.pk)
+        except SubmissionTicket.DoesNotExist:
+            raise ValueError(f"Nie znaleziono zgłoszenia w kolejce o id: {ticket_id}")
+
+        ticket.position = None
+        if ticket.status == TicketStatus.PENDING:
+            ticket.position = SubmissionTicket.objects.filter(status=TicketStatus.PENDING, pk__lt=ticket.pk).count() + 1
+        return ticket
+
+
     def cancel_submission(self, student: User):
         try:
             student_profile = StudentProfile.objects.get(pk=student.pk)
@@ -135,39 +259,42 @@ anulował zgłoszenie na pracę '{thesis_name}' (ID: {thesis_id})"""
             raise InvalidThesisIdException(f"Nie znaleziono pracy o id: {thesis_id} prowadzonej przez promotora o id: {supervisor.pk}")
 
 
-    def accept_submission(self, supervisor: User, submission_id: int):
+    def _lock_submission(self, supervisor: User, submission_id: int) -> Submission:
+        """
+            Loads a submission to a thesis of the supervisor and locks its row
+            and the thesis row until the transaction ends.
+        """
         try:
-            supervisor_profile = SupervisorProfile.objects.get(pk=supervisor.pk)
-        except SupervisorProfile.DoesNotExist:
-            raise InvalidSupervisorIdException(f"Nie znaleziono promotora o id: {supervisor.pk}")
-        
-        try:
-            submission = Submission.objects.select_related('thesis', 'student__user').get(
-                pk=submission_id, 
-                thesis__supervisor_id=supervisor_profile
+            return Submission.objects.select_for_update(of=('self', 'thesis')).select_related(
+                'thesis__supervisor_id__user', 'student__user'
+            ).get(
+                pk=submission_id,
+                thesis__supervisor_id=supervisor.pk
             )
         except Submission.DoesNotExist:
+            if not SupervisorProfile.objects.filter(pk=supervisor.pk).exists():
+                raise InvalidSupervisorIdException(f"Nie znaleziono promotora o id: {supervisor.pk}")
             raise ValueError(f"Nie znaleziono zgłoszenia o id: {submission_id} dla tego promotora")
+
+
+    @transaction.atomic
+    def accept_submission(self, supervisor: User, submission_id: int):
+        submission = self._lock_submission(supervisor, submission_id)
         
         if submission.status != SubmissionStatus.OPEN:
             raise SubmissionAlreadyResolvedException(f"Nie można zaakceptować tego zgłoszenia, bo nie jest aktywne! Stan zgłoszenia: {submission.status}")
 
         thesis = submission.thesis
-        accepted_students = Submission.objects.filter(
-            thesis=thesis, 
-            status=SubmissionStatus.ACCEPTED
-        ).count()
-
-        if accepted_students >= thesis.max_students:
+        if not Thesis.objects.filter(pk=thesis.pk).take_place():
             raise ThesisFullException(f"Praca '{thesis.name}' osiągnęła maksymalną liczbę studentów ({thesis.max_students})")
         
+        Submission.objects.filter(pk=submission.pk).update(status=SubmissionStatus.ACCEPTED)
         submission.status = SubmissionStatus.ACCEPTED
-        submission.save()
 
-        if accepted_students == thesis.max_students - 1: # last student has just been accepted
+        thesis.accepted_count += 1
+        if thesis.accepted_count >= thesis.max_students: # last student has just been accepted
             thesis.status = ThesisStatus.APP_CLOSED
-            thesis.updated_at = timezone.now()
-            thesis.save()
+            search_cache.invalidate(TOPICS)
                 
         log_description = f"Promotor o ID {supervisor.pk} zaakceptował zgłoszenie studenta {submission.student.user.get_full_name()} (ID: {submission.student.pk}) na pracę '{thesis.name}' (ID: {thesis.id})"
         
@@ -214,19 +341,9 @@ anulował zgłoszenie na pracę '{thesis_name}' (ID: {thesis_id})"""
         return {"message": f"Odrzucono zgłoszenie studenta {student_name}"}
 
 
+    @transaction.atomic
     def remove_student_from_thesis(self, supervisor: User, submission_id: int):
-        try:
-            supervisor_profile = SupervisorProfile.objects.get(pk=supervisor.pk)
-        except SupervisorProfile.DoesNotExist:
-            raise InvalidSupervisorIdException(f"Nie znaleziono promotora o id: {supervisor.pk}")
-        
-        try:
-            submission = Submission.objects.select_related('thesis', 'student__user').get(
-                pk=submission_id, 
-                thesis__supervisor_id=supervisor_profile
-            )
-        except Submission.DoesNotExist:
-            raise ValueError(f"Nie znaleziono zgłoszenia o id: {submission_id} dla tego promotora")
+        submission = self._lock_submission(supervisor, submission_id)
         
         if submission.status != SubmissionStatus.ACCEPTED:
             raise SubmissionNotAcceptedException(f"Nie można usunąć niezaakceptowanego zgłoszenia! Stan zgłoszenia: {submission.status}")
@@ -235,17 +352,13 @@ anulował zgłoszenie na pracę '{thesis_name}' (ID: {thesis_id})"""
         student_name = submission.student.user.get_full_name()
         student_id = submission.student.pk
         
+        # Deleting an accepted submission recounts the thesis, so the place is released first.
+        Thesis.objects.filter(pk=thesis.pk).release_place()
         submission.delete()
-        
-        remaining_accepted_submissions = Submission.objects.filter(
-            thesis=thesis,
-            status=SubmissionStatus.ACCEPTED
-        ).count()
 
-        if remaining_accepted_submissions < thesis.max_students and thesis.status == ThesisStatus.APP_CLOSED:
-            thesis.status = ThesisStatus.APP_OPEN
-            thesis.updated_at = timezone.now()
-            thesis.save()
+        # A closed thesis may have just been reopened; the loaded `thesis` predates the update.
+        if thesis.status == ThesisStatus.APP_CLOSED:
+            search_cache.invalidate(TOPICS)
         
         log_description = f"Promotor o ID {supervisor.pk} usunął studenta {student_name} (ID: {student_id}) z pracy '{thesis.name}' (ID: {thesis.id})"
         
@@ -256,3 +369,101 @@ anulował zgłoszenie na pracę '{thesis_name}' (ID: {thesis_id})"""
         )
         
         return {"message": f"Usunięto studenta {student_name} z pracy"}
+
+
+    @transaction.atomic
+    def bulk_resolve_submissions(self, supervisor: User, items: list[dict]):
+        """
+            Applies accept, reject and remove actions to submissions of the
+            supervisor's theses in one transaction, with one UPDATE per action.
+            Items that cannot be applied are skipped and reported; the result
+            list follows the order of `items`.
+        """
+        submissions = {
+            submission.pk: submission
+            for submission in Submission.objects.select_for_update(of=('self', 'thesis')).select_related(
+                'thesis', 'student__user'
+            ).filter(
+                pk__in=[item['submission_id'] for item in items],
+                thesis__supervisor_id=supervisor.pk
+            ).order_by('thesis_id', 'pk')
+        }
+        if not submissions and not SupervisorProfile.objects.filter(pk=supervisor.pk).exists():
+            raise InvalidSupervisorIdException(f"Nie znaleziono promotora o id: {supervisor.pk}")
+
+        errors = {}
+        applied = {action: [] for action in BULK_ACTIONS}
+        for item in items:
+            submission = submissions.get(item['submission_id'])
+            required_status = SubmissionStatus.ACCEPTED if item['action'] == REMOVE else SubmissionStatus.OPEN
+            if submission is None:
+                errors[item['submission_id']] = f"Nie znaleziono zgłoszenia o id: {item['submission_id']} dla tego promotora"
+            elif submission.status != required_status:
+                errors[submission.pk] = f"Nie można wykonać akcji '{item['action']}' na tym zgłoszeniu! Stan zgłoszenia: {submission.status}"
+            else:
+                applied[item['action']].append(submission)
+
+        # Removals free their places before the accepts are checked.
+        theses = {submission.thesis_id: submission.thesis for submission in submissions.values()}
+        deltas = Counter()
+        for submission in applied[REMOVE]:
+            deltas[submission.thesis_id] -= 1
+        accepted = []
+        for submission in applied[ACCEPT]:
+            thesis = theses[submission.thesis_id]
+            if thesis.accepted_count + deltas[thesis.pk] >= thesis.max_students:
+                errors[submission.pk] = f"Praca '{thesis.name}' osiągnęła maksymalną liczbę studentów ({thesis.max_students})"
+            else:
+                deltas[thesis.pk] += 1
+                accepted.append(submission)
+        applied[ACCEPT] = accepted
+
+        if applied[ACCEPT]:
+            Submission.objects.filter(pk__in=[submission.pk for submission in applied[ACCEPT]]).update(status=SubmissionStatus.ACCEPTED)
+        if applied[REJECT]:
+            Submission.objects.filter(pk__in=[submission.pk for submission in applied[REJECT]]).update(status=SubmissionStatus.REJECTED)
+
+        deltas = {thesis_id: delta for thesis_id, delta in deltas.items() if delta}
+        if deltas:
+            Thesis.objects.shift_accepted_count(deltas)
+            for thesis_id, delta in deltas.items():
+                thesis = theses[thesis_id]
+                count = thesis.accepted_count + delta
+                if (thesis.status == ThesisStatus.APP_OPEN and count >= thesis.max_students) \
+                        or (thesis.status == ThesisStatus.APP_CLOSED and count < thesis.max_students):
+                    search_cache.invalidate(TOPICS)
+                    break
+
+        # Deleting accepted submissions recounts their theses, so it follows the shift.
+        if applied[REMOVE]:
+            Submission.objects.filter(pk__in=[submission.pk for submission in applied[REMOVE]]).delete()
+
+        descriptions = {
+            ACCEPT: "Promotor o ID {supervisor} zaakceptował zgłoszenie studenta {student} (ID: {student_id}) na pracę '{thesis}' (ID: {thesis_id})",
+            REJECT: "Promotor o ID {supervisor} odrzucił zgłoszenie studenta {student} (ID: {student_id}) na pracę '{thesis}' (ID: {thesis_id})",
+            REMOVE: "Promotor o ID {supervisor} usunął studenta {student} (ID: {student_id}) z pracy '{thesis}' (ID: {thesis_id})",
+        }
+        timestamp = timezone.now()
+        Logs.objects.bulk_create([
+            Logs(
+                user_id=supervisor,
+                description=descriptions[action].format(
+                    supervisor=supervisor.pk,
+                    student=submission.student.user.get_full_name(),
+                    student_id=submission.student.pk,
+                    thesis=submission.thesis.name,
+                    thesis_id=submission.thesis_id,
+                ),
+                timestamp=timestamp,
+            )
+            for action in BULK_ACTIONS
+            for submission in applied[action]
+        ])
+
+        results = []
+        for item in items:
+            result = {"submission_id": item['submission_id'], "action": item['action'], "success": item['submission_id'] not in errors}
+            if not result["success"]:
+                result["error"] = errors[item['submission_id']]
+            results.append(result)
+        return results
@@ -0,0 +1,271 @@
+import random
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from common.models import Department
+from users.models import User, Role, AcademicTitle, StudentProfile, SupervisorProfile
+from thesis.models import Thesis, ThesisStatus, ThesisType
+from applications.models import ApplicantRanking, Submission, SubmissionStatus, ThesisPreference
+from applications.services.assignment_service import *
+
+
+def blocking_pairs(preferences, priorities, capacities, assignment):
+    """
+        Student/thesis pairs that would both rather be matched together than
+        keep the assignment; a stable assignment has none.
+    """
+    held = {}
+    for student_id, thesis_id in assignment.items():
+        held.setdefault(thesis_id, []).append(student_id)
+
+    def rank(thesis_id, student_id):
+        return (priorities.get(thesis_id, {}).get(student_id, UNRANKED), student_id)
+
+    pairs = []
+    for student_id, choices in preferences.items():
+        current = assignment.get(student_id)
+        for thesis_id in choices:
+            if thesis_id == current:
+                break
+            if capacities.get(thesis_id, 0) <= 0:
+                continue
+            students = held.get(thesis_id, [])
+            if len(students) < capacities[thesis_id] \
+                    or any(rank(thesis_id, student_id) < rank(thesis_id, other) for other in students):
+                pairs.append((student_id, thesis_id))
+    return pairs
+
+
+class TestStableMatching(SimpleTestCase):
+    def test_students_get_first_choice_when_there_is_room(self):
+        assignment = stable_matching({1: [10, 11], 2: [11, 10]}, {}, {10: 1, 11: 1})
+
+        self.assertEqual(assignment, {1: 10, 2: 11})
+
+
+    def test_supervisor_ranking_decides_contested_place(self):
+        assignment = stable_matching({1: [10, 11], 2: [10, 11]}, {10: {2: 1}}, {10: 1, 11: 1})
+
+        self.assertEqual(assignment, {2: 10, 1: 11})
+
+
+    def test_unranked_ties_go_to_lower_student_id(self):
+        assignment = stable_matching({2: [10], 1: [10]}, {}, {10: 1})
+
+        self.assertEqual(assignment, {1: 10})
+
+
+    def test_full_and_unknown_theses_are_skipped(self):
+        assignment = stable_matching({1: [10, 12, 11]}, {}, {10: 0, 11: 1})
+
+        self.assertEqual(assignment, {1: 11})
+
+
+    def test_random_instances_are_stable(self):
+        generator = random.Random(7)
+        for _ in range(50):
+            theses = list(range(1000, 1000 + generator.randint(1, 15)))
+            capacities = {thesis_id: generator.randint(0, 3) for thesis_id in theses}
+            preferences = {
+                student_id: generator.sample(theses, generator.randint(1, len(theses)))
+                for student_id in range(1, generator.randint(2, 60))
+            }
+            priorities = {
+                thesis_id: {student_id: rank for rank, student_id in enumerate(
+                    generator.sample(list(preferences), generator.randint(0, len(preferences))), start=1
+                )}
+                for thesis_id in theses
+            }
+
+            assignment = stable_matching(preferences, priorities, capacities)
+
+            self.assertEqual(blocking_pairs(preferences, priorities, capacities, assignment), [])
+            for thesis_id, count in Counter(assignment.values()).items():
+                self.assertLessEqual(count, capacities[thesis_id])
+            for student_id, thesis_id in assignment.items():
+                self.assertIn(thesis_id, preferences[student_id])
+
+
+    def test_large_instance(self):
+        generator = random.Random(11)
+        theses = list(range(1, 3001))
+        capacities = {thesis_id: generator.randint(1, 5) for thesis_id in theses}
+        # Popular theses are picked far more often, as when a round opens.
+        weights = [1 / thesis_id for thesis_id in theses]
+        preferences = {
+            student_id: list(dict.fromkeys(generator.choices(theses, weights, k=10)))
+            for student_id in range(1, 20001)
+        }
+
+        assignment = stable_matching(preferences, {}, capacities)
+
+        for thesis_id, count in Counter(assignment.values()).items():
+            self.assertLessEqual(count, capacities[thesis_id])
+
+
+class TestAssignmentService(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(name="Wydział A")
+        self.other_department = Department.objects.create(name="Wydział B")
+
+        self.coordinator = User.objects.create_user(
+            username="coordinator",
+            role=Role.COORDINATOR,
+            department=self.department,
+        )
+        self.supervisor = SupervisorProfile.objects.create(
+            user=User.objects.create_user(
+                username="supervisor",
+                first_name="Jan",
+                last_name="Kowalski",
+                academic_title=AcademicTitle.PROFESSOR,
+                role=Role.SUPERVISOR,
+                department=self.department,
+            )
+        )
+        self.other_supervisor = SupervisorProfile.objects.create(
+            user=User.objects.create_user(
+                username="other_supervisor",
+                role=Role.SUPERVISOR,
+                department=self.other_department,
+            )
+        )
+
+        self.thesis_popular = Thesis.objects.create(
+            supervisor_id=self.supervisor,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Popularna praca",
+            max_students=1,
+            status=ThesisStatus.APP_OPEN
+        )
+        self.thesis_spare = Thesis.objects.create(
+            supervisor_id=self.supervisor,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Zapasowa praca",
+            max_students=2,
+            status=ThesisStatus.APP_OPEN
+        )
+        self.thesis_other_department = Thesis.objects.create(
+            supervisor_id=self.other_supervisor,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Praca z innego wydziału",
+            max_students=2,
+            status=ThesisStatus.APP_OPEN
+        )
+
+        self.students = [
+            StudentProfile.objects.create(
+                user=User.objects.create_user(
+                    username=f"student{i}",
+                    role=Role.STUDENT,
+                    department=self.department,
+                ),
+                index_number=f"10000{i}"
+            )
+            for i in range(3)
+        ]
+
+        self.assignment_service = AssignmentService()
+
+
+    def test_set_preferences(self):
+        self.assignment_service.set_preferences(self.students[0].user, [self.thesis_spare.pk, self.thesis_popular.pk])
+        self.assignment_service.set_preferences(self.students[0].user, [self.thesis_popular.pk])
+
+        self.assertEqual(self.assignment_service.get_preferences(self.students[0].user), [self.thesis_popular.pk])
+
+
+    def test_set_preferences_thesis_not_available(self):
+        self.thesis_spare.status = ThesisStatus.APP_CLOSED
+        self.thesis_spare.save()
+
+        with self.assertRaises(ThesisNotAvailableException):
+            self.assignment_service.set_preferences(self.students[0].user, [self.thesis_popular.pk, self.thesis_spare.pk])
+
+
+    def test_set_preferences_student_already_assigned(self):
+        Submission.objects.create(student=self.students[0], thesis=self.thesis_spare)
+
+        with self.assertRaises(StudentAlreadyAssignedException):
+            self.assignment_service.set_preferences(self.students[0].user, [self.thesis_popular.pk])
+
+
+    def test_set_applicant_ranking_wrong_supervisor(self):
+        with self.assertRaises(InvalidSupervisorIdException):
+            self.assignment_service.set_applicant_ranking(self.other_supervisor.user, self.thesis_popular.pk, [self.students[0].pk])
+
+
+    def test_run_assignment_round(self):
+        for student in self.students:
+            self.assignment_service.set_preferences(student.user, [self.thesis_popular.pk, self.thesis_spare.pk])
+        self.assignment_service.set_applicant_ranking(self.supervisor.user, self.thesis_popular.pk, [self.students[2].pk])
+
+        summary = self.assignment_service.run_assignment_round(self.coordinator)
+
+        self.assertEqual(summary["assigned"], 3)
+        self.assertEqual(summary["unassigned"], 0)
+        self.assertEqual(
+            dict(Submission.objects.values_list('student_id', 'thesis_id')),
+            {
+                self.students[2].pk: self.thesis_popular.pk,
+                self.students[0].pk: self.thesis_spare.pk,
+                self.students[1].pk: self.thesis_spare.pk,
+            }
+        )
+        self.assertFalse(Submission.objects.exclude(status=SubmissionStatus.ACCEPTED).exists())
+        self.assertFalse(ThesisPreference.objects.exists())
+        for thesis in (self.thesis_popular, self.thesis_spare):
+            thesis.refresh_from_db()
+            self.assertEqual(thesis.accepted_count, thesis.max_students)
+            self.assertEqual(thesis.status, ThesisStatus.APP_CLOSED)
+
+
+    def test_run_assignment_round_respects_accepted_students(self):
+        Submission.objects.create(student=self.students[0], thesis=self.thesis_spare, status=SubmissionStatus.ACCEPTED)
+        Thesis.objects.filter(pk=self.thesis_spare.pk).sync_accepted_count()
+        for student in self.students[1:]:
+            ThesisPreference.objects.create(student=student, thesis=self.thesis_spare, rank=1)
+
+        summary = self.assignment_service.run_assignment_round(self.coordinator)
+
+        self.assertEqual(summary["assigned"], 1)
+        self.assertEqual(summary["unassigned"], 1)
+        self.thesis_spare.refresh_from_db()
+        self.assertEqual(self.thesis_spare.accepted_count, 2)
+
+
+    def test_run_assignment_round_only_covers_own_department(self):
+        ThesisPreference.objects.create(student=self.students[0], thesis=self.thesis_other_department, rank=1)
+
+        summary = self.assignment_service.run_assignment_round(self.coordinator)
+
+        self.assertEqual(summary["students"], 0)
+        self.assertFalse(Submission.objects.exists())
+
+
+    def test_run_assignment_round_locks_only_theses(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assignment_service.run_assignment_round(self.coordinator, dry_run=True)
+
+        locks = [query["sql"] for query in queries if "FOR UPDATE" in query["sql"]]
+        self.assertEqual(len(locks), 1)
+        self.assertIn('FOR UPDATE OF "thesis_thesis"', locks[0])
+
+
+    def test_run_assignment_round_dry_run(self):
+        ThesisPreference.objects.create(student=self.students[0], thesis=self.thesis_popular, rank=1)
+
+        summary = self.assignment_service.run_assignment_round(self.coordinator, dry_run=True)
+
+        self.assertEqual(summary["assigned"], 1)
+        self.assertFalse(Submission.objects.exists())
+        self.assertTrue(ThesisPreference.objects.exists())
+
+
+    def test_run_assignment_round_without_department(self):
+        self.coordinator.department = None
+        self.coordinator.save()
+
+        with self.assertRaises(InvalidDepartmentException):
+            self.assignment_service.run_assignment_round(self.coordinator)
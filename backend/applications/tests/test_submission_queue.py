@@ -0,0 +1,199 @@
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from common.models import Department
+from users.models import User, Role, AcademicTitle, StudentProfile, SupervisorProfile, Logs
+from thesis.models import Thesis, ThesisStatus, ThesisType
+from applications.models import Submission, SubmissionStatus, SubmissionTicket, TicketStatus
+from applications.services.submission_service import (
+    InvalidStudentIdException, InvalidThesisIdException, SubmissionAlreadyQueuedException, SubmissionService
+)
+
+
+class SubmissionQueueTestMixin:
+    def create_data(self):
+        self.department = Department.objects.create(name="Wydział A")
+
+        self.supervisor = SupervisorProfile.objects.create(
+            user=User.objects.create_user(
+                username="supervisor",
+                first_name="Jan",
+                last_name="Kowalski",
+                academic_title=AcademicTitle.PROFESSOR,
+                role=Role.SUPERVISOR,
+                department=self.department,
+            )
+        )
+        self.thesis_open = Thesis.objects.create(
+            supervisor_id=self.supervisor,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Analiza algorytmów sortowania",
+            max_students=2,
+            status=ThesisStatus.APP_OPEN
+        )
+        self.thesis_closed = Thesis.objects.create(
+            supervisor_id=self.supervisor,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Zamknięta praca",
+            max_students=1,
+            status=ThesisStatus.APP_CLOSED
+        )
+        self.students = [
+            StudentProfile.objects.create(
+                user=User.objects.create_user(
+                    username=f"student{i}",
+                    first_name="Anna",
+                    last_name=f"Student{i}",
+                    role=Role.STUDENT,
+                    department=self.department,
+                ),
+                index_number=f"10000{i}"
+            )
+            for i in range(3)
+        ]
+
+
+class TestSubmissionQueue(SubmissionQueueTestMixin, TestCase):
+    def setUp(self):
+        self.create_data()
+        self.submission_service = SubmissionService()
+
+
+    def test_enqueue_submission(self):
+        ticket = self.submission_service.enqueue_submission(self.students[0].user, self.thesis_open.id)
+
+        self.assertEqual(ticket.status, TicketStatus.PENDING)
+        self.assertFalse(Submission.objects.exists())
+
+
+    def test_process_submission_queue(self):
+        first = self.submission_service.enqueue_submission(self.students[0].user, self.thesis_open.id)
+        second = self.submission_service.enqueue_submission(self.students[1].user, self.thesis_open.id)
+
+        tickets = self.submission_service.process_submission_queue(batch_size=10)
+
+        self.assertEqual([ticket.pk for ticket in tickets], [first.pk, second.pk])
+        for ticket in (first, second):
+            ticket.refresh_from_db()
+            self.assertEqual(ticket.status, TicketStatus.ACCEPTED)
+            self.assertIsNotNone(ticket.processed_at)
+            submission = Submission.objects.get(student_id=ticket.student_id)
+            self.assertEqual(submission.thesis, self.thesis_open)
+            self.assertEqual(submission.status, SubmissionStatus.OPEN)
+        self.assertEqual(Logs.objects.filter(user_id__in=[self.students[0].pk, self.students[1].pk]).count(), 2)
+
+
+    def test_process_submission_queue_in_fifo_batches(self):
+        tickets = [
+            self.submission_service.enqueue_submission(student.user, self.thesis_open.id)
+            for student in self.students
+        ]
+
+        processed = self.submission_service.process_submission_queue(batch_size=2)
+
+        self.assertEqual([ticket.pk for ticket in processed], [ticket.pk for ticket in tickets[:2]])
+        tickets[2].refresh_from_db()
+        self.assertEqual(tickets[2].status, TicketStatus.PENDING)
+
+
+    def test_process_submission_queue_validates_tickets(self):
+        Submission.objects.create(student=self.students[2], thesis=self.thesis_open)
+        closed = self.submission_service.enqueue_submission(self.students[0].user, self.thesis_closed.id)
+        accepted = self.submission_service.enqueue_submission(self.students[1].user, self.thesis_open.id)
+        assigned = self.submission_service.enqueue_submission(self.students[2].user, self.thesis_open.id)
+
+        self.submission_service.process_submission_queue(batch_size=10)
+
+        for ticket in (closed, accepted, assigned):
+            ticket.refresh_from_db()
+        self.assertEqual(accepted.status, TicketStatus.ACCEPTED)
+        self.assertEqual(closed.status, TicketStatus.REJECTED)
+        self.assertIn("nie jest dostępna do zapisów", closed.error)
+        self.assertEqual(assigned.status, TicketStatus.REJECTED)
+        self.assertIn(self.thesis_open.name, assigned.error)
+        self.assertEqual(Submission.objects.count(), 2)
+
+        repeated = self.submission_service.enqueue_submission(self.students[1].user, self.thesis_open.id)
+        self.submission_service.process_submission_queue(batch_size=10)
+
+        repeated.refresh_from_db()
+        self.assertEqual(repeated.status, TicketStatus.REJECTED)
+        self.assertIn(self.thesis_open.name, repeated.error)
+
+
+    def test_enqueue_submission_validation(self):
+        with self.assertRaises(InvalidStudentIdException):
+            self.submission_service.enqueue_submission(self.supervisor.user, self.thesis_open.id)
+
+        with self.assertRaises(InvalidThesisIdException):
+            self.submission_service.enqueue_submission(self.students[0].user, 999999)
+
+        self.submission_service.enqueue_submission(self.students[0].user, self.thesis_open.id)
+        with self.assertRaises(SubmissionAlreadyQueuedException):
+            self.submission_service.enqueue_submission(self.students[0].user, self.thesis_closed.id)
+        self.assertEqual(SubmissionTicket.objects.count(), 1)
+
+
+    def test_get_ticket_position(self):
+        self.submission_service.enqueue_submission(self.students[0].user, self.thesis_open.id)
+        ticket = self.submission_service.enqueue_submission(self.students[1].user, self.thesis_open.id)
+
+        self.assertEqual(self.submission_service.get_ticket(self.students[1].user, ticket.id).position, 2)
+
+        with self.assertRaises(ValueError):
+            self.submission_service.get_ticket(self.students[0].user, ticket.id)
+
+
+    def test_process_submission_queue_command(self):
+        for student in self.students:
+            self.submission_service.enqueue_submission(student.user, self.thesis_open.id)
+
+        call_command('process_submission_queue', '--once', '--batch-size', '2', stdout=open('/dev/null', 'w'))
+
+        self.assertFalse(SubmissionTicket.objects.filter(status=TicketStatus.PENDING).exists())
+        self.assertEqual(Submission.objects.count(), 3)
+
+
+@override_settings(SUBMISSION_INTAKE_MODE="queued")
+class TestQueuedSubmissionEndpoints(SubmissionQueueTestMixin, APITestCase):
+    def setUp(self):
+        self.create_data()
+
+
+    def test_submit_returns_ticket(self):
+        self.client.force_authenticate(user=self.students[0].user)
+
+        response = self.client.post('/applications/submit/', {"thesis_id": self.thesis_open.id}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], TicketStatus.PENDING)
+        self.assertFalse(Submission.objects.exists())
+
+        SubmissionService().process_submission_queue(batch_size=10)
+        response = self.client.get(response.data["status_url"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], TicketStatus.ACCEPTED)
+        self.assertIsNone(response.data["position"])
+        self.assertEqual(Submission.objects.get().student, self.students[0])
+
+
+    def test_submit_twice_conflicts(self):
+        self.client.force_authenticate(user=self.students[0].user)
+
+        response = self.client.post('/applications/submit/', {"thesis_id": self.thesis_open.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        response = self.client.post('/applications/submit/', {"thesis_id": self.thesis_open.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(SubmissionTicket.objects.count(), 1)
+
+
+    def test_ticket_of_other_student(self):
+        ticket = SubmissionService().enqueue_submission(self.students[0].user, self.thesis_open.id)
+        self.client.force_authenticate(user=self.students[1].user)
+
+        response = self.client.get(f'/applications/tickets/{ticket.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
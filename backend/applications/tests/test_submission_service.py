@@ -1,4 +1,8 @@
-from django.test import TestCase
+import threading
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
 from common.models import Department, Tag
 from users.models import User, Role, AcademicTitle, StudentProfile, SupervisorProfile
 from thesis.models import Thesis, ThesisStatus, ThesisType
@@ -574,3 +578,273 @@ class TestSubmissionService(TestCase):
 
         self.assertIn("message", result)
         self.assertEqual(Submission.objects.count(), 0)
+
+
+    def test_accepted_count_follows_accept_and_remove(self):
+        submission1 = Submission.objects.create(
+            student=self.student_1,
+            thesis=self.thesis_open,
+            status=SubmissionStatus.OPEN
+        )
+
+        submission2 = Submission.objects.create(
+            student=self.student_2,
+            thesis=self.thesis_open,
+            status=SubmissionStatus.OPEN
+        )
+
+        self.submission_service.accept_submission(supervisor=self.supervisor_1.user, submission_id=submission1.id)
+        self.thesis_open.refresh_from_db()
+        self.assertEqual(self.thesis_open.accepted_count, 1)
+
+        self.submission_service.accept_submission(supervisor=self.supervisor_1.user, submission_id=submission2.id)
+        self.thesis_open.refresh_from_db()
+        self.assertEqual(self.thesis_open.accepted_count, 2)
+
+        self.submission_service.remove_student_from_thesis(supervisor=self.supervisor_1.user, submission_id=submission1.id)
+        self.thesis_open.refresh_from_db()
+        self.assertEqual(self.thesis_open.accepted_count, 1)
+        self.assertEqual(self.thesis_open.status, ThesisStatus.APP_OPEN)
+
+
+    def test_thesis_save_keeps_accepted_count(self):
+        submission = Submission.objects.create(
+            student=self.student_1,
+            thesis=self.thesis_open,
+            status=SubmissionStatus.OPEN
+        )
+        stale_thesis = Thesis.objects.get(pk=self.thesis_open.pk)
+
+        self.submission_service.accept_submission(supervisor=self.supervisor_1.user, submission_id=submission.id)
+        stale_thesis.description = "Nowy opis"
+        stale_thesis.save()
+
+        self.thesis_open.refresh_from_db()
+        self.assertEqual(self.thesis_open.accepted_count, 1)
+
+
+    def test_sync_accepted_count(self):
+        # bulk_create sends no signals, like rows written before the column existed.
+        Submission.objects.bulk_create([
+            Submission(student=self.student_1, thesis=self.thesis_open, status=SubmissionStatus.ACCEPTED),
+            Submission(student=self.student_2, thesis=self.thesis_open, status=SubmissionStatus.OPEN),
+        ])
+
+        self.assertEqual(list(Thesis.objects.stale_accepted_count()), [self.thesis_open])
+
+        Thesis.objects.stale_accepted_count().sync_accepted_count()
+
+        self.thesis_open.refresh_from_db()
+        self.assertEqual(self.thesis_open.accepted_count, 1)
+        self.assertFalse(Thesis.objects.stale_accepted_count().exists())
+
+
+    def test_orm_edits_keep_accepted_count(self):
+        submission = Submission.objects.create(
+            student=self.student_1,
+            thesis=self.thesis_open,
+            status=SubmissionStatus.ACCEPTED
+        )
+        self.thesis_open.refresh_from_db()
+        self.assertEqual(self.thesis_open.accepted_count, 1)
+
+        submission = Submission.objects.get(pk=submission.pk)
+        submission.thesis = self.thesis_closed
+        submission.save()
+        self.assertEqual(Thesis.objects.get(pk=self.thesis_open.pk).accepted_count, 0)
+        self.assertEqual(Thesis.objects.get(pk=self.thesis_closed.pk).accepted_count, 1)
+
+        submission.status = SubmissionStatus.REJECTED
+        submission.save()
+        self.assertEqual(Thesis.objects.get(pk=self.thesis_closed.pk).accepted_count, 0)
+
+        submission.status = SubmissionStatus.ACCEPTED
+        submission.save()
+        submission.delete()
+        self.assertEqual(Thesis.objects.get(pk=self.thesis_closed.pk).accepted_count, 0)
+        self.assertFalse(Thesis.objects.stale_accepted_count().exists())
+
+
+    def test_admin_edits_keep_accepted_count(self):
+        admin = User.objects.create_superuser(username="admin", password="password123")
+        self.client.force_login(admin)
+        submission = Submission.objects.create(
+            student=self.student_1,
+            thesis=self.thesis_open,
+            status=SubmissionStatus.OPEN
+        )
+
+        response = self.client.post(
+            reverse("admin:applications_submission_change", args=[submission.pk]),
+            {"student": self.student_1.pk, "thesis": self.thesis_open.pk, "status": SubmissionStatus.ACCEPTED},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.thesis_open.refresh_from_db()
+        self.assertEqual(self.thesis_open.accepted_count, 1)
+
+        response = self.client.post(
+            reverse("admin:applications_submission_delete", args=[submission.pk]),
+            {"post": "yes"},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.thesis_open.refresh_from_db()
+        self.assertEqual(self.thesis_open.accepted_count, 0)
+
+
+
+    def test_bulk_resolve_submissions(self):
+        to_accept = Submission.objects.create(student=self.student_1, thesis=self.thesis_open)
+        to_reject = Submission.objects.create(student=self.student_2, thesis=self.thesis_open)
+        to_remove = Submission.objects.create(student=self.student_3, thesis=self.thesis_single_student)
+        self.submission_service.accept_submission(supervisor=self.supervisor_2.user, submission_id=to_remove.id)
+        logs_before = Logs.objects.count()
+
+        results = self.submission_service.bulk_resolve_submissions(self.supervisor_1.user, [
+            {"submission_id": to_accept.id, "action": ACCEPT},
+            {"submission_id": to_reject.id, "action": REJECT},
+            {"submission_id": to_remove.id, "action": REMOVE},
+            {"submission_id": 999999, "action": ACCEPT},
+        ])
+
+        self.assertEqual([result["success"] for result in results], [True, True, False, False])
+        self.assertEqual([result["submission_id"] for result in results], [to_accept.id, to_reject.id, to_remove.id, 999999])
+        to_accept.refresh_from_db()
+        self.assertEqual(to_accept.status, SubmissionStatus.ACCEPTED)
+        to_reject.refresh_from_db()
+        self.assertEqual(to_reject.status, SubmissionStatus.REJECTED)
+        self.assertTrue(Submission.objects.filter(pk=to_remove.pk).exists())
+        self.thesis_open.refresh_from_db()
+        self.assertEqual(self.thesis_open.accepted_count, 1)
+        self.assertEqual(Logs.objects.count(), logs_before + 2)
+
+
+    def test_bulk_resolve_submissions_validates_status(self):
+        submission = Submission.objects.create(student=self.student_1, thesis=self.thesis_open, status=SubmissionStatus.REJECTED)
+
+        results = self.submission_service.bulk_resolve_submissions(self.supervisor_1.user, [
+            {"submission_id": submission.id, "action": REMOVE},
+        ])
+
+        self.assertFalse(results[0]["success"])
+        self.assertIn(SubmissionStatus.REJECTED.value, results[0]["error"])
+
+
+    def test_bulk_resolve_submissions_checks_capacity_per_thesis(self):
+        first = Submission.objects.create(student=self.student_1, thesis=self.thesis_single_student)
+        second = Submission.objects.create(student=self.student_3, thesis=self.thesis_single_student)
+
+        results = self.submission_service.bulk_resolve_submissions(self.supervisor_2.user, [
+            {"submission_id": first.id, "action": ACCEPT},
+            {"submission_id": second.id, "action": ACCEPT},
+        ])
+
+        self.assertTrue(results[0]["success"])
+        self.assertFalse(results[1]["success"])
+        self.assertIn(self.thesis_single_student.name, results[1]["error"])
+        self.thesis_single_student.refresh_from_db()
+        self.assertEqual(self.thesis_single_student.accepted_count, 1)
+        self.assertEqual(self.thesis_single_student.status, ThesisStatus.APP_CLOSED)
+
+
+    def test_bulk_resolve_submissions_removal_frees_place(self):
+        first = Submission.objects.create(student=self.student_1, thesis=self.thesis_single_student)
+        second = Submission.objects.create(student=self.student_3, thesis=self.thesis_single_student)
+        self.submission_service.accept_submission(supervisor=self.supervisor_2.user, submission_id=first.id)
+
+        results = self.submission_service.bulk_resolve_submissions(self.supervisor_2.user, [
+            {"submission_id": second.id, "action": ACCEPT},
+            {"submission_id": first.id, "action": REMOVE},
+        ])
+
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertFalse(Submission.objects.filter(pk=first.pk).exists())
+        self.thesis_single_student.refresh_from_db()
+        self.assertEqual(self.thesis_single_student.accepted_count, 1)
+        self.assertEqual(self.thesis_single_student.status, ThesisStatus.APP_CLOSED)
+
+
+    def test_bulk_resolve_submissions_reopens_thesis(self):
+        submission = Submission.objects.create(student=self.student_1, thesis=self.thesis_single_student)
+        self.submission_service.accept_submission(supervisor=self.supervisor_2.user, submission_id=submission.id)
+
+        self.submission_service.bulk_resolve_submissions(self.supervisor_2.user, [
+            {"submission_id": submission.id, "action": REMOVE},
+        ])
+
+        self.thesis_single_student.refresh_from_db()
+        self.assertEqual(self.thesis_single_student.accepted_count, 0)
+        self.assertEqual(self.thesis_single_student.status, ThesisStatus.APP_OPEN)
+
+
+    def test_bulk_resolve_submissions_invalid_supervisor_id(self):
+        with self.assertRaises(InvalidSupervisorIdException):
+            self.submission_service.bulk_resolve_submissions(self.non_student, [
+                {"submission_id": 999999, "action": ACCEPT},
+            ])
+
+class TestConcurrentAcceptance(TransactionTestCase):
+    def setUp(self):
+        department = Department.objects.create(name="Wydział A")
+        self.supervisor = SupervisorProfile.objects.create(
+            user=User.objects.create_user(
+                username="supervisor",
+                first_name="Jan",
+                last_name="Kowalski",
+                academic_title=AcademicTitle.PROFESSOR,
+                role=Role.SUPERVISOR,
+                department=department,
+            )
+        )
+        self.thesis = Thesis.objects.create(
+            supervisor_id=self.supervisor,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Praca dla dwóch studentów",
+            max_students=2,
+            status=ThesisStatus.APP_OPEN
+        )
+        self.submissions = [
+            Submission.objects.create(
+                student=StudentProfile.objects.create(
+                    user=User.objects.create_user(
+                        username=f"student{i}",
+                        role=Role.STUDENT,
+                        department=department,
+                    ),
+                    index_number=f"10000{i}"
+                ),
+                thesis=self.thesis,
+                status=SubmissionStatus.OPEN
+            )
+            for i in range(6)
+        ]
+
+
+    def test_concurrent_accepts_never_exceed_max_students(self):
+        barrier = threading.Barrier(len(self.submissions))
+        accepted, full = [], []
+
+        def accept(submission):
+            try:
+                barrier.wait()
+                SubmissionService().accept_submission(supervisor=self.supervisor.user, submission_id=submission.id)
+                accepted.append(submission.id)
+            except ThesisFullException:
+                full.append(submission.id)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=accept, args=(submission,)) for submission in self.submissions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.thesis.refresh_from_db()
+        self.assertEqual(len(accepted), self.thesis.max_students)
+        self.assertEqual(len(full), len(self.submissions) - self.thesis.max_students)
+        self.assertEqual(self.thesis.accepted_count, self.thesis.max_students)
+        self.assertEqual(
+            Submission.objects.filter(thesis=self.thesis, status=SubmissionStatus.ACCEPTED).count(),
+            self.thesis.max_students
+        )
+        self.assertEqual(self.thesis.status, ThesisStatus.APP_CLOSED)
@@ -0,0 +1,32 @@
+from applications.serializers.assignment_serializers import ApplicantRankingSerializer
+from applications.services.assignment_service import AssignmentService
+from applications.services.submission_service import InvalidStudentIdException, InvalidSupervisorIdException, InvalidThesisIdException
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from thesis_system.permissions import isSupervisor
+
+class ApplicantRankingView(GenericAPIView):
+    permission_classes = [IsAuthenticated, isSupervisor]
+    serializer_class = ApplicantRankingSerializer
+    
+    def put(self, request, thesis_id):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        assignment_service = AssignmentService()
+        
+        try:
+            student_ids = assignment_service.set_applicant_ranking(request.user, thesis_id, serializer.validated_data['student_ids'])
+            return Response({'thesis_id': thesis_id, 'student_ids': student_ids}, status=status.HTTP_200_OK)
+        
+        except InvalidThesisIdException as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except InvalidSupervisorIdException as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except InvalidStudentIdException as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({'error': 'Wystąpił błąd podczas zapisywania rankingu'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,33 @@
+from django.db import IntegrityError
+from applications.serializers.assignment_serializers import AssignmentRoundSerializer
+from applications.services.assignment_service import AssignmentService, InvalidDepartmentException
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from thesis_system.permissions import isCoordinator
+
+class AssignmentRoundView(GenericAPIView):
+    permission_classes = [IsAuthenticated, isCoordinator]
+    serializer_class = AssignmentRoundSerializer
+    
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        assignment_service = AssignmentService()
+        
+        try:
+            summary = assignment_service.run_assignment_round(request.user, serializer.validated_data['dry_run'])
+            return Response(summary, status=status.HTTP_200_OK)
+        
+        except InvalidDepartmentException as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            return Response(
+                {'error': 'Zgłoszenia zmieniły się w trakcie przydziału, spróbuj ponownie'},
+                status=status.HTTP_409_CONFLICT
+            )
+        except Exception as e:
+            return Response({'error': 'Wystąpił błąd podczas przydziału prac'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
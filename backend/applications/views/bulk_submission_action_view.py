@@ -0,0 +1,33 @@
+from applications.serializers.bulk_submission_action_serializer import BulkSubmissionActionSerializer
+from applications.services.submission_service import InvalidSupervisorIdException, SubmissionService
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from users.models import Role
+
+class BulkSubmissionActionView(GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = BulkSubmissionActionSerializer
+    
+    def post(self, request):
+        if request.user.role != Role.SUPERVISOR:
+            return Response(
+                {'error': 'Tylko promotorzy mogą rozpatrywać aplikacje'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        submission_service = SubmissionService()
+        
+        try:
+            results = submission_service.bulk_resolve_submissions(request.user, serializer.validated_data['items'])
+            return Response({'results': results}, status=status.HTTP_200_OK)
+        
+        except InvalidSupervisorIdException as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response({'error': 'Wystąpił błąd podczas rozpatrywania aplikacji'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
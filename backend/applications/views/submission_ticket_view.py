@@ -0,0 +1,29 @@
+from applications.serializers.submission_ticket_serializer import SubmissionTicketSerializer
+from applications.services.submission_service import SubmissionService
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from users.models import Role
+
+class SubmissionTicketView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, ticket_id):
+        if request.user.role != Role.STUDENT:
+            return Response(
+                {'error': 'Tylko studenci mogą sprawdzać swoje zgłoszenia w kolejce'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        submission_service = SubmissionService()
+        
+        try:
+            ticket = submission_service.get_ticket(request.user, ticket_id)
+            ticket_serializer = SubmissionTicketSerializer(ticket, context={'request': request})
+            return Response(ticket_serializer.data, status=status.HTTP_200_OK)
+        
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response({'error': 'Wystąpił błąd podczas sprawdzania zgłoszenia'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
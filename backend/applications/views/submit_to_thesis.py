@@ -1,6 +1,8 @@
 from applications.serializers.submission_create_serializer import SubmissionCreateSerializer
 from applications.serializers.created_submission_serializer import CreatedSubmissionSerializer
-from applications.services.submission_service import InvalidStudentIdException, InvalidThesisIdException, StudentAlreadyAssignedException, SubmissionService, ThesisNotAvailableException
+from applications.serializers.submission_ticket_serializer import SubmissionTicketSerializer
+from applications.services.submission_service import QUEUED, InvalidStudentIdException, InvalidThesisIdException, StudentAlreadyAssignedException, SubmissionAlreadyQueuedException, SubmissionService, ThesisNotAvailableException
+from django.conf import settings
 from rest_framework.generics import CreateAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -25,6 +27,16 @@ class SubmitToThesisView(CreateAPIView):
         thesis_id = serializer.validated_data['thesis_id']
         submission_service = SubmissionService()
         
+        if settings.SUBMISSION_INTAKE_MODE == QUEUED:
+            try:
+                ticket = submission_service.enqueue_submission(request.user, thesis_id)
+            except (InvalidStudentIdException, InvalidThesisIdException) as e:
+                return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+            except SubmissionAlreadyQueuedException as e:
+                return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+            ticket_serializer = SubmissionTicketSerializer(ticket, context={'request': request})
+            return Response(ticket_serializer.data, status=status.HTTP_202_ACCEPTED)
+        
         try:
             submission = submission_service.submit_to_thesis(request.user, thesis_id)
             submission_serializer = CreatedSubmissionSerializer(submission, context={'request': request})
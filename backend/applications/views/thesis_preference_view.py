@@ -0,0 +1,36 @@
+from applications.serializers.assignment_serializers import ThesisPreferenceSerializer
+from applications.services.assignment_service import AssignmentService
+from applications.services.submission_service import InvalidStudentIdException, StudentAlreadyAssignedException, ThesisNotAvailableException
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from thesis_system.permissions import isStudent
+
+class ThesisPreferenceView(GenericAPIView):
+    permission_classes = [IsAuthenticated, isStudent]
+    serializer_class = ThesisPreferenceSerializer
+    
+    def get(self, request):
+        assignment_service = AssignmentService()
+        return Response({'thesis_ids': assignment_service.get_preferences(request.user)}, status=status.HTTP_200_OK)
+
+    def put(self, request):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        assignment_service = AssignmentService()
+        
+        try:
+            thesis_ids = assignment_service.set_preferences(request.user, serializer.validated_data['thesis_ids'])
+            return Response({'thesis_ids': thesis_ids}, status=status.HTTP_200_OK)
+        
+        except InvalidStudentIdException as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except ThesisNotAvailableException as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except StudentAlreadyAssignedException as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({'error': 'Wystąpił błąd podczas zapisywania preferencji'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
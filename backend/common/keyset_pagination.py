@@ -0,0 +1,125 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+KeysetPage = namedtuple("KeysetPage", ["results", "next_cursor"])
+
+
+class InvalidCursorException(ValueError):
+    pass
+
+
+def get_keyset_ordering(queryset) -> list[str]:
+    """
+        Returns the ordering of the queryset extended with the primary key,
+        so that every row has a unique position in the sort.
+    """
+    ordering = [str(field) for field in (queryset.query.order_by or queryset.model._meta.ordering)]
+    field_names = {field.lstrip("-") for field in ordering}
+
+    if "pk" not in field_names and queryset.model._meta.pk.name not in field_names:
+        ordering.append("pk")
+
+    return ordering
+
+
+def encode_cursor(ordering: list[str], values: list) -> str:
+    payload = json.dumps({"o": ordering, "v": values}, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, ordering: list[str]) -> list:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        cursor_ordering, values = payload["o"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursorException(f"Invalid cursor: {cursor}")
+
+    if cursor_ordering != ordering or len(values) != len(ordering):
+        raise InvalidCursorException("Cursor does not match the requested sort order")
+
+    return values
+
+
+def _row_value(row, field: str):
+    *path, name = field.split("__")
+    for related_name in path:
+        row = getattr(row, related_name)
+
+    if name == "pk":
+        return row.pk
+
+    try:
+        model_field = row._meta.get_field(name)
+    except FieldDoesNotExist:
+        return getattr(row, name)
+
+    if model_field.is_relation and model_field.many_to_one:
+        return getattr(row, model_field.attname)
+    return getattr(row, name)
+
+
+def get_row_values(row, ordering: list[str]) -> list:
+    return [_row_value(row, field.lstrip("-")) for field in ordering]
+
+
+def _after(field: str, value, descending: bool) -> Q:
+    # PostgreSQL puts NULLs last in ascending and first in descending order.
+    if value is None:
+        return Q(**{f"{field}__isnull": False}) if descending else Q(pk__in=[])
+
+    if descending:
+        return Q(**{f"{field}__lt": value})
+    return Q(**{f"{field}__gt": value}) | Q(**{f"{field}__isnull": True})
+
+
+def _equal(field: str, value) -> Q:
+    if value is None:
+        return Q(**{f"{field}__isnull": True})
+    return Q(**{field: value})
+
+
+def keyset_filter(ordering: list[str], values: list) -> Q:
+    """
+        Builds the condition selecting rows positioned strictly after the row
+        with the given sort values: (a > x) OR (a = x AND b > y) OR ...
+    """
+    condition = Q(pk__in=[])
+    preceding = Q()
+
+    for field, value in zip(ordering, values):
+        descending = field.startswith("-")
+        field = field.lstrip("-")
+
+        condition |= preceding & _after(field, value, descending)
+        preceding &= _equal(field, value)
+
+    return condition
+
+
+def paginate_keyset(queryset, cursor: str | None, limit: int) -> KeysetPage:
+    if limit < 0:
+        raise ValueError("Limit must be a non-negative integer")
+
+    ordering = get_keyset_ordering(queryset)
+    queryset = queryset.order_by(*ordering)
+
+    if cursor:
+        values = decode_cursor(cursor, ordering)
+        queryset = queryset.filter(keyset_filter(ordering, values))
+
+    rows = list(queryset[:limit + 1])
+    results = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit and results:
+        next_cursor = encode_cursor(ordering, get_row_values(results[-1], ordering))
+
+    return KeysetPage(results, next_cursor)
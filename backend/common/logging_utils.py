@@ -6,20 +6,20 @@ def compare_instance_changes(old_instance: Model, new_instance: Model, prefix: s
          return changes
 
     for field in old_instance._meta.concrete_fields:
-        if field.primary_key:
+        if field.primary_key or not field.editable:
             continue
 
-        old_value = getattr(old_instance, field.name)
-        new_value = getattr(new_instance, field.name)
-
         if field.is_relation and field.many_to_one:
-             old_value_id = old_value.pk if old_value else None
-             new_value_id = new_value.pk if new_value else None
+             old_value_id = getattr(old_instance, field.attname)
+             new_value_id = getattr(new_instance, field.attname)
              if old_value_id != new_value_id:
                   field_name = f'{prefix}.{field.name}_id' if prefix else f'{field.name}_id'
                   changes.append((field_name, old_value_id, new_value_id))
              continue 
 
+        old_value = getattr(old_instance, field.name)
+        new_value = getattr(new_instance, field.name)
+
         if old_value != new_value:
             field_name = f'{prefix}.{field.name}' if prefix else field.name
             changes.append((field_name, old_value, new_value))
@@ -0,0 +1,77 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from common.search_cache import to_plain_data
+from common.search_service import SearchService
+from thesis.models import Thesis, ThesisStatus
+from thesis.serializers.thesis_list_serializer import ThesisListSerializer
+from thesis.serializers.thesis_serializer import ThesisSerializer
+from thesis_system.parsers import ORJSONParser
+from thesis_system.projection import get_projection
+from thesis_system.query_plan import apply_query_plan
+from thesis_system.renderers import ORJSONRenderer
+from users.models import User, Role
+from users.serializers.user_list_serializer import UserListSerializer
+
+
+class Command(BaseCommand):
+    help = 'Porównuje czas renderowania i parsowania JSON przez JSONRenderer/JSONParser i przez orjson.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Liczba powtórzeń każdego pomiaru.')
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/', HTTP_HOST='localhost')
+        open_theses = Thesis.objects.filter(status=ThesisStatus.APP_OPEN)
+        service = SearchService()
+
+        cases = [
+            ('/thesis/available/', lambda: get_projection(ThesisListSerializer).render(open_theses, request)),
+            ('/thesis/available/{id}/ x50', lambda: ThesisSerializer(
+                apply_query_plan(open_theses[:50], ThesisSerializer), many=True, context={'request': request}
+            ).data),
+            ('/common/search-topics/?facets=true', lambda: {
+                "results": ThesisListSerializer(
+                    apply_query_plan(service.search_topics(limit=50, offset=0), ThesisListSerializer),
+                    many=True, context={'request': request},
+                ).data,
+                "facets": service.search_topic_facets(),
+            }),
+            ('/users/', lambda: get_projection(UserListSerializer).render(
+                User.objects.filter(role__in=[Role.STUDENT, Role.SUPERVISOR], is_active=True), request
+            )),
+        ]
+
+        for endpoint, build in cases:
+            data = to_plain_data(build())
+            content = JSONRenderer().render(data)
+            if len(content) <= 2:
+                self.stdout.write(f'{endpoint}: brak danych, pominięto.')
+                continue
+
+            render_json = self._measure(lambda: JSONRenderer().render(data), options['repeat'])
+            render_orjson = self._measure(lambda: ORJSONRenderer().render(data), options['repeat'])
+            parse_json = self._measure(lambda: JSONParser().parse(io.BytesIO(content)), options['repeat'])
+            parse_orjson = self._measure(lambda: ORJSONParser().parse(io.BytesIO(content)), options['repeat'])
+
+            self.stdout.write(
+                f'{endpoint} ({len(content) / 1024:.0f} KiB): '
+                f'renderowanie {render_json * 1000:.2f} ms -> {render_orjson * 1000:.2f} ms '
+                f'({render_json / render_orjson:.1f}x), '
+                f'parsowanie {parse_json * 1000:.2f} ms -> {parse_orjson * 1000:.2f} ms '
+                f'({parse_json / parse_orjson:.1f}x)'
+            )
+
+    @staticmethod
+    def _measure(run, repeat) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.process_time()
+            run()
+            timings.append(time.process_time() - started)
+        return min(timings)
@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from thesis.models import Thesis, ThesisStatus
+from thesis.serializers.thesis_list_serializer import ThesisListSerializer
+from thesis_system.projection import get_projection
+from thesis_system.query_plan import apply_query_plan
+from users.models import User, Role
+from users.serializers.department_user_list_serializer import DepartmentUserListSerializer
+from users.serializers.user_list_serializer import UserListSerializer
+
+
+class Command(BaseCommand):
+    help = 'Porównuje czas CPU renderowania list przez serializery i przez projekcję values().'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Liczba powtórzeń każdego pomiaru.')
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/', HTTP_HOST='localhost')
+        students_and_supervisors = User.objects.filter(role__in=[Role.STUDENT, Role.SUPERVISOR])
+        first_department_id = students_and_supervisors.exclude(department=None).values_list('department_id', flat=True).first()
+
+        cases = [
+            ('/users/', UserListSerializer, students_and_supervisors.filter(is_active=True)),
+            ('/thesis/available/', ThesisListSerializer, Thesis.objects.filter(status=ThesisStatus.APP_OPEN)),
+            ('/users/coordinator-view/', DepartmentUserListSerializer, students_and_supervisors.filter(department_id=first_department_id)),
+        ]
+
+        for endpoint, serializer_class, queryset in cases:
+            rows = queryset.count()
+            if not rows:
+                self.stdout.write(f'{endpoint}: brak danych, pominięto.')
+                continue
+
+            serializer_time = self._measure(
+                lambda: serializer_class(
+                    apply_query_plan(queryset.all(), serializer_class), many=True, context={'request': request}
+                ).data,
+                options['repeat'],
+            )
+            projection_time = self._measure(
+                lambda: get_projection(serializer_class).render(queryset.all(), request),
+                options['repeat'],
+            )
+
+            self.stdout.write(
+                f'{endpoint} ({rows} wierszy): '
+                f'serializer {serializer_time / rows * 1e6:.1f} µs/wiersz, '
+                f'projekcja {projection_time / rows * 1e6:.1f} µs/wiersz, '
+                f'oszczędność {(serializer_time - projection_time) / rows * 1e6:.1f} µs/wiersz '
+                f'({serializer_time / projection_time:.1f}x)'
+            )
+
+    @staticmethod
+    def _measure(render, repeat) -> float:
+        """
+            Lowest CPU time of this process over `repeat` runs; time spent in
+            the database server is not included.
+        """
+        timings = []
+        for _ in range(repeat):
+            started = time.process_time()
+            render()
+            timings.append(time.process_time() - started)
+        return min(timings)
@@ -0,0 +1,29 @@
+import secrets
+
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    SearchCacheVersion = apps.get_model('common', 'SearchCacheVersion')
+    SearchCacheVersion.objects.bulk_create(
+        [SearchCacheVersion(namespace=namespace, version=secrets.randbits(62)) for namespace in ('users', 'topics', 'reference')],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0002_search_extensions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchCacheVersion',
+            fields=[
+                ('namespace', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField()),
+            ],
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
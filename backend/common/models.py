@@ -1,5 +1,23 @@
 from django.db import models
 from django.utils import timezone
+from django.db.models.functions import Lower
+from django.contrib.postgres.expressions import ArraySubquery
+
+
+class ImmutableUnaccent(models.Func):
+    """
+        unaccent() wrapped as an IMMUTABLE function (see migration 0002),
+        usable in generated columns and indexes.
+    """
+    function = 'immutable_unaccent'
+    output_field = models.TextField()
+
+
+def fold_text(expression):
+    """
+        Case- and diacritic-insensitive form of a text expression: "Wiśniewski" -> "wisniewski".
+    """
+    return Lower(ImmutableUnaccent(expression))
 
 
 class Department(models.Model):
@@ -7,6 +25,12 @@ class Department(models.Model):
         max_length=100
     )
     description = models.TextField()  
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
     
     def __str__(self):
         return f'Wydział: {self.name} \nOpis: {self.description}'
@@ -17,4 +41,80 @@ class Tag(models.Model):
     )
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+
+class SearchCacheVersion(models.Model):
+    """
+        Version of a search cache namespace, kept in the database so that a
+        bump made by one worker is seen by all of them.
+    """
+    namespace = models.CharField(
+        max_length=50,
+        primary_key=True
+    )
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f'{self.namespace}: {self.version}'
+
+
+class TaggedQuerySet(models.QuerySet):
+    """
+        QuerySet of a model keeping the ids of its `tags` in a `tag_ids` array
+        column, so tag filters do not need to join the M2M table.
+    """
+    def _tag_ids_subquery(self):
+        tags_field = self.model._meta.get_field('tags')
+        through = tags_field.remote_field.through
+
+        return ArraySubquery(
+            through.objects.filter(
+                **{tags_field.m2m_field_name(): models.OuterRef('pk')}
+            ).order_by('pk').values(tags_field.m2m_reverse_field_name())
+        )
+
+    def with_tag_names(self):
+        """
+            Annotates `tag_names`, the names of the tags in the order they were added.
+        """
+        tags_field = self.model._meta.get_field('tags')
+        through = tags_field.remote_field.through
+
+        return self.annotate(tag_names=ArraySubquery(
+            through.objects.filter(
+                **{tags_field.m2m_field_name(): models.OuterRef('pk')}
+            ).order_by('pk').values(f'{tags_field.m2m_reverse_field_name()}__name')
+        ))
+
+    def sync_tag_ids(self, touch=False):
+        """
+            Recomputes `tag_ids`; with `touch` also moves `updated_at`, since
+            the tags are part of the representation of the rows.
+        """
+        if touch:
+            return self.update(tag_ids=self._tag_ids_subquery(), updated_at=timezone.now())
+        return self.update(tag_ids=self._tag_ids_subquery())
+
+    def stale_tag_ids(self):
+        return self.exclude(tag_ids=self._tag_ids_subquery())
+
+
+class TaggedModelMixin:
+    """
+        Leaves `maintained_fields` out of regular saves, so that a stale
+        in-memory copy never overwrites the columns maintained by queryset
+        updates, such as the `tag_ids` array kept in sync with the M2M.
+    """
+    maintained_fields = ['tag_ids']
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not args:
+            deferred_fields = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.maintained_fields
+                and field.attname not in deferred_fields
+            ]
+        super().save(*args, **kwargs)
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import secrets
+import threading
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+from common.models import SearchCacheVersion
+
+
+USERS = "users"
+TOPICS = "topics"
+REFERENCE = "reference"
+
+
+def to_plain_data(data):
+    """
+        Copy of serialized data using only builtin types. Some serializer values
+        keep references to model instances (e.g. `Hyperlink` keeps its object),
+        which must not end up pickled in the cache. Named tuples keep their type.
+    """
+    if isinstance(data, dict):
+        return {key: to_plain_data(value) for key, value in data.items()}
+    if isinstance(data, tuple) and hasattr(data, "_fields"):
+        return type(data)(*(to_plain_data(value) for value in data))
+    if isinstance(data, (list, tuple)):
+        return [to_plain_data(value) for value in data]
+    if isinstance(data, str) and type(data) is not str:
+        return str(data)
+    return data
+
+
+class SearchCache:
+    """
+        Cache of serialized search responses.
+
+        Every namespace has a version which is part of each entry key. Versions
+        live in the `SearchCacheVersion` table, so all workers see the same ones.
+        Writes replace the version once their transaction commits, which makes
+        all entries computed from the old data unreachable in every worker; they
+        expire on their own. The entries themselves stay in the `alias` cache.
+
+        Versions are random rather than incremented, so a version rolled back
+        together with its transaction is never handed out again.
+    """
+    def __init__(self, alias="search", timeout=300):
+        self.alias = alias
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def _new_version() -> int:
+        return secrets.randbits(62)
+
+    def get_versions(self, namespaces) -> dict:
+        """
+            Current versions of `namespaces` in one query; missing ones are created.
+        """
+        versions = dict(SearchCacheVersion.objects.filter(namespace__in=namespaces).values_list("namespace", "version"))
+        missing = [namespace for namespace in namespaces if namespace not in versions]
+        if missing:
+            SearchCacheVersion.objects.bulk_create(
+                [SearchCacheVersion(namespace=namespace, version=self._new_version()) for namespace in missing],
+                ignore_conflicts=True,
+            )
+            versions.update(SearchCacheVersion.objects.filter(namespace__in=missing).values_list("namespace", "version"))
+        return versions
+
+    def get_version(self, namespace: str) -> int:
+        return self.get_versions([namespace])[namespace]
+
+    def make_key(self, namespaces: list[str], params: dict) -> str:
+        current = self.get_versions(namespaces)
+        versions = ".".join(str(current[namespace]) for namespace in namespaces)
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{'+'.join(namespaces)}:{versions}:{digest}"
+
+    def get_or_set(self, namespaces: list[str], params: dict, compute, timeout=None):
+        """
+            Returns a tuple (value, hit). `compute` is only called on a miss.
+            Entries live `timeout` seconds, by default the cache's own timeout.
+        """
+        key = self.make_key(namespaces, params)
+        value = self.cache.get(key)
+
+        if value is not None:
+            self._count(hit=True)
+            return value, True
+
+        self._count(hit=False)
+        value = to_plain_data(compute())
+        self.cache.set(key, value, timeout or self.timeout)
+        return value, False
+
+    def _bump(self, namespaces):
+        SearchCacheVersion.objects.filter(namespace__in=namespaces).update(version=self._new_version())
+
+    def invalidate(self, *namespaces: str):
+        transaction.on_commit(lambda: self._bump(namespaces))
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self._hits, self._misses
+
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+            "versions": self.get_versions([USERS, TOPICS, REFERENCE]),
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+search_cache = SearchCache()
+
+
+class LocalIndex:
+    """
+        Process-local structure built by `build`, rebuilt on first use after
+        one of the search cache versions of `namespaces` changed, or after
+        `max_age` seconds for writes that do not bump a version.
+    """
+    def __init__(self, namespaces: list[str], build, max_age=300):
+        self.namespaces = namespaces
+        self.build = build
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._value = None
+        self._versions = None
+        self._built_at = 0.0
+
+    def get(self):
+        current = search_cache.get_versions(self.namespaces)
+        versions = tuple(current[namespace] for namespace in self.namespaces)
+        with self._lock:
+            if self._value is None or self._versions != versions or time.monotonic() - self._built_at > self.max_age:
+                self._value = self.build()
+                self._versions = versions
+                self._built_at = time.monotonic()
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
@@ -1,67 +1,109 @@
-from users.models import User, ACADEMIC_TITLE_SORT_ORDER, Role, SupervisorProfile, AcademicTitle
-from thesis.models import Thesis, ThesisStatus, ThesisType, THESIS_TYPE_SORT_ORDER
-from django.db.models import Case, When, Value, IntegerField, Q, Count
+from users.models import User, Role, SupervisorProfile, AcademicTitle
+from thesis.models import Thesis, ThesisStatus, ThesisType, THESIS_SEARCH_CONFIGS
+from common.models import Tag, fold_text
+from django.db.models import Func, F, Q, Count, CharField, FloatField, IntegerField, BigIntegerField, Value
+from django.db.models.functions import Cast
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from common.keyset_pagination import paginate_keyset
+from thesis.serializers.thesis_list_serializer import ThesisListSerializer
+from thesis_system.query_plan import apply_query_plan
+from users.serializers.user_serializer import UserSerializer
+
+
+class ArrayIntersectionLength(Func):
+    """
+        Number of elements shared by an array column and a list of values.
+    """
+    output_field = IntegerField()
+
+    def __init__(self, expression, values, **extra):
+        super().__init__(expression, Value(values, output_field=ArrayField(BigIntegerField())), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (lhs, lhs_params), (rhs, rhs_params) = (
+            compiler.compile(expression) for expression in self.get_source_expressions()
+        )
+        sql = f"cardinality(ARRAY(SELECT unnest({lhs}) INTERSECT SELECT unnest({rhs})))"
+        return sql, (*lhs_params, *rhs_params)
+
+
+TOPIC_FACETS = {
+    "tags": "tags__name",
+    "thesis_type": "thesis_type",
+    "language": "language",
+    "department": "supervisor_id__user__department__name",
+}
+
 
 class SearchService():
     @staticmethod
-    def _annotate_academic_title_order(queryset):
-        when_condition = [
-            When(academic_title=key, then=Value(value))
-            for key, value in ACADEMIC_TITLE_SORT_ORDER.items()
-        ]
+    def _resolve_tag_ids(tags: list[str]) -> list[int]:
+        return list(Tag.objects.filter(name__in=tags).values_list("id", flat=True))
 
-        return queryset.annotate(
-            academic_title_order=Case(
-                *when_condition,
-                output_field=IntegerField(),
-            )
-        )
+    @staticmethod
+    def _filter_by_tags(queryset, tag_ids: list[int]):
+        return queryset.filter(tag_ids__overlap=tag_ids)
     
     @staticmethod
-    def _annotate_supervisor_title_order(queryset):
-        when_condition = [
-            When(supervisor_id__user__academic_title=key, then=Value(value))
-            for key, value in ACADEMIC_TITLE_SORT_ORDER.items()
-        ]
-
+    def _annotate_tag_count(queryset, tag_ids: list[int]):
         return queryset.annotate(
-            supervisor_title_order=Case(
-                *when_condition,
-                output_field=IntegerField()
-            )
+            matching_tag_count=ArrayIntersectionLength(F("tag_ids"), tag_ids)
         )
     
     @staticmethod
-    def _annotate_thesis_type_order(queryset):
-        when_condition = [
-            When(thesis_type=key, then=Value(value))
-            for key, value in THESIS_TYPE_SORT_ORDER.items()
-        ]
+    def _filter_by_names(queryset, names: dict[str, str], fuzzy=False):
+        """
+            Matches folded name prefixes, so "wisn" finds "Wiśniewski". In fuzzy mode
+            trigram-similar names match as well and rows get a `name_similarity` score,
+            cast to double precision so a keyset cursor compares equal to the row it
+            came from (a real read back as a Python float does not).
+        """
+        similarity = None
+        for field, name in names.items():
+            folded_field = f"{field}_folded"
+            folded_name = fold_text(Value(name))
+            condition = Q(**{f"{folded_field}__startswith": folded_name})
 
-        return queryset.annotate(
-            thesis_type_order=Case(
-                *when_condition,
-                output_field=IntegerField()
-            )
+            if fuzzy:
+                condition |= Q(**{f"{folded_field}__trigram_similar": folded_name})
+                field_similarity = TrigramSimilarity(folded_field, folded_name)
+                similarity = field_similarity if similarity is None else similarity + field_similarity
+
+            queryset = queryset.filter(condition)
+
+        if similarity is not None:
+            queryset = queryset.annotate(name_similarity=Cast(similarity, FloatField()))
+
+        return queryset
+
+    @staticmethod
+    def _filter_by_text(queryset, text: str):
+        search_query = None
+        for config in THESIS_SEARCH_CONFIGS:
+            config_query = SearchQuery(text, config=config, search_type="websearch")
+            search_query = config_query if search_query is None else search_query | config_query
+
+        # Double precision for keyset cursors, see _filter_by_names.
+        return queryset.filter(search_vector=search_query).annotate(
+            rank=Cast(SearchRank(F("search_vector"), search_query), FloatField())
         )
-    
+
     @staticmethod
-    def _filter_by_tags(queryset, tags: list[str]):
-        query = Q()
-        for tag in tags:
-            query |= Q(tags__name=tag)
+    def _with_user_relations(queryset, fields=None):
+        """
+            Joins departments and prefetches tags, so a page of users is
+            serialized without per-row queries. A selection of `fields` of
+            UserSerializer leaves the relations and columns it does not read out.
+        """
+        return apply_query_plan(queryset, UserSerializer, fields)
 
-        return queryset.filter(query).distinct()
-    
     @staticmethod
-    def _annotate_tag_count(queryset, tags: list[str]):
-        return queryset.annotate(
-            matching_tag_count=Count(
-                'tags',
-                filter=Q(tags__name__in=tags),
-                distinct=True
-            )
-        )
+    def _with_topic_relations(queryset, fields=None):
+        """
+            Same as _with_user_relations for theses rendered by ThesisListSerializer.
+        """
+        return apply_query_plan(queryset, ThesisListSerializer, fields)
     
     def __search_all_match(
         self, 
@@ -72,6 +114,7 @@ class SearchService():
         role,
         sort_by, 
         orders,
+        fuzzy=False,
     ):
         if sort_by is not None and len(sort_by) != len(orders):
             raise ValueError("Length of sort_by and orders must be of the same length")
@@ -86,27 +129,26 @@ class SearchService():
             
             results = results.filter(role=role_value)
 
-        if first_name:
-            results = results.filter(first_name=first_name)
-
-        if last_name:
-            results = results.filter(last_name=last_name)
+        names = {"first_name": first_name, "last_name": last_name}
+        names = {field: name for field, name in names.items() if name}
+        if names:
+            results = self._filter_by_names(results, names, fuzzy=fuzzy)
 
         if department:
             results = results.filter(department__name=department)
 
         if tags:
-            results = self._filter_by_tags(results, tags)
+            tag_ids = self._resolve_tag_ids(tags)
+            results = self._filter_by_tags(results, tag_ids)
 
+        order_by_arguments = []
         if sort_by:
-            order_by_arguments = []
             for field, order in zip(sort_by, orders):
                 if field == "academic_title":
-                    results = self._annotate_academic_title_order(results)
                     field = "academic_title_order"
 
                 if tags and field == "matching_tag_count":
-                    results = self._annotate_tag_count(results, tags)
+                    results = self._annotate_tag_count(results, tag_ids)
                 elif field == "matching_tag_count":
                     continue
 
@@ -115,6 +157,10 @@ class SearchService():
                 else:
                     order_by_arguments.append(field)
 
+        if fuzzy and names:
+            order_by_arguments.insert(0, "-name_similarity")
+
+        if order_by_arguments:
             results = results.order_by(*order_by_arguments)
 
         return results
@@ -130,6 +176,8 @@ class SearchService():
         orders=["desc"], 
         limit=10, 
         offset=0,
+        fuzzy=False,
+        fields=None,
     ):
         if limit < 0 or offset < 0:
             raise ValueError(f"Limit and offset must be non-negative integers")
@@ -142,27 +190,55 @@ class SearchService():
             role=role,
             sort_by=sort_by,
             orders=orders,
+            fuzzy=fuzzy,
         )
 
-        return all_results[offset:offset+limit]
-    
-    def search_topics(
+        return self._with_user_relations(all_results, fields)[offset:offset+limit]
+
+    def search_user_page(
         self, 
         first_name=None,
         last_name=None,
-        academic_title=None,
         tags=None, 
         department=None, 
-        thesis_type=None,
-        language=None,
-        sort_by = None,
-        orders = None,
+        role=None,
+        sort_by=["academic_title"], 
+        orders=["desc"], 
         limit=10, 
-        offset=0,
+        cursor=None,
+        fuzzy=False,
+        fields=None,
     ):
-        if limit < 0 or offset < 0:
-            raise ValueError(f"Limit and offset must be non-negative integers")
+        """
+            Keyset variant of search_user. Returns a KeysetPage whose next_cursor
+            continues the listing right after its last row.
+        """
+        all_results = self.__search_all_match(
+            first_name=first_name, 
+            last_name=last_name,
+            tags=tags,
+            department=department,
+            role=role,
+            sort_by=sort_by,
+            orders=orders,
+            fuzzy=fuzzy,
+        )
 
+        return paginate_keyset(self._with_user_relations(all_results, fields), cursor=cursor, limit=limit)
+    
+    def __search_topics_match(
+        self,
+        first_name,
+        last_name,
+        academic_title,
+        tags,
+        department,
+        thesis_type,
+        language,
+        q,
+        sort_by,
+        orders,
+    ):
         supervisors = self.__search_all_match(
             first_name=first_name, 
             last_name=last_name,
@@ -187,7 +263,6 @@ class SearchService():
             
             topics = topics.filter(supervisor_id__user__academic_title=academic_title_value)
         else:
-            topics = self._annotate_supervisor_title_order(topics)
             order_by_arguments.append("-supervisor_title_order")
 
         if thesis_type:
@@ -198,35 +273,159 @@ class SearchService():
             
             topics = topics.filter(thesis_type=thesis_type_value)
         else:
-            topics = self._annotate_thesis_type_order(topics)
             order_by_arguments.append('-thesis_type_order')
 
         if language:
             topics = topics.filter(language=language)
 
+        if q:
+            topics = self._filter_by_text(topics, q)
+            order_by_arguments.insert(0, "-rank")
+
         if order_by_arguments:
             topics = topics.order_by(*order_by_arguments)
     
         if tags:
-            topics = self._filter_by_tags(topics, tags)
+            tag_ids = self._resolve_tag_ids(tags)
+            topics = self._filter_by_tags(topics, tag_ids)
 
         if sort_by:
             order_by_arguments = []
             for field, order in zip(sort_by, orders):
                 if field == "academic_title":
-                    topics = self._annotate_supervisor_title_order(topics)
                     field = "supervisor_title_order"
 
                 if tags and field == "matching_tag_count":
-                    topics = self._annotate_tag_count(topics, tags)
+                    topics = self._annotate_tag_count(topics, tag_ids)
                 elif field == "matching_tag_count":
                     continue
 
+                if field == "rank" and not q:
+                    continue
+
                 if order == "desc":
                     order_by_arguments.append(f"-{field}")
                 else:
                     order_by_arguments.append(field)
 
+            # An explicit sort comes first, relevance still orders its ties.
+            if q and "rank" not in sort_by:
+                order_by_arguments.append("-rank")
+
             topics = topics.order_by(*order_by_arguments)
 
-        return topics[offset:offset+limit]
+        return topics
+
+    def search_topics(
+        self, 
+        first_name=None,
+        last_name=None,
+        academic_title=None,
+        tags=None, 
+        department=None, 
+        thesis_type=None,
+        language=None,
+        q=None,
+        sort_by = None,
+        orders = None,
+        limit=10, 
+        offset=0,
+        fields=None,
+    ):
+        if limit < 0 or offset < 0:
+            raise ValueError(f"Limit and offset must be non-negative integers")
+
+        topics = self.__search_topics_match(
+            first_name=first_name,
+            last_name=last_name,
+            academic_title=academic_title,
+            tags=tags,
+            department=department,
+            thesis_type=thesis_type,
+            language=language,
+            q=q,
+            sort_by=sort_by,
+            orders=orders,
+        )
+
+        return self._with_topic_relations(topics, fields)[offset:offset+limit]
+
+    def search_topics_page(
+        self, 
+        first_name=None,
+        last_name=None,
+        academic_title=None,
+        tags=None, 
+        department=None, 
+        thesis_type=None,
+        language=None,
+        q=None,
+        sort_by = None,
+        orders = None,
+        limit=10, 
+        cursor=None,
+        fields=None,
+    ):
+        """
+            Keyset variant of search_topics. Returns a KeysetPage whose next_cursor
+            continues the listing right after its last row.
+        """
+        topics = self.__search_topics_match(
+            first_name=first_name,
+            last_name=last_name,
+            academic_title=academic_title,
+            tags=tags,
+            department=department,
+            thesis_type=thesis_type,
+            language=language,
+            q=q,
+            sort_by=sort_by,
+            orders=orders,
+        )
+
+        return paginate_keyset(self._with_topic_relations(topics, fields), cursor=cursor, limit=limit)
+
+    def search_topic_facets(
+        self,
+        first_name=None,
+        last_name=None,
+        academic_title=None,
+        tags=None,
+        department=None,
+        thesis_type=None,
+        language=None,
+        q=None,
+    ):
+        """
+            Number of theses matching the filters per tag, thesis type, language
+            and department. All facets are counted in a single query.
+        """
+        topics = self.__search_topics_match(
+            first_name=first_name,
+            last_name=last_name,
+            academic_title=academic_title,
+            tags=tags,
+            department=department,
+            thesis_type=thesis_type,
+            language=language,
+            q=q,
+            sort_by=None,
+            orders=None,
+        )
+        topic_ids = topics.order_by().values("pk")
+
+        facet_querysets = [
+            Thesis.objects.filter(pk__in=topic_ids, **{f"{lookup}__isnull": False})
+            .annotate(facet=Value(facet), value=Cast(lookup, CharField()))
+            .values("facet", "value")
+            .annotate(count=Count("pk"))
+            .order_by()
+            for facet, lookup in TOPIC_FACETS.items()
+        ]
+        rows = facet_querysets[0].union(*facet_querysets[1:], all=True)
+
+        facets = {facet: {} for facet in TOPIC_FACETS}
+        for row in rows:
+            facets[row["facet"]][row["value"]] = row["count"]
+
+        return facets
@@ -0,0 +1,93 @@
+import unicodedata
+from bisect import bisect_left
+from collections import namedtuple
+
+from common.models import Tag
+from common.search_cache import LocalIndex, REFERENCE, TOPICS, USERS
+from thesis.models import Thesis, ThesisStatus
+from users.models import User, Role
+
+
+MAX_SUGGESTIONS = 10
+
+Suggestion = namedtuple("Suggestion", ["id", "label"])
+
+
+def fold(text: str) -> str:
+    """
+        Python counterpart of `common.models.fold_text`: "Łukasz Wiśniewski" -> "lukasz wisniewski".
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower().replace("ł", "l"))
+    return " ".join("".join(char for char in decomposed if not unicodedata.combining(char)).split())
+
+
+class PrefixIndex:
+    """
+        Sorted list of folded keys. Every item is reachable from the start of
+        each of its words, so "pyt" suggests "Matematyczny Python".
+    """
+    def __init__(self, items):
+        entries = []
+        for item_id, label in items:
+            if not label:
+                continue
+
+            words = fold(label).split(" ")
+            for position in range(len(words)):
+                entries.append((" ".join(words[position:]), item_id, label))
+
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.items = [Suggestion(item_id, label) for _, item_id, label in entries]
+
+    def search(self, prefix: str, limit: int) -> list[Suggestion]:
+        results = []
+        seen = set()
+
+        position = bisect_left(self.keys, prefix)
+        while position < len(self.keys) and len(results) < limit and self.keys[position].startswith(prefix):
+            suggestion = self.items[position]
+            if suggestion.id not in seen:
+                seen.add(suggestion.id)
+                results.append(suggestion)
+            position += 1
+
+        return results
+
+
+def build_autocomplete_indexes() -> dict[str, PrefixIndex]:
+    supervisors = User.objects.filter(role=Role.SUPERVISOR).values_list("pk", "first_name", "last_name")
+
+    return {
+        "tags": PrefixIndex(Tag.objects.values_list("pk", "name")),
+        "theses": PrefixIndex(Thesis.objects.filter(status=ThesisStatus.APP_OPEN).values_list("pk", "name")),
+        "supervisors": PrefixIndex(
+            (pk, f"{first_name} {last_name}".strip()) for pk, first_name, last_name in supervisors
+        ),
+    }
+
+
+class AutocompleteService:
+    """
+        Typeahead over tag names, open thesis titles and supervisor names, served
+        from memory once the index is built; a lookup only reads the search
+        cache versions, and a write to any of the three rebuilds the index.
+    """
+    def __init__(self):
+        self.indexes = LocalIndex([USERS, TOPICS, REFERENCE], build_autocomplete_indexes)
+
+    def autocomplete(self, q: str, limit=5) -> dict[str, list[Suggestion]]:
+        if limit < 0:
+            raise ValueError("Limit must be a non-negative integer")
+
+        limit = min(limit, MAX_SUGGESTIONS)
+        prefix = fold(q or "")
+        indexes = self.indexes.get()
+
+        if not prefix:
+            return {kind: [] for kind in indexes}
+
+        return {kind: index.search(prefix, limit) for kind, index in indexes.items()}
+
+
+autocomplete_service = AutocompleteService()
@@ -4,6 +4,7 @@ from common.models import Department
 from django.utils import timezone
 from common.logging_utils import compare_instance_changes
 from common.serializers.department_serializer import DepartmentSerializer
+from common.search_cache import search_cache, USERS
 
 
 class DepartmentService:
@@ -16,7 +17,8 @@ class DepartmentService:
 
         
         changes = ''
-        if new_name != '' and new_name != department.name:
+        renamed = new_name != '' and new_name != department.name
+        if renamed:
             changes += f'zmienił nazwę wydziału z {department.name} na {new_name}'
             department.name = new_name
             
@@ -25,6 +27,7 @@ class DepartmentService:
             department.description = new_description
             
         department.save()
+        search_cache.invalidate(USERS)
         
         if changes != '':
             changes = f'Koordynator o ID {coordinator.id} dokonał następujących zmian: ' + changes
@@ -0,0 +1,201 @@
+from collections import namedtuple
+
+import numpy as np
+from scipy import sparse
+
+from django.db.models import Count, F, Q
+
+from common.models import Department
+from common.search_cache import LocalIndex, TOPICS, USERS
+from thesis.models import Thesis, ThesisStatus
+from users.models import User, Role, AcademicTitle, ACADEMIC_TITLE_SORT_ORDER
+
+
+class TagIndex:
+    """
+        Sparse binary row x tag matrix (rows are theses or users) together with
+        the document frequency of every tag, built from `tag_ids` columns.
+    """
+    def __init__(self, ids, tag_ids_per_row):
+        self.ids = np.asarray(ids, dtype=np.int64)
+
+        all_tag_ids = np.concatenate(
+            [np.asarray(tag_ids, dtype=np.int64) for tag_ids in tag_ids_per_row] or [np.empty(0, dtype=np.int64)]
+        )
+        self.tag_ids, columns = np.unique(all_tag_ids, return_inverse=True)
+        self.column_by_tag = {int(tag_id): column for column, tag_id in enumerate(self.tag_ids)}
+
+        row_lengths = np.fromiter((len(tag_ids) for tag_ids in tag_ids_per_row), dtype=np.int64, count=len(tag_ids_per_row))
+        indptr = np.concatenate(([0], np.cumsum(row_lengths)))
+
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(columns), dtype=np.float64), columns, indptr),
+            shape=(len(self.ids), len(self.tag_ids)),
+        )
+        self.matrix.sum_duplicates()
+        self.matrix.data[:] = 1.0
+
+        document_frequency = np.asarray(self.matrix.sum(axis=0)).ravel()
+        self.idf = np.log((1 + len(self.ids)) / (1 + document_frequency)) + 1
+        self.row_norms = np.sqrt(self.matrix @ (self.idf ** 2))
+
+    def score(self, tag_ids) -> np.ndarray:
+        """
+            IDF-weighted cosine similarity of every row to the given set of tags.
+        """
+        columns = [self.column_by_tag[tag_id] for tag_id in set(tag_ids) if tag_id in self.column_by_tag]
+        if not columns:
+            return np.zeros(len(self.ids))
+
+        query = np.zeros(len(self.tag_ids))
+        query[columns] = self.idf[columns]
+
+        # Query norm counts all tags, including ones no open thesis has.
+        unknown_tags = len(set(tag_ids)) - len(columns)
+        query_norm = np.sqrt(np.sum(query ** 2) + unknown_tags)
+
+        dot = self.matrix @ (query * self.idf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(self.row_norms > 0, dot / (self.row_norms * query_norm), 0.0)
+        return scores
+
+    def top_k(self, tag_ids, k: int) -> list[tuple[int, float]]:
+        scores = self.score(tag_ids)
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+
+        # Ties are broken by id, so the result does not depend on row order.
+        order = np.lexsort((self.ids[candidates], -scores[candidates]))
+        return [(int(self.ids[i]), float(scores[i])) for i in candidates[order]]
+
+
+SupervisorRanking = namedtuple("SupervisorRanking", ["user_id", "score", "tag_similarity", "free_capacity", "open_theses"])
+
+
+class SupervisorFeatures:
+    """
+        Feature matrix of supervisors: one row per supervisor, columns are tag
+        similarity (filled per request), free capacity and open theses count.
+    """
+    TAG_SIMILARITY_WEIGHT = 0.6
+    FREE_CAPACITY_WEIGHT = 0.25
+    OPEN_THESES_WEIGHT = 0.15
+
+    def __init__(self, rows):
+        self.tags = TagIndex([row["pk"] for row in rows], [row["tag_ids"] for row in rows])
+        self.ids = self.tags.ids
+        self.department_ids = np.array([row["department_id"] or 0 for row in rows], dtype=np.int64)
+        self.title_orders = np.array([row["academic_title_order"] for row in rows], dtype=np.int64)
+
+        self.features = np.zeros((len(rows), 3))
+        self.features[:, 1] = [max(row["free_capacity"] or 0, 0) for row in rows]
+        self.features[:, 2] = [row["open_theses"] for row in rows]
+
+        # Static columns are scaled to [0, 1], like the cosine similarity already is.
+        column_max = self.features.max(axis=0, initial=0)
+        self.scale = 1 / np.where(column_max > 0, column_max, 1)
+        self.scale[0] = 1
+        self.weights = np.array([self.TAG_SIMILARITY_WEIGHT, self.FREE_CAPACITY_WEIGHT, self.OPEN_THESES_WEIGHT])
+
+    def rank(self, tag_ids, department_id=None, title_order=None, limit=10, offset=0) -> list[SupervisorRanking]:
+        mask = np.ones(len(self.ids), dtype=bool)
+        if department_id is not None:
+            mask &= self.department_ids == department_id
+        if title_order is not None:
+            mask &= self.title_orders == title_order
+
+        features = self.features[mask]
+        features[:, 0] = self.tags.score(tag_ids)[mask]
+        scores = (features * self.scale) @ self.weights
+        ids = self.ids[mask]
+
+        order = np.lexsort((ids, -scores))[offset:offset + limit]
+        return [
+            SupervisorRanking(int(ids[i]), float(scores[i]), float(features[i, 0]), int(features[i, 1]), int(features[i, 2]))
+            for i in order
+        ]
+
+
+def build_topic_index() -> TagIndex:
+    rows = list(
+        Thesis.objects.filter(status=ThesisStatus.APP_OPEN).order_by("pk").values_list("pk", "tag_ids")
+    )
+    return TagIndex([pk for pk, _ in rows], [tag_ids for _, tag_ids in rows])
+
+
+def build_supervisor_features() -> SupervisorFeatures:
+    rows = list(
+        User.objects.filter(role=Role.SUPERVISOR, supervisorprofile__isnull=False)
+        .annotate(
+            free_capacity=(
+                F("supervisorprofile__bacherol_limit")
+                + F("supervisorprofile__engineering_limit")
+                + F("supervisorprofile__master_limit")
+                + F("supervisorprofile__phd_limit")
+            ),
+            open_theses=Count(
+                "supervisorprofile__thesis",
+                filter=Q(supervisorprofile__thesis__status=ThesisStatus.APP_OPEN),
+            ),
+        )
+        .order_by("pk")
+        .values("pk", "department_id", "academic_title_order", "tag_ids", "free_capacity", "open_theses")
+    )
+    return SupervisorFeatures(rows)
+
+
+class RecommendationService:
+    def __init__(self):
+        self.topic_index = LocalIndex([TOPICS], build_topic_index)
+        self.supervisor_features = LocalIndex([USERS, TOPICS], build_supervisor_features)
+
+    def invalidate(self):
+        self.topic_index.invalidate()
+        self.supervisor_features.invalidate()
+
+    def recommend_topics(self, user, limit=10) -> list[tuple[Thesis, float]]:
+        if limit < 0:
+            raise ValueError("Limit must be a non-negative integer")
+        if limit == 0 or not user.tag_ids:
+            return []
+
+        ranking = self.topic_index.get().top_k(user.tag_ids, limit)
+        theses = Thesis.objects.filter(status=ThesisStatus.APP_OPEN).prefetch_related("tags").in_bulk(
+            [pk for pk, _ in ranking]
+        )
+
+        return [(theses[pk], score) for pk, score in ranking if pk in theses]
+
+    def rank_supervisors(self, user, department=None, academic_title=None, limit=10, offset=0):
+        """
+            Supervisors ranked by tag similarity to `user`, free thesis capacity and
+            number of open theses. Returns a list of (User, SupervisorRanking).
+        """
+        if limit < 0 or offset < 0:
+            raise ValueError("Limit and offset must be non-negative integers")
+
+        department_id = None
+        if department:
+            department_id = Department.objects.filter(name=department).values_list("pk", flat=True).first()
+            if department_id is None:
+                return []
+
+        title_order = None
+        if academic_title:
+            try:
+                title_order = ACADEMIC_TITLE_SORT_ORDER[AcademicTitle[academic_title.upper()]]
+            except KeyError:
+                raise ValueError(f"Unknown academic title: {academic_title}")
+
+        ranking = self.supervisor_features.get().rank(
+            user.tag_ids, department_id, title_order, limit=limit, offset=offset
+        )
+        users = User.objects.select_related("department").prefetch_related("tags").in_bulk(
+            [row.user_id for row in ranking]
+        )
+
+        return [(users[row.user_id], row) for row in ranking if row.user_id in users]
+
+
+recommendation_service = RecommendationService()
@@ -0,0 +1,74 @@
+import hashlib
+import logging
+from collections import namedtuple
+
+from django.db import DatabaseError
+
+from common.models import Department, Tag
+from common.search_cache import LocalIndex, REFERENCE, search_cache
+from common.serializers.department_list_serializer import DepartmentListSerializer
+from common.serializers.tag_serializer import TagSerializer
+from thesis_system.compression import encode_json
+from thesis_system.projection import get_projection
+
+
+logger = logging.getLogger(__name__)
+
+# Writes to tags and departments bump the reference version, so entries can
+# live long; the timeout only bounds writes made outside of Django.
+REFERENCE_TIMEOUT = 60 * 60 * 24
+
+ReferenceList = namedtuple("ReferenceList", ["encoded", "digest"])
+
+
+def build_reference_list(name: str, queryset, serializer_class) -> ReferenceList:
+    encoded, _ = search_cache.get_or_set(
+        [REFERENCE],
+        {"reference": name},
+        lambda: encode_json(get_projection(serializer_class).render(queryset.order_by("pk"), request=None)),
+        timeout=REFERENCE_TIMEOUT,
+    )
+    return ReferenceList(encoded, hashlib.md5(encoded.content).hexdigest())
+
+
+class ReferenceDataService:
+    """
+        Tags and departments, kept in every process and in its search cache
+        under the `reference` version, which all processes read from the
+        database.
+    """
+    def __init__(self):
+        self.tags = LocalIndex(
+            [REFERENCE],
+            lambda: build_reference_list("tags", Tag.objects.all(), TagSerializer),
+            max_age=REFERENCE_TIMEOUT,
+        )
+        self.departments = LocalIndex(
+            [REFERENCE],
+            lambda: build_reference_list("departments", Department.objects.all(), DepartmentListSerializer),
+            max_age=REFERENCE_TIMEOUT,
+        )
+
+    def get_tags(self) -> ReferenceList:
+        return self.tags.get()
+
+    def get_departments(self) -> ReferenceList:
+        return self.departments.get()
+
+    def warm(self):
+        """
+            Loads both lists ahead of the first request. A database that is not
+            reachable yet only delays loading until the first request.
+        """
+        try:
+            self.get_tags()
+            self.get_departments()
+        except DatabaseError as e:
+            logger.warning("Reference data not warmed: %s", e)
+
+    def invalidate(self):
+        self.tags.invalidate()
+        self.departments.invalidate()
+
+
+reference_data_service = ReferenceDataService()
@@ -0,0 +1,111 @@
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from applications.models import Submission, SubmissionStatus
+from common.models import Department, Tag
+from common.search_cache import REFERENCE, search_cache
+from thesis.models import Thesis
+from users.models import User
+
+
+TAGGED_MODELS = [User, Thesis]
+
+
+def _sync_tag_ids(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        type(instance).objects.filter(pk=instance.pk).sync_tag_ids(touch=True)
+    elif pk_set:
+        model.objects.filter(pk__in=pk_set).sync_tag_ids(touch=True)
+    else:
+        model.objects.filter(tag_ids__contains=[instance.pk]).sync_tag_ids(touch=True)
+
+
+for tagged_model in TAGGED_MODELS:
+    m2m_changed.connect(
+        _sync_tag_ids,
+        sender=tagged_model.tags.through,
+        dispatch_uid=f"sync_tag_ids_{tagged_model._meta.label_lower}",
+    )
+
+
+@receiver(post_delete, sender=Tag)
+def remove_deleted_tag_ids(sender, instance, **kwargs):
+    for tagged_model in TAGGED_MODELS:
+        tagged_model.objects.filter(tag_ids__contains=[instance.pk]).sync_tag_ids(touch=True)
+
+
+@receiver(post_save, sender=Tag)
+def touch_renamed_tag_rows(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    for tagged_model in TAGGED_MODELS:
+        tagged_model.objects.filter(tag_ids__contains=[instance.pk]).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Department)
+def touch_renamed_department_users(sender, instance, created, **kwargs):
+    """
+        Users show the name of their department, its description is not part
+        of their representation.
+    """
+    loaded_values = getattr(instance, "_loaded_values", {})
+    if not created and loaded_values.get("name", models.DEFERRED) != instance.name:
+        User.objects.filter(department=instance).update(updated_at=timezone.now())
+    instance._loaded_values = {**loaded_values, "name": instance.name}
+
+
+@receiver(pre_delete, sender=Department)
+def touch_deleted_department_users(sender, instance, **kwargs):
+    # After the delete SET_NULL has already detached the users.
+    User.objects.filter(department=instance).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Department)
+def invalidate_reference_data(sender, **kwargs):
+    search_cache.invalidate(REFERENCE)
+
+
+@receiver(post_save, sender=Submission)
+def sync_accepted_count_on_save(sender, instance, **kwargs):
+    """
+        Keeps `Thesis.accepted_count` right for submissions saved outside of
+        SubmissionService, e.g. in the admin panel.
+    """
+    loaded = getattr(instance, "_loaded_values", {})
+    affected = set()
+    if instance.status == SubmissionStatus.ACCEPTED:
+        affected.add(instance.thesis_id)
+    if loaded.get("status") == SubmissionStatus.ACCEPTED:
+        affected.add(loaded["thesis_id"])
+
+    if affected:
+        Thesis.objects.filter(pk__in=affected).sync_accepted_count()
+    instance._loaded_values = {"thesis_id": instance.thesis_id, "status": instance.status}
+
+
+@receiver(post_delete, sender=Submission)
+def sync_accepted_count_on_delete(sender, instance, **kwargs):
+    if instance.status == SubmissionStatus.ACCEPTED:
+        Thesis.objects.filter(pk=instance.thesis_id).sync_accepted_count()
+
+
+@receiver(post_migrate)
+def sync_denormalized_columns(sender, app_config, **kwargs):
+    """
+        Backfills denormalized columns for rows written before the columns existed.
+    """
+    if app_config.name != "common":
+        return
+
+    for tagged_model in TAGGED_MODELS:
+        tagged_model.objects.stale_tag_ids().sync_tag_ids()
+
+    Thesis.objects.stale_supervisor_title_order().sync_supervisor_title_order()
+    Thesis.objects.stale_accepted_count().sync_accepted_count()
@@ -3,11 +3,18 @@ from rest_framework import status
 from rest_framework.authtoken.models import Token
 
 from common.models import Department, Tag
-from users.models import User, Role, AcademicTitle
+from users.models import User, Role, AcademicTitle, SupervisorProfile
+from thesis.models import Thesis, ThesisType, ThesisStatus
 from common.search_service import SearchService
+from common.search_cache import search_cache
+from common.services.reference_data_service import reference_data_service
+from users.services.user_service import user_service
 
 class UserSearchAPITest(APITestCase):
     def setUp(self):
+        search_cache.cache.clear()
+        search_cache.reset_stats()
+        reference_data_service.invalidate()
 
         self.user = User.objects.create_user(username="testuser", password="testpassword")
         response = self.client.post('/auth/login/', {
@@ -139,4 +146,132 @@ class UserSearchAPITest(APITestCase):
         self.assertEqual(len(results), 5)
 
         for i, (expected, recieved) in enumerate(zip(expected_order, results)):
-            self.assertEqual(expected.username, recieved['username'], f"Problem with {i}th element")
\ No newline at end of file
+            self.assertEqual(expected.username, recieved['username'], f"Problem with {i}th element")
+
+    def test_search_with_cursor(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/common/search-users/', {"role": "student", "limit": 3, "cursor": ""})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNotNone(response.data["next_cursor"])
+
+        response = self.client.get('/common/search-users/', {"role": "student", "limit": 3, "cursor": response.data["next_cursor"]})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2) # 4 students + requesting user
+        self.assertIsNone(response.data["next_cursor"])
+
+    def test_search_query_count(self):
+        self.client.force_authenticate(user=self.user)
+        for i in range(30):
+            student = User.objects.create_user(username=f"student_{i}", role=Role.STUDENT, department=self.department_1)
+            student.tags.add(*Tag.objects.all())
+
+        # Search cache versions, tag names, the page with departments joined, tags of the page.
+        with self.assertNumQueries(4):
+            response = self.client.get('/common/search-users/', {"tags": ["ML"], "limit": 30})
+
+        self.assertEqual(len(response.data), 30)
+        self.assertEqual(response.data[0]["department_name"], "Wydział A")
+
+        with self.assertNumQueries(4):
+            response = self.client.get('/common/search-users/', {"tags": ["ML"], "limit": 30, "cursor": ""})
+
+        self.assertEqual(len(response.data["results"]), 30)
+        tags = {user["username"]: user["tags"] for user in response.data["results"]}
+        self.assertEqual(len(tags["student_0"]), 4)
+
+    def test_search_fields(self):
+        self.client.force_authenticate(user=self.user)
+
+        # Search cache versions, tag names and the page, without departments or tags.
+        with self.assertNumQueries(3):
+            response = self.client.get('/common/search-users/', {"tags": ["ML"], "fields": "username,first_name"})
+
+        self.assertEqual(list(response.data[0]), ["username", "first_name"])
+
+        response = self.client.get('/common/search-users/', {"cursor": "", "exclude": "tags,description"})
+        self.assertNotIn("tags", response.data["results"][0])
+        self.assertIn("department_name", response.data["results"][0])
+
+    def test_search_with_invalid_cursor(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/common/search-users/', {"cursor": "broken"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_is_cached(self):
+        self.client.force_authenticate(user=self.user)
+        first = self.client.get('/common/search-users/', {"last_name": "Ogórek"})
+        second = self.client.get('/common/search-users/', {"last_name": "Ogórek"})
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(search_cache.stats()["hits"], 1)
+        self.assertEqual(search_cache.stats()["misses"], 1)
+
+    def test_search_cache_invalidated_by_tag_update(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/common/search-users/', {"tags": ["Java"]})
+        self.assertEqual(len(response.data), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user_service.update_user_tags(self.student_4, {"to_add": [Tag.objects.get(name="Java")]})
+
+        response = self.client.get('/common/search-users/', {"tags": ["Java"]})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data), 3)
+
+    def test_search_cache_invalidated_by_department_rename(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get('/common/search-users/', {"last_name": "Borowski"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.department_1.name = "Wydział Z"
+            self.department_1.save()
+
+        response = self.client.get('/common/search-users/', {"last_name": "Borowski"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data[0]["department_name"], "Wydział Z")
+
+    def test_search_cache_stats_requires_admin(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/common/search-cache-stats/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create_user(username="admin", role=Role.ADMIN)
+        self.client.force_authenticate(user=admin)
+        response = self.client.get('/common/search-cache-stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("hits", response.data)
+
+    def test_tag_list_ndjson(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/common/tags/', HTTP_ACCEPT="application/x-ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), Tag.objects.count())
+        self.assertEqual(lines[0], f'{{"id":{Tag.objects.first().pk},"name":"Python"}}')
+
+    def test_search_topics_with_facets(self):
+        SupervisorProfile.objects.create(user=self.supervisor_1)
+        for name in ["Sieci", "Grafy"]:
+            thesis = Thesis.objects.create(
+                supervisor_id=self.supervisor_1.supervisorprofile,
+                thesis_type=ThesisType.ENGINEERING,
+                name=name,
+                max_students=1,
+                status=ThesisStatus.APP_OPEN,
+                language="Polski",
+            )
+            thesis.tags.add(Tag.objects.get(name="Math"))
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/common/search-topics/', {"facets": "true", "limit": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["facets"]["tags"], {"Math": 2})
+        self.assertEqual(response.data["facets"]["department"], {"Wydział A": 2})
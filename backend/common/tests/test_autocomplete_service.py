@@ -0,0 +1,107 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from common.models import Tag
+from common.services.autocomplete_service import autocomplete_service, fold, PrefixIndex, MAX_SUGGESTIONS
+from users.models import User, Role, AcademicTitle, SupervisorProfile
+from thesis.models import Thesis, ThesisType, ThesisStatus
+
+
+class AutocompleteTests(APITestCase):
+    def setUp(self):
+        autocomplete_service.indexes.invalidate()
+
+        Tag.objects.create(name="Python")
+        Tag.objects.create(name="Programowanie")
+        Tag.objects.create(name="Uczenie maszynowe")
+
+        self.supervisor = User.objects.create_user(
+            username="lwisniewski",
+            first_name="Łukasz",
+            last_name="Wiśniewski",
+            academic_title=AcademicTitle.DOCTOR,
+            role=Role.SUPERVISOR,
+        )
+        profile = SupervisorProfile.objects.create(user=self.supervisor)
+        User.objects.create_user(username="student", first_name="Patryk", role=Role.STUDENT)
+
+        self.thesis = Thesis.objects.create(
+            supervisor_id=profile,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Matematyczny Python",
+            max_students=1,
+            status=ThesisStatus.APP_OPEN,
+            language="Polski",
+        )
+        Thesis.objects.create(
+            supervisor_id=profile,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Python zamknięty",
+            max_students=1,
+            status=ThesisStatus.APP_CLOSED,
+            language="Polski",
+        )
+
+    def test_fold(self):
+        self.assertEqual(fold("  Łukasz   WIŚNIEWSKI "), "lukasz wisniewski")
+
+    def test_prefix_of_any_word(self):
+        suggestions = autocomplete_service.autocomplete("pyt")
+
+        self.assertEqual([s.label for s in suggestions["tags"]], ["Python"])
+        self.assertEqual([s.id for s in suggestions["theses"]], [self.thesis.pk])
+        self.assertEqual(suggestions["supervisors"], [])
+
+    def test_supervisor_names_ignore_diacritics(self):
+        for query in ["wisn", "lukasz w", "Łukasz Wiś"]:
+            suggestions = autocomplete_service.autocomplete(query)
+            self.assertEqual([s.id for s in suggestions["supervisors"]], [self.supervisor.pk], query)
+
+    def test_warm_index_only_reads_versions(self):
+        autocomplete_service.autocomplete("p")
+
+        with self.assertNumQueries(1):
+            autocomplete_service.autocomplete("pr")
+
+    def test_new_tag_rebuilds_index(self):
+        autocomplete_service.autocomplete("s")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name="Sieci neuronowe")
+
+        suggestions = autocomplete_service.autocomplete("siec")
+        self.assertEqual([s.label for s in suggestions["tags"]], ["Sieci neuronowe"])
+
+    def test_result_size_is_capped(self):
+        suggestions = autocomplete_service.autocomplete("p", limit=1000)
+        self.assertLessEqual(len(suggestions["tags"]), MAX_SUGGESTIONS)
+
+    def test_empty_query(self):
+        suggestions = autocomplete_service.autocomplete("   ")
+        self.assertEqual(suggestions, {"tags": [], "theses": [], "supervisors": []})
+
+    def test_endpoint(self):
+        self.client.force_authenticate(user=self.supervisor)
+        response = self.client.get('/common/autocomplete/', {"q": "ucz"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["tags"][0]["label"], "Uczenie maszynowe")
+
+    def test_lookup_reads_few_keys(self):
+        index = PrefixIndex((pk, f"Praca dyplomowa numer {pk}") for pk in range(20000))
+        index.keys = CountingList(index.keys)
+
+        # A binary search to the first match, then one key per suggestion.
+        max_reads = len(index.keys).bit_length() + MAX_SUGGESTIONS + 1
+        for query in ["praca", "numer 1", "dyplomowa numer 19", "xyz"]:
+            index.keys.reads = 0
+            index.search(query, MAX_SUGGESTIONS)
+            self.assertLessEqual(index.keys.reads, max_reads, query)
+
+
+class CountingList(list):
+    reads = 0
+
+    def __getitem__(self, position):
+        self.reads += 1
+        return super().__getitem__(position)
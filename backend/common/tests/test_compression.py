@@ -0,0 +1,105 @@
+import gzip
+import json
+from unittest import mock
+
+import brotli
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.models import Department, Tag
+from common.search_cache import search_cache
+from common.services.reference_data_service import reference_data_service
+from thesis_system.compression import negotiate_encoding
+from users.models import User, Role
+
+
+class NegotiateEncodingTests(SimpleTestCase):
+    def test_prefers_brotli_on_equal_weights(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate, br"), "br")
+
+    def test_weights(self):
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip"), "gzip")
+        self.assertEqual(negotiate_encoding("*;q=0.1, br;q=0"), "gzip")
+
+    def test_no_supported_encoding(self):
+        self.assertIsNone(negotiate_encoding(""))
+        self.assertIsNone(negotiate_encoding("deflate, identity"))
+        self.assertIsNone(negotiate_encoding("gzip;q=0"))
+
+
+class CompressionMiddlewareTests(APITestCase):
+    def setUp(self):
+        search_cache.cache.clear()
+        reference_data_service.invalidate()
+
+        self.department = Department.objects.create(name="Wydział Informatyki")
+        for i in range(60):
+            Tag.objects.create(name=f"Przetwarzanie języka naturalnego {i}")
+        self.user = User.objects.create_user(username="student", role=Role.STUDENT, department=self.department)
+
+    def test_brotli(self):
+        plain = self.client.get('/common/tags/')
+        response = self.client.get('/common/tags/', HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(response["ETag"], f"W/{plain['ETag']}")
+
+    def test_weak_etag_is_not_modified(self):
+        etag = self.client.get('/common/tags/', HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+
+        response = self.client.get('/common/tags/', HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cached_responses_are_compressed_once(self):
+        self.client.force_authenticate(user=self.user)
+        compress = mock.patch("brotli.compress", wraps=brotli.compress)
+
+        with compress as brotli_compress:
+            self.client.get('/common/tags/', HTTP_ACCEPT_ENCODING="br")
+            self.client.get('/common/search-users/', {"limit": 50}, HTTP_ACCEPT_ENCODING="br")
+        calls = brotli_compress.call_count
+
+        with compress as brotli_compress:
+            tags = self.client.get('/common/tags/', HTTP_ACCEPT_ENCODING="br")
+            self.client.get('/common/search-users/', {"limit": 50}, HTTP_ACCEPT_ENCODING="br")
+        self.assertEqual(brotli_compress.call_count, 0)
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(tags["Content-Encoding"], "br")
+        self.assertEqual(len(json.loads(brotli.decompress(tags.content))), 60)
+
+    def test_cached_search_gzip(self):
+        self.client.force_authenticate(user=self.user)
+        for i in range(30):
+            User.objects.create_user(
+                username=f"student_{i}", first_name="Bożydar", last_name="Źdźbło", role=Role.STUDENT,
+                department=self.department,
+            )
+
+        plain = self.client.get('/common/search-users/', {"limit": 30})
+        response = self.client.get('/common/search-users/', {"limit": 30}, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_small_response_is_not_compressed(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/users/me/tags/', HTTP_ACCEPT_ENCODING="br")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertNotIn("Accept-Encoding", response.get("Vary", ""))
+
+    def test_stream(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/users/', {"stream": 1}, HTTP_ACCEPT_ENCODING="br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertFalse(response.has_header("Content-Length"))
+        rows = json.loads(brotli.decompress(b"".join(response.streaming_content)))
+        self.assertEqual([row["email"] for row in rows], [self.user.email])
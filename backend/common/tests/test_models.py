@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.db.utils import IntegrityError, DataError
 from common.models import Department, Tag
+from users.models import User
 from django.db import transaction
 
 class DepartmentModelTests(TestCase):
@@ -48,4 +49,55 @@ class TagModelTests(TestCase):
         long_name = "a" * 101
         with self.assertRaises((IntegrityError, DataError)):
             with transaction.atomic():
-                 Tag.objects.create(name=long_name)
\ No newline at end of file
+                 Tag.objects.create(name=long_name)
+
+
+class TagIdsSyncTests(TestCase):
+    def setUp(self):
+        self.tag_python = Tag.objects.create(name="Python")
+        self.tag_java = Tag.objects.create(name="Java")
+        self.user = User.objects.create_user(username="jan")
+
+    def assertTagIds(self, user, expected_tags):
+        user.refresh_from_db()
+        self.assertEqual(sorted(user.tag_ids), sorted(tag.id for tag in expected_tags))
+
+    def test_tag_ids_follow_add_remove_and_clear(self):
+        self.user.tags.add(self.tag_python, self.tag_java)
+        self.assertTagIds(self.user, [self.tag_python, self.tag_java])
+
+        self.user.tags.remove(self.tag_python)
+        self.assertTagIds(self.user, [self.tag_java])
+
+        self.user.tags.clear()
+        self.assertTagIds(self.user, [])
+
+    def test_tag_ids_follow_reverse_changes(self):
+        self.tag_python.users.add(self.user)
+        self.assertTagIds(self.user, [self.tag_python])
+
+        self.tag_python.users.clear()
+        self.assertTagIds(self.user, [])
+
+    def test_tag_ids_follow_tag_deletion(self):
+        self.user.tags.add(self.tag_python, self.tag_java)
+        self.tag_python.delete()
+        self.assertTagIds(self.user, [self.tag_java])
+
+    def test_stale_tag_ids(self):
+        self.user.tags.add(self.tag_python)
+        User.objects.filter(pk=self.user.pk).update(tag_ids=[])
+        self.assertEqual(list(User.objects.stale_tag_ids()), [self.user])
+
+        User.objects.stale_tag_ids().sync_tag_ids()
+        self.assertFalse(User.objects.stale_tag_ids().exists())
+        self.assertTagIds(self.user, [self.tag_python])
+
+    def test_save_keeps_tag_ids(self):
+        stale_user = User.objects.get(pk=self.user.pk)
+        self.user.tags.add(self.tag_python)
+
+        stale_user.first_name = "Jan"
+        stale_user.save()
+
+        self.assertTagIds(self.user, [self.tag_python])
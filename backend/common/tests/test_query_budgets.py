@@ -0,0 +1,375 @@
+import logging
+from unittest import mock
+
+from django.urls import get_resolver, URLPattern, URLResolver
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from applications.models import Submission, SubmissionStatus, ThesisPreference
+from common.models import Department, Tag
+from common.search_cache import search_cache
+from common.services.autocomplete_service import autocomplete_service
+from common.services.reference_data_service import reference_data_service
+from common.services.recommendation_service import recommendation_service
+from thesis.models import Thesis, ThesisType, ThesisStatus
+from thesis_system import query_budget
+from thesis_system.query_budget import BUDGETED_PREFIXES, QueryBudgetTestMixin, fingerprint
+from users.models import User, Role, AcademicTitle, StudentProfile, SupervisorProfile
+
+
+def _named_routes(patterns, prefix="/"):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _named_routes(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield prefix + str(pattern.pattern), pattern.name
+
+
+class QueryBudgetDeclarationTests(SimpleTestCase):
+    def test_every_endpoint_has_a_budget(self):
+        routes = [
+            (route, name) for route, name in _named_routes(get_resolver().url_patterns)
+            if route.startswith(BUDGETED_PREFIXES)
+        ]
+
+        self.assertTrue(routes)
+        for route, name in routes:
+            self.assertIn(name, query_budget.QUERY_BUDGETS, f"No query budget declared for {route}")
+
+    def test_fingerprint_collapses_parameter_lists(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "t"."id" IN (%s, %s, %s)'),
+            fingerprint('SELECT * FROM "t"\n WHERE "t"."id" IN (%s)'),
+        )
+        self.assertEqual(
+            fingerprint('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO "t" ("a", "b") VALUES (%s, %s), ...',
+        )
+
+
+class EndpointQueryBudgetTests(QueryBudgetTestMixin, APITestCase):
+    """
+        Calls every budgeted endpoint with several rows behind it, so per-row
+        queries show up as a budget overrun.
+    """
+    def setUp(self):
+        search_cache.cache.clear()
+        autocomplete_service.indexes.invalidate()
+        recommendation_service.invalidate()
+        reference_data_service.invalidate()
+
+        self.department = Department.objects.create(name="Wydział A")
+        self.tags = [Tag.objects.create(name=f"Tag {i}") for i in range(3)]
+
+        self.coordinator = User.objects.create_user(
+            username="koordynator", email="k@example.com", role=Role.COORDINATOR, department=self.department
+        )
+        self.admin = User.objects.create_user(username="admin", role=Role.ADMIN, department=self.department)
+
+        self.supervisors = []
+        self.theses = []
+        for i in range(3):
+            supervisor = User.objects.create_user(
+                username=f"promotor{i}",
+                email=f"p{i}@example.com",
+                first_name="Jan",
+                last_name=f"Promotor{i}",
+                academic_title=AcademicTitle.DOCTOR,
+                role=Role.SUPERVISOR,
+                department=self.department,
+            )
+            supervisor.tags.add(*self.tags)
+            profile = SupervisorProfile.objects.create(
+                user=supervisor, bacherol_limit=5, engineering_limit=5, master_limit=5, phd_limit=5
+            )
+            self.supervisors.append(supervisor)
+
+            for j in range(3):
+                thesis = Thesis.objects.create(
+                    supervisor_id=profile,
+                    thesis_type=ThesisType.ENGINEERING,
+                    name=f"Praca {i}.{j}",
+                    max_students=3,
+                    status=ThesisStatus.APP_OPEN,
+                    language="Polski",
+                )
+                thesis.tags.add(*self.tags)
+                self.theses.append(thesis)
+
+        self.students = []
+        for i in range(4):
+            student = User.objects.create_user(
+                username=f"student{i}",
+                email=f"s{i}@example.com",
+                first_name="Anna",
+                last_name=f"Student{i}",
+                role=Role.STUDENT,
+                department=self.department,
+            )
+            student.tags.add(*self.tags)
+            StudentProfile.objects.create(user=student, index_number=f"10000{i}")
+            self.students.append(student)
+
+        self.submissions = [
+            Submission.objects.create(student=student.studentprofile, thesis=self.theses[0])
+            for student in self.students[:3]
+        ]
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f"JWT {AccessToken.for_user(user)}")
+
+    def assertEndpointWithinBudget(self, response, status_code=status.HTTP_200_OK):
+        self.assertEqual(response.status_code, status_code, response.content)
+        self.assertWithinQueryBudget(response)
+
+    # users
+
+    def test_user_list(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/users/'))
+
+    def test_user_detail(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get(f'/users/{self.supervisors[0].pk}/'))
+
+    def test_my_profile(self):
+        self.authenticate(self.supervisors[0])
+        self.assertEndpointWithinBudget(self.client.get('/users/me/'))
+
+    def test_update_my_profile(self):
+        self.authenticate(self.supervisors[0])
+        response = self.client.patch(
+            '/users/me/', {"user": {"description": "Nowy opis"}, "master_limit": 2}, format="json"
+        )
+        self.assertEndpointWithinBudget(response)
+
+    def test_update_tags(self):
+        self.authenticate(self.students[3])
+        response = self.client.put('/users/me/tags/', {"to_remove": [self.tags[0].pk]}, format="json")
+        self.assertEndpointWithinBudget(response)
+
+    def test_my_tags(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/users/me/tags/'))
+
+    def test_create_user(self):
+        self.authenticate(self.coordinator)
+        response = self.client.post('/users/create/', {
+            "email": "nowy@example.com",
+            "first_name": "Nowy",
+            "last_name": "Student",
+            "academic_title": AcademicTitle.NONE,
+            "role": Role.STUDENT,
+            "index_number": "200000",
+        }, format="json")
+        self.assertEndpointWithinBudget(response, status.HTTP_201_CREATED)
+
+    def test_coordinator_list(self):
+        self.authenticate(self.coordinator)
+        self.assertEndpointWithinBudget(self.client.get('/users/coordinator-view/'))
+
+    def test_coordinator_user_detail(self):
+        self.authenticate(self.coordinator)
+        self.assertEndpointWithinBudget(self.client.get(f'/users/coordinator-view/{self.students[0].pk}/'))
+
+    def test_coordinator_user_update(self):
+        self.authenticate(self.coordinator)
+        response = self.client.patch(
+            f'/users/coordinator-view/{self.students[0].pk}/', {"first_name": "Anita"}, format="json"
+        )
+        self.assertEndpointWithinBudget(response)
+
+    # thesis
+
+    def test_add_thesis(self):
+        self.authenticate(self.supervisors[0])
+        response = self.client.post('/thesis/add/', {
+            "thesis_type": ThesisType.MASTER,
+            "name": "Nowa praca",
+            "max_students": 1,
+        }, format="json")
+        self.assertEndpointWithinBudget(response, status.HTTP_201_CREATED)
+
+    def test_update_thesis(self):
+        self.authenticate(self.supervisors[1])
+        response = self.client.put(
+            f'/thesis/update/{self.theses[3].pk}/', {"name": "Zmieniona praca", "max_students": 2, "status": ThesisStatus.APP_OPEN, "tags": ["Tag 0"]}, format="json"
+        )
+        self.assertEndpointWithinBudget(response)
+
+    def test_available_theses(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/thesis/available/'))
+
+    def test_available_thesis_detail(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get(f'/thesis/available/{self.theses[0].pk}/'))
+
+    def test_delete_thesis(self):
+        self.authenticate(self.supervisors[1])
+        self.assertEndpointWithinBudget(self.client.delete(f'/thesis/delete/{self.theses[3].pk}/'))
+
+    def test_supervisor_theses(self):
+        self.authenticate(self.supervisors[0])
+        self.assertEndpointWithinBudget(self.client.get('/thesis/my-topics/'))
+
+    # common
+
+    def test_tag_list(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/common/tags/'))
+
+    def test_department_list(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/common/departments/'))
+
+    def test_search_users(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/common/search-users/', {"tags": ["Tag 0"]}))
+
+    def test_search_topics(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/common/search-topics/', {"tags": ["Tag 0"]}))
+
+    def test_department(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/common/department/'))
+
+    def test_department_update(self):
+        self.authenticate(self.coordinator)
+        response = self.client.patch('/common/department/', {"description": "Nowy opis"}, format="json")
+        self.assertEndpointWithinBudget(response)
+
+    def test_search_cache_stats(self):
+        self.authenticate(self.admin)
+        self.assertEndpointWithinBudget(self.client.get('/common/search-cache-stats/'))
+
+    def test_recommended_topics(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/common/recommended-topics/'))
+
+    def test_recommended_supervisors(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/common/recommended-supervisors/'))
+
+    def test_autocomplete(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/common/autocomplete/', {"q": "pra"}))
+
+    # applications
+
+    def test_submit_to_thesis(self):
+        self.authenticate(self.students[3])
+        response = self.client.post('/applications/submit/', {"thesis_id": self.theses[1].pk}, format="json")
+        self.assertEndpointWithinBudget(response, status.HTTP_201_CREATED)
+
+    @override_settings(SUBMISSION_INTAKE_MODE="queued")
+    def test_queued_submission(self):
+        self.authenticate(self.students[3])
+        response = self.client.post('/applications/submit/', {"thesis_id": self.theses[1].pk}, format="json")
+        self.assertEndpointWithinBudget(response, status.HTTP_202_ACCEPTED)
+        self.assertEndpointWithinBudget(self.client.get(f'/applications/tickets/{response.data["id"]}/'))
+
+    def test_cancel_submission(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.delete('/applications/cancel/'))
+
+    def test_submission_status(self):
+        self.authenticate(self.students[0])
+        self.assertEndpointWithinBudget(self.client.get('/applications/status/'))
+
+    def test_thesis_submissions(self):
+        self.authenticate(self.supervisors[0])
+        self.assertEndpointWithinBudget(self.client.get(f'/applications/thesis/{self.theses[0].pk}/submissions/'))
+
+    def test_accept_submission(self):
+        self.authenticate(self.supervisors[0])
+        response = self.client.post(f'/applications/submissions/{self.submissions[0].pk}/accept/')
+        self.assertEndpointWithinBudget(response)
+
+    def test_reject_submission(self):
+        self.authenticate(self.supervisors[0])
+        response = self.client.post(f'/applications/submissions/{self.submissions[0].pk}/reject/')
+        self.assertEndpointWithinBudget(response)
+
+    def test_remove_student(self):
+        self.submissions[0].status = SubmissionStatus.ACCEPTED
+        self.submissions[0].save()
+        Thesis.objects.filter(pk=self.submissions[0].thesis_id).sync_accepted_count()
+
+        self.authenticate(self.supervisors[0])
+        response = self.client.delete(f'/applications/submissions/{self.submissions[0].pk}/remove/')
+        self.assertEndpointWithinBudget(response)
+
+    def test_bulk_submission_actions(self):
+        self.authenticate(self.supervisors[0])
+        response = self.client.post('/applications/submissions/bulk/', {"items": [
+            {"submission_id": self.submissions[0].pk, "action": "accept"},
+            {"submission_id": self.submissions[1].pk, "action": "accept"},
+            {"submission_id": self.submissions[2].pk, "action": "reject"},
+        ]}, format="json")
+        self.assertEndpointWithinBudget(response)
+
+    def test_thesis_preferences(self):
+        self.authenticate(self.students[3])
+        response = self.client.put('/applications/preferences/', {
+            "thesis_ids": [thesis.pk for thesis in self.theses[:5]]
+        }, format="json")
+        self.assertEndpointWithinBudget(response)
+        self.assertEndpointWithinBudget(self.client.get('/applications/preferences/'))
+
+    def test_applicant_ranking(self):
+        self.authenticate(self.supervisors[0])
+        response = self.client.put(f'/applications/thesis/{self.theses[0].pk}/ranking/', {
+            "student_ids": [student.pk for student in self.students]
+        }, format="json")
+        self.assertEndpointWithinBudget(response)
+
+    def test_assignment_round(self):
+        for student in self.students:
+            ThesisPreference.objects.bulk_create([
+                ThesisPreference(student=student.studentprofile, thesis=thesis, rank=rank)
+                for rank, thesis in enumerate(self.theses, start=1)
+            ])
+
+        self.authenticate(self.coordinator)
+        self.assertEndpointWithinBudget(self.client.post('/applications/assignment-round/'))
+
+
+class QueryInstrumentationMiddlewareTests(APITestCase):
+    def setUp(self):
+        search_cache.cache.clear()
+        self.user = User.objects.create_user(username="student", role=Role.STUDENT)
+        self.client.credentials(HTTP_AUTHORIZATION=f"JWT {AccessToken.for_user(self.user)}")
+
+    def test_server_timing_header(self):
+        response = self.client.get('/users/me/tags/')
+
+        self.assertEqual(response.wsgi_request.query_recorder.count, 2)
+        self.assertIn('db;dur=', response["Server-Timing"])
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+        self.assertIn('total;dur=', response["Server-Timing"])
+
+    def test_streamed_response_counts_queries_of_the_body(self):
+        with self.assertLogs("thesis_system.queries", level=logging.INFO) as logs:
+            response = self.client.get('/thesis/available/', {"stream": 1})
+            before_body = response.wsgi_request.query_recorder.count
+            self.assertEqual(logs.output, [])
+
+            b"".join(response.streaming_content)
+            response.close()
+
+        self.assertIn(f'desc="{before_body} queries before streaming"', response["Server-Timing"])
+        self.assertGreater(response.wsgi_request.query_recorder.count, before_body)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn(f'"queries": {response.wsgi_request.query_recorder.count}', logs.output[0])
+
+    def test_request_over_budget_is_logged_as_warning(self):
+        with mock.patch.dict(query_budget.QUERY_BUDGETS, {"update-tags": 1}):
+            with self.assertLogs("thesis_system.queries", level=logging.WARNING) as logs:
+                self.client.get('/users/me/tags/')
+
+        self.assertIn('"view": "update-tags"', logs.output[0])
+        self.assertIn('"queries": 2', logs.output[0])
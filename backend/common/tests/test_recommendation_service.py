@@ -0,0 +1,175 @@
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from common.models import Department, Tag
+from common.services.recommendation_service import TagIndex, recommendation_service
+from users.models import User, Role, AcademicTitle, SupervisorProfile
+from thesis.models import Thesis, ThesisType, ThesisStatus
+
+
+class TagIndexTests(TestCase):
+    def test_scores_prefer_rare_shared_tags(self):
+        index = TagIndex([1, 2, 3, 4], [[10, 11], [10], [10, 12], []])
+
+        scores = dict(zip(index.ids.tolist(), index.score([10, 12]).tolist()))
+
+        self.assertEqual(scores[4], 0.0)
+        self.assertGreater(scores[3], scores[2])
+        self.assertGreater(scores[3], scores[1])
+        self.assertAlmostEqual(scores[3], 1.0)
+
+    def test_top_k(self):
+        index = TagIndex([1, 2, 3], [[10], [10, 11], [12]])
+
+        self.assertEqual([pk for pk, _ in index.top_k([10], 5)], [1, 2])
+        self.assertEqual([pk for pk, _ in index.top_k([10], 1)], [1])
+        self.assertEqual(index.top_k([99], 5), [])
+
+    def test_empty_index(self):
+        index = TagIndex([], [])
+        self.assertEqual(index.top_k([1], 5), [])
+
+
+class RecommendedTopicsTests(APITestCase):
+    def setUp(self):
+        recommendation_service.invalidate()
+
+        self.tag_ai = Tag.objects.create(name="AI")
+        self.tag_web = Tag.objects.create(name="Web")
+        self.tag_math = Tag.objects.create(name="Math")
+
+        supervisor = User.objects.create_user(
+            username="promotor",
+            academic_title=AcademicTitle.DOCTOR,
+            role=Role.SUPERVISOR,
+        )
+        profile = SupervisorProfile.objects.create(user=supervisor)
+
+        self.student = User.objects.create_user(username="student", role=Role.STUDENT)
+        self.student.tags.add(self.tag_ai, self.tag_math)
+        self.student.refresh_from_db()
+
+        def create_thesis(name, tags, status=ThesisStatus.APP_OPEN):
+            thesis = Thesis.objects.create(
+                supervisor_id=profile,
+                thesis_type=ThesisType.ENGINEERING,
+                name=name,
+                max_students=1,
+                status=status,
+                language="Polski",
+            )
+            thesis.tags.add(*tags)
+            return thesis
+
+        self.thesis_ai_math = create_thesis("AI i matematyka", [self.tag_ai, self.tag_math])
+        self.thesis_ai_web = create_thesis("AI w przeglądarce", [self.tag_ai, self.tag_web])
+        self.thesis_web = create_thesis("Sklep internetowy", [self.tag_web])
+        self.thesis_closed = create_thesis("Zamknięta", [self.tag_ai, self.tag_math], status=ThesisStatus.APP_CLOSED)
+
+    def test_recommend_topics(self):
+        recommendations = recommendation_service.recommend_topics(self.student, limit=10)
+
+        self.assertEqual(
+            [thesis for thesis, _ in recommendations],
+            [self.thesis_ai_math, self.thesis_ai_web],
+        )
+        self.assertAlmostEqual(recommendations[0][1], 1.0)
+
+    def test_user_without_tags(self):
+        user = User.objects.create_user(username="bez_tagow")
+        self.assertEqual(recommendation_service.recommend_topics(user), [])
+
+    def test_endpoint(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get('/common/recommended-topics/', {"limit": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["name"], "AI i matematyka")
+        self.assertEqual(response.data[0]["score"], 1.0)
+
+    def test_endpoint_rejects_negative_limit(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get('/common/recommended-topics/', {"limit": -1})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RecommendedSupervisorsTests(APITestCase):
+    def setUp(self):
+        recommendation_service.invalidate()
+
+        self.department_a = Department.objects.create(name="Wydział A")
+        self.department_b = Department.objects.create(name="Wydział B")
+        tag_ai = Tag.objects.create(name="AI")
+        tag_web = Tag.objects.create(name="Web")
+
+        def create_supervisor(username, title, department, tags, limits):
+            supervisor = User.objects.create_user(
+                username=username,
+                academic_title=title,
+                role=Role.SUPERVISOR,
+                department=department,
+            )
+            supervisor.tags.add(*tags)
+            SupervisorProfile.objects.create(
+                user=supervisor,
+                bacherol_limit=limits,
+                engineering_limit=limits,
+                master_limit=limits,
+                phd_limit=limits,
+            )
+            return supervisor
+
+        self.ai_expert = create_supervisor("ai", AcademicTitle.PROFESSOR, self.department_a, [tag_ai], 1)
+        self.web_expert = create_supervisor("web", AcademicTitle.DOCTOR, self.department_a, [tag_web], 3)
+        self.full = create_supervisor("full", AcademicTitle.DOCTOR, self.department_b, [tag_ai], 0)
+
+        Thesis.objects.create(
+            supervisor_id=self.web_expert.supervisorprofile,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Sklep",
+            max_students=1,
+            status=ThesisStatus.APP_OPEN,
+            language="Polski",
+        )
+
+        self.student = User.objects.create_user(username="student", role=Role.STUDENT)
+        self.student.tags.add(tag_ai)
+        self.student.refresh_from_db()
+
+    def test_rank_supervisors(self):
+        ranking = recommendation_service.rank_supervisors(self.student)
+
+        self.assertEqual([user for user, _ in ranking], [self.ai_expert, self.full, self.web_expert])
+
+        ai_row = ranking[0][1]
+        self.assertAlmostEqual(ai_row.tag_similarity, 1.0)
+        self.assertEqual(ai_row.free_capacity, 4)
+        self.assertEqual(ranking[2][1].open_theses, 1)
+
+    def test_rank_supervisors_filters(self):
+        ranking = recommendation_service.rank_supervisors(self.student, department="Wydział A")
+        self.assertEqual([user for user, _ in ranking], [self.ai_expert, self.web_expert])
+
+        ranking = recommendation_service.rank_supervisors(self.student, academic_title="doctor")
+        self.assertEqual([user for user, _ in ranking], [self.full, self.web_expert])
+
+        self.assertEqual(recommendation_service.rank_supervisors(self.student, department="Brak"), [])
+
+        with self.assertRaises(ValueError):
+            recommendation_service.rank_supervisors(self.student, academic_title="wizard")
+
+    def test_rank_supervisors_pagination(self):
+        ranking = recommendation_service.rank_supervisors(self.student, limit=1, offset=1)
+        self.assertEqual([user for user, _ in ranking], [self.full])
+
+    def test_endpoint(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get('/common/recommended-supervisors/', {"department": "Wydział A", "limit": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["username"], "ai")
+        self.assertEqual(response.data[0]["free_capacity"], 4)
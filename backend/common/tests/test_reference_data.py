@@ -0,0 +1,94 @@
+import json
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.models import Department, Tag
+from common.search_cache import search_cache
+from common.services.department_service import department_service
+from common.services.reference_data_service import reference_data_service
+from users.models import User, Role
+
+
+class ReferenceDataTests(APITestCase):
+    def setUp(self):
+        search_cache.cache.clear()
+        reference_data_service.invalidate()
+
+        self.department = Department.objects.create(name="Wydział A", description="Opis")
+        self.tags = [Tag.objects.create(name=name) for name in ["Python", "ML"]]
+        self.coordinator = User.objects.create_user(
+            username="koordynator", role=Role.COORDINATOR, department=self.department
+        )
+
+    def test_tag_list_is_cached(self):
+        # The reference version, read again by the search cache, and the tags.
+        with self.assertNumQueries(3):
+            response = self.client.get('/common/tags/')
+        self.assertEqual(response.data, [{"id": tag.pk, "name": tag.name} for tag in self.tags])
+
+        # Only the reference version.
+        with self.assertNumQueries(1):
+            cached = self.client.get('/common/tags/')
+        self.assertEqual(cached.content, response.content)
+
+    def test_warm_loads_both_lists(self):
+        reference_data_service.warm()
+        self.client.force_authenticate(user=self.coordinator)
+
+        with self.assertNumQueries(2):
+            self.client.get('/common/tags/')
+            response = self.client.get('/common/departments/')
+
+        self.assertEqual(response.data, [{"id": self.department.pk, "name": "Wydział A", "description": "Opis"}])
+
+    def test_cache_headers(self):
+        response = self.client.get('/common/tags/')
+        self.assertEqual(response["Cache-Control"], "public, max-age=300")
+        self.assertIn("Accept", response["Vary"])
+
+        not_modified = self.client.get('/common/tags/', HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified.content, b"")
+
+        # Streams are not cached and carry no ETag.
+        ndjson = self.client.get('/common/tags/', HTTP_ACCEPT="application/x-ndjson", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(ndjson.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", ndjson)
+
+        self.client.force_authenticate(user=self.coordinator)
+        response = self.client.get('/common/departments/')
+        self.assertEqual(response["Cache-Control"], "private, max-age=300")
+
+    def test_tag_list_stream(self):
+        response = self.client.get('/common/tags/', {"stream": "1"})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            json.loads(b"".join(response.streaming_content)),
+            [{"id": tag.pk, "name": tag.name} for tag in self.tags],
+        )
+
+    def test_department_list_requires_authentication(self):
+        response = self.client.get('/common/departments/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tag_write_bumps_version(self):
+        etag = self.client.get('/common/tags/')["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name="Java")
+
+        response = self.client.get('/common/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([tag["name"] for tag in response.data], ["Python", "ML", "Java"])
+
+    def test_department_update_bumps_version(self):
+        self.client.force_authenticate(user=self.coordinator)
+        self.client.get('/common/departments/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            department_service.update_department(self.coordinator, {"name": "Wydział B"})
+
+        response = self.client.get('/common/departments/')
+        self.assertEqual(response.data[0]["name"], "Wydział B")
@@ -0,0 +1,69 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from thesis_system.parsers import ORJSONParser
+from thesis_system.renderers import NDJSONRenderer, ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    payload = {
+        "name": "Zażółć gęślą jaźń",
+        "updated_at": datetime.datetime(2025, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        "local_time": datetime.datetime(2025, 5, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        "deadline": datetime.date(2025, 6, 30),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "grade": Decimal("4.5"),
+        "label": gettext_lazy("Promotor"),
+        "separator": "a\u2028b\u2029c",
+        "facets": {1: 2},
+        "nested": [{"tags": ["Sieci", "Grafy"]}, None, True, 1.25],
+    }
+
+    def test_matches_json_renderer(self):
+        self.assertEqual(ORJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_emits_utf8_without_escaping(self):
+        self.assertIn("Zażółć gęślą jaźń".encode(), ORJSONRenderer().render(self.payload))
+
+    def test_indent_uses_json_renderer(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            ORJSONRenderer().render(self.payload, media_type),
+            JSONRenderer().render(self.payload, media_type),
+        )
+
+    def test_large_integers(self):
+        self.assertEqual(ORJSONRenderer().render({"n": 2 ** 70}), b'{"n":1180591620717411303424}')
+
+    def test_none(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_ndjson(self):
+        self.assertEqual(NDJSONRenderer().render([{"a": "ą"}, {"a": 1}]), '{"a":"ą"}\n{"a":1}\n'.encode())
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def test_matches_json_parser(self):
+        body = JSONRenderer().render({"name": "Zażółć", "tags": [1, 2], "limit": None})
+
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_invalid_body(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
+
+    def test_other_charset(self):
+        body = '{"name": "Zażółć"}'.encode("utf-16")
+
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body), parser_context={"encoding": "utf-16"}), {"name": "Zażółć"})
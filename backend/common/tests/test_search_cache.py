@@ -0,0 +1,74 @@
+from django.test import TestCase
+
+from common.search_cache import SearchCache, USERS, TOPICS
+
+
+class SearchCacheTests(TestCase):
+    def setUp(self):
+        self.search_cache = SearchCache()
+        self.search_cache.cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return [{"id": self.calls}]
+
+    def test_get_or_set_computes_once(self):
+        first, first_hit = self.search_cache.get_or_set([USERS], {"q": "a"}, self.compute)
+        second, second_hit = self.search_cache.get_or_set([USERS], {"q": "a"}, self.compute)
+
+        self.assertEqual(first, second)
+        self.assertFalse(first_hit)
+        self.assertTrue(second_hit)
+        self.assertEqual(self.calls, 1)
+
+    def test_key_ignores_parameter_order(self):
+        self.search_cache.get_or_set([USERS], {"a": 1, "b": 2}, self.compute)
+        _, hit = self.search_cache.get_or_set([USERS], {"b": 2, "a": 1}, self.compute)
+        self.assertTrue(hit)
+
+    def test_invalidate_waits_for_commit(self):
+        self.search_cache.get_or_set([TOPICS, USERS], {}, self.compute)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.search_cache.invalidate(USERS)
+
+        _, hit = self.search_cache.get_or_set([TOPICS, USERS], {}, self.compute)
+        self.assertTrue(hit)
+
+        for callback in callbacks:
+            callback()
+
+        _, hit = self.search_cache.get_or_set([TOPICS, USERS], {}, self.compute)
+        self.assertFalse(hit)
+        self.assertEqual(self.calls, 2)
+
+    def test_invalidate_other_namespace_keeps_entries(self):
+        self.search_cache.get_or_set([USERS], {}, self.compute)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.search_cache.invalidate(TOPICS)
+
+        _, hit = self.search_cache.get_or_set([USERS], {}, self.compute)
+        self.assertTrue(hit)
+
+    def test_stats(self):
+        self.search_cache.get_or_set([USERS], {}, self.compute)
+        self.search_cache.get_or_set([USERS], {}, self.compute)
+
+        stats = self.search_cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_invalidate_reaches_other_workers(self):
+        other_worker = SearchCache(alias="default")
+        other_worker.cache.clear()
+        self.search_cache.get_or_set([USERS], {}, self.compute)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other_worker.invalidate(USERS)
+
+        _, hit = self.search_cache.get_or_set([USERS], {}, self.compute)
+        self.assertFalse(hit)
+        self.assertEqual(other_worker.get_version(USERS), self.search_cache.get_version(USERS))
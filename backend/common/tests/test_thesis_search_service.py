@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from common.models import Department, Tag
 from users.models import User, Role, AcademicTitle, SupervisorProfile
 from common.search_service import SearchService
@@ -176,4 +178,195 @@ class TestUserSearchService(TestCase):
         self.assertEqual(results.count(), len(expected_order))
 
         for i, (expected, recieved) in enumerate(zip(expected_order, results)):
-            self.assertEqual(expected, recieved, f"Problem with {i}th element")
\ No newline at end of file
+            self.assertEqual(expected, recieved, f"Problem with {i}th element")
+
+    def test_full_text_search(self):
+        results = self.search_service.search_topics(q="java", limit=100)
+
+        self.assertEqual(results.count(), 1)
+        self.assertIn(self.thesis3, results)
+
+    def test_full_text_search_english_stemming(self):
+        thesis = Thesis.objects.create(
+            supervisor_id=self.supervisor_2.supervisorprofile,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Graph algorithms",
+            description="Training neural networks on large graphs",
+            max_students=1,
+            status=ThesisStatus.APP_OPEN,
+            language="English",
+        )
+
+        results = self.search_service.search_topics(q="network", limit=100)
+
+        self.assertEqual(list(results), [thesis])
+
+    def test_full_text_search_ranking(self):
+        description_match = Thesis.objects.create(
+            supervisor_id=self.supervisor_2.supervisorprofile,
+            thesis_type=ThesisType.ENGINEERING,
+            name="Systemy rozproszone",
+            description="Przetwarzanie danych z użyciem języka Java",
+            max_students=1,
+            status=ThesisStatus.APP_OPEN,
+            language="Polski",
+        )
+
+        results = self.search_service.search_topics(q="java", limit=100)
+
+        expected_order = [
+            self.thesis3,
+            description_match,
+        ]
+        self.assertEqual(results.count(), len(expected_order))
+
+        for i, (expected, recieved) in enumerate(zip(expected_order, results)):
+            self.assertEqual(expected, recieved, f"Problem with {i}th element")
+
+    def test_full_text_search_sorted_keeps_rank_for_ties(self):
+        description_match = Thesis.objects.create(
+            supervisor_id=self.thesis3.supervisor_id,
+            thesis_type=self.thesis3.thesis_type,
+            name="Systemy rozproszone",
+            description="Przetwarzanie danych z użyciem języka Java",
+            max_students=1,
+            status=ThesisStatus.APP_OPEN,
+            language="Polski",
+        )
+
+        for order in ["asc", "desc"]:
+            results = self.search_service.search_topics(q="java", sort_by=["academic_title"], orders=[order], limit=100)
+            self.assertEqual(list(results), [self.thesis3, description_match], order)
+
+    def test_full_text_search_skips_closed_theses(self):
+        self.thesis3.status = ThesisStatus.APP_CLOSED
+        self.thesis3.save()
+
+        results = self.search_service.search_topics(q="java", limit=100)
+
+        self.assertEqual(results.count(), 0)
+
+    def test_keyset_pagination(self):
+        expected_order = list(self.search_service.search_topics(tags=["Python", "Math", "Java"], sort_by=["matching_tag_count", "academic_title"], orders=["desc", "desc"], limit=100))
+
+        received = []
+        cursor = None
+        while True:
+            page = self.search_service.search_topics_page(tags=["Python", "Math", "Java"], sort_by=["matching_tag_count", "academic_title"], orders=["desc", "desc"], limit=1, cursor=cursor)
+            received.extend(page.results)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(expected_order, received)
+
+    def test_keyset_pagination_with_tied_ranks(self):
+        tied = [
+            Thesis.objects.create(
+                supervisor_id=self.supervisor_2.supervisorprofile,
+                thesis_type=ThesisType.ENGINEERING,
+                name="Kompilatory języka Java",
+                description="Analiza kodu pośredniego",
+                max_students=1,
+                status=ThesisStatus.APP_OPEN,
+                language="Polski",
+            )
+            for _ in range(5)
+        ]
+        expected_order = list(self.search_service.search_topics(q="java", limit=100))
+
+        received = []
+        cursor = None
+        while True:
+            page = self.search_service.search_topics_page(q="java", limit=2, cursor=cursor)
+            received.extend(page.results)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        # The offset listing has no tie-breaker, so tied rows may come in any order there.
+        self.assertCountEqual(expected_order, received)
+        for thesis in tied:
+            self.assertIn(thesis, received)
+
+    def test_keyset_pagination_default_order(self):
+        expected_order = list(self.search_service.search_topics(limit=100))
+
+        first_page = self.search_service.search_topics_page(limit=2)
+        second_page = self.search_service.search_topics_page(limit=100, cursor=first_page.next_cursor)
+
+        self.assertEqual(first_page.results + second_page.results, expected_order)
+
+    def test_supervisor_title_order_follows_title_change(self):
+        self.supervisor_2.academic_title = AcademicTitle.PROFESSOR
+        self.supervisor_2.save()
+        self.thesis4.refresh_from_db()
+        self.assertEqual(self.thesis4.supervisor_title_order, 6)
+
+        User.objects.filter(pk=self.supervisor_2.pk).update(academic_title=AcademicTitle.DOCTOR)
+        self.thesis4.refresh_from_db()
+        self.assertEqual(self.thesis4.supervisor_title_order, 4)
+
+    def test_supervisor_save_syncs_theses_only_on_title_change(self):
+        supervisor = User.objects.get(pk=self.supervisor_2.pk)
+        supervisor.first_name = "Włodek"
+        with CaptureQueriesContext(connection) as queries:
+            supervisor.save()
+        self.assertFalse([query for query in queries if "thesis_thesis" in query["sql"]])
+
+        supervisor.academic_title = AcademicTitle.PROFESSOR
+        supervisor.save()
+        self.thesis4.refresh_from_db()
+        self.assertEqual(self.thesis4.supervisor_title_order, 6)
+
+    def test_new_thesis_takes_title_order_from_loaded_supervisor(self):
+        profile = SupervisorProfile.objects.select_related("user").get(pk=self.supervisor_2.pk)
+        thesis_fields = {"thesis_type": ThesisType.ENGINEERING, "name": "Nowa praca", "max_students": 1, "language": "Polski"}
+
+        with self.assertNumQueries(1):
+            thesis = Thesis.objects.create(supervisor_id=profile, **thesis_fields)
+        self.assertEqual(thesis.supervisor_title_order, 3)
+
+        thesis = Thesis.objects.create(supervisor_id_id=profile.pk, **thesis_fields)
+        self.assertEqual(thesis.supervisor_title_order, 3)
+
+    def test_default_order_uses_stored_columns(self):
+        results = list(self.search_service.search_topics(limit=100))
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0], self.thesis2)
+        self.assertEqual(set(results[1:3]), {self.thesis1, self.thesis3})
+        self.assertEqual(set(results[3:]), {self.thesis4, self.thesis5})
+
+    def test_matching_tag_count_uses_tag_ids(self):
+        results = self.search_service.search_topics(
+            tags=["Python", "Math", "Java"],
+            sort_by=["matching_tag_count"],
+            orders=["desc"],
+            limit=100,
+        )
+
+        counts = {thesis: thesis.matching_tag_count for thesis in results}
+        self.assertEqual(counts[self.thesis5], 3)
+        self.assertEqual(counts[self.thesis1], 2)
+        self.assertEqual(results[0], self.thesis5)
+
+    def test_filter_by_unknown_tag(self):
+        results = self.search_service.search_topics(tags=["Cobol"], limit=100)
+        self.assertEqual(results.count(), 0)
+
+    def test_topic_facets(self):
+        with self.assertNumQueries(1):
+            facets = self.search_service.search_topic_facets(thesis_type="ENGINEERING")
+
+        self.assertEqual(facets["tags"], {"Math": 3, "Python": 3, "Java": 3, "ML": 1})
+        self.assertEqual(facets["thesis_type"], {ThesisType.ENGINEERING.value: 4})
+        self.assertEqual(facets["language"], {"Polski": 4})
+        self.assertEqual(facets["department"], {"Wydział A": 2, "Wydział B": 2})
+
+    def test_topic_facets_follow_filters(self):
+        facets = self.search_service.search_topic_facets(tags=["ML"])
+
+        self.assertEqual(facets["tags"], {"ML": 2, "Java": 1, "Math": 1})
+        self.assertEqual(facets["thesis_type"], {ThesisType.ENGINEERING.value: 1, ThesisType.MASTER.value: 1})
+        self.assertEqual(facets["department"], {"Wydział A": 2})
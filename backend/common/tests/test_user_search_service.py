@@ -1,4 +1,5 @@
 from django.test import TestCase
+from django.db import connection
 from common.models import Department, Tag
 from users.models import User, Role, AcademicTitle
 from common.search_service import SearchService
@@ -263,4 +264,90 @@ class TestUserSearchService(TestCase):
         self.assertEqual(results.count(), 2)
         
         for i, (expected, recieved) in enumerate(zip(expected_order, results)):
-            self.assertEqual(expected, recieved, f"Problem with {i}th element")
\ No newline at end of file
+            self.assertEqual(expected, recieved, f"Problem with {i}th element")
+
+    def test_keyset_pagination_matches_offset_pagination(self):
+        sort_by = ["matching_tag_count", "academic_title", "last_name", "first_name"]
+        orders = ["desc", "desc", "asc", "asc"]
+        expected_order = list(self.search_service.search_user(tags=["Math", "ML"], sort_by=sort_by, orders=orders, limit=1000))
+
+        received = []
+        cursor = None
+        while True:
+            page = self.search_service.search_user_page(tags=["Math", "ML"], sort_by=sort_by, orders=orders, limit=2, cursor=cursor)
+            received.extend(page.results)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(expected_order, received)
+
+    def test_keyset_pagination_with_tied_similarity(self):
+        tied = [
+            User.objects.create_user(username=f"kowalsky{i}", first_name="Jan", last_name="Kowalsky", role=Role.STUDENT)
+            for i in range(5)
+        ]
+        expected_order = list(self.search_service.search_user(last_name="Kowalski", fuzzy=True, limit=1000))
+
+        received = []
+        cursor = None
+        while True:
+            page = self.search_service.search_user_page(last_name="Kowalski", fuzzy=True, limit=2, cursor=cursor)
+            received.extend(page.results)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        # The offset listing has no tie-breaker, so tied rows may come in any order there.
+        self.assertCountEqual(expected_order, received)
+        for user in tied:
+            self.assertIn(user, received)
+
+    def test_keyset_pagination_over_all_users(self):
+        expected_order = list(self.search_service.search_user(sort_by=["academic_title", "first_name"], orders=["desc", "asc"], limit=1000))
+
+        first_page = self.search_service.search_user_page(sort_by=["academic_title", "first_name"], orders=["desc", "asc"], limit=3)
+        second_page = self.search_service.search_user_page(sort_by=["academic_title", "first_name"], orders=["desc", "asc"], limit=10, cursor=first_page.next_cursor)
+
+        self.assertEqual(first_page.results, expected_order[:3])
+        self.assertEqual(second_page.results, expected_order[3:])
+        self.assertIsNone(second_page.next_cursor)
+
+    def test_keyset_pagination_rejects_foreign_cursor(self):
+        page = self.search_service.search_user_page(sort_by=["academic_title"], orders=["desc"], limit=1)
+
+        with self.assertRaises(ValueError):
+            self.search_service.search_user_page(sort_by=["first_name"], orders=["asc"], limit=1, cursor=page.next_cursor)
+
+        with self.assertRaises(ValueError):
+            self.search_service.search_user_page(limit=1, cursor="not-a-cursor")
+
+    def test_filtering_by_name_ignores_diacritics_and_case(self):
+        results = self.search_service.search_user(last_name="ogorek", limit=100)
+        self.assertEqual(len(results), 3)
+
+        results = self.search_service.search_user(first_name="CZESLAW")
+        self.assertEqual(list(results), [self.student_3])
+
+    def test_filtering_by_name_prefix(self):
+        results = self.search_service.search_user(first_name="Wlodz")
+        self.assertEqual(list(results), [self.supervisor_2])
+
+    def test_fuzzy_name_search(self):
+        results = self.search_service.search_user(last_name="Ogorec", limit=100)
+        self.assertEqual(len(results), 0)
+
+        results = list(self.search_service.search_user(last_name="Ogorec", fuzzy=True, limit=100))
+        self.assertEqual(len(results), 3)
+
+        results = list(self.search_service.search_user(first_name="Dominka", fuzzy=True, limit=100))
+        self.assertEqual(results[0], self.student_4)
+
+    def test_name_search_uses_trigram_index(self):
+        # With plain index scans off as well, an index can only be used through its condition.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_indexscan = off")
+
+        plan = self.search_service.search_user(last_name="Ogór", sort_by=None, orders=None).explain()
+        self.assertIn("user_last_name_trgm_idx", plan)
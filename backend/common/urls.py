@@ -4,11 +4,19 @@ from common.views.tag_list_view import TagListView
 from common.views.department_view import DepartmentView
 from common.views.thesis_search_view import ThesisSearchView
 from common.views.department_list_view import DepartmentListView
+from common.views.search_cache_stats_view import SearchCacheStatsView
+from common.views.recommended_topics_view import RecommendedTopicsView
+from common.views.recommended_supervisors_view import RecommendedSupervisorsView
+from common.views.autocomplete_view import AutocompleteView
 
 urlpatterns = [
     path('tags/', TagListView.as_view(), name='tag-list'),
     path('departments/', DepartmentListView.as_view(), name='department-list'),
     path('search-users/', UserSearchView.as_view(), name='search-users'),
     path('search-topics/', ThesisSearchView.as_view(), name='search-topics'),
-    path('department/', DepartmentView.as_view(), name='department-view')
+    path('department/', DepartmentView.as_view(), name='department-view'),
+    path('search-cache-stats/', SearchCacheStatsView.as_view(), name='search-cache-stats'),
+    path('recommended-topics/', RecommendedTopicsView.as_view(), name='recommended-topics'),
+    path('recommended-supervisors/', RecommendedSupervisorsView.as_view(), name='recommended-supervisors'),
+    path('autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
 ]
\ No newline at end of file
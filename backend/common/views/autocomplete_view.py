@@ -0,0 +1,25 @@
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework import status
+
+from common.services.autocomplete_service import autocomplete_service
+
+class AutocompleteView(APIView):
+    """
+        Typeahead suggestions for tags, open thesis titles and supervisor names.
+    """
+    def get(self, request):
+        try:
+            suggestions = autocomplete_service.autocomplete(
+                request.GET.get("q", ""),
+                limit=int(request.GET.get("limit", 5)),
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        data = {
+            kind: [suggestion._asdict() for suggestion in kind_suggestions]
+            for kind, kind_suggestions in suggestions.items()
+        }
+        return Response(data, status=status.HTTP_200_OK)
@@ -3,8 +3,15 @@ from rest_framework.permissions import IsAuthenticated
 
 from common.models import Department
 from common.serializers.department_list_serializer import DepartmentListSerializer
+from common.services.reference_data_service import reference_data_service
+from thesis_system.conditional import ReferenceListMixin
+from thesis_system.projection import ProjectionListMixin
+from thesis_system.query_plan import QueryPlanMixin
 
-class DepartmentListView(ListAPIView):
+class DepartmentListView(ReferenceListMixin, ProjectionListMixin, QueryPlanMixin, ListAPIView):
     queryset = Department.objects.all()
     permission_classes = [IsAuthenticated]
     serializer_class = DepartmentListSerializer
+
+    def get_reference(self):
+        return reference_data_service.get_departments()
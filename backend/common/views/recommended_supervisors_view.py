@@ -0,0 +1,38 @@
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework import status
+
+from common.services.recommendation_service import recommendation_service
+from users.serializers.user_serializer import UserSerializer
+
+class RecommendedSupervisorsView(APIView):
+    """
+        Supervisors ranked for the requesting user by tag similarity, free
+        capacity and number of open theses, best first.
+    """
+    def get(self, request):
+        try:
+            ranking = recommendation_service.rank_supervisors(
+                request.user,
+                department=request.GET.get("department"),
+                academic_title=request.GET.get("academic_title"),
+                limit=int(request.GET.get("limit", 10)),
+                offset=int(request.GET.get("offset", 0)),
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        serialized = UserSerializer([user for user, _ in ranking], many=True).data
+
+        data = [
+            {
+                **user_data,
+                "score": round(row.score, 4),
+                "tag_similarity": round(row.tag_similarity, 4),
+                "free_capacity": row.free_capacity,
+                "open_theses": row.open_theses,
+            }
+            for user_data, (_, row) in zip(serialized, ranking)
+        ]
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,29 @@
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework import status
+
+from common.services.recommendation_service import recommendation_service
+from thesis.serializers.thesis_list_serializer import ThesisListSerializer
+
+MAX_RECOMMENDATIONS = 50
+
+class RecommendedTopicsView(APIView):
+    """
+        Open theses best matching the tags of the requesting user, best first.
+    """
+    def get(self, request):
+        try:
+            limit = min(int(request.GET.get("limit", 10)), MAX_RECOMMENDATIONS)
+            recommendations = recommendation_service.recommend_topics(request.user, limit=limit)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        theses = [thesis for thesis, _ in recommendations]
+        serialized = ThesisListSerializer(theses, many=True, context={'request': request}).data
+
+        data = [
+            {**thesis_data, "score": round(score, 4)}
+            for thesis_data, (_, score) in zip(serialized, recommendations)
+        ]
+        return Response(data, status=status.HTTP_200_OK)
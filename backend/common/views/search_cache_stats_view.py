@@ -0,0 +1,16 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from common.search_cache import search_cache
+from thesis_system.permissions import isAdmin
+
+class SearchCacheStatsView(APIView):
+    """
+        Hit and miss counters of the search result cache in this process.
+    """
+    permission_classes = [IsAuthenticated, isAdmin]
+
+    def get(self, request):
+        return Response(search_cache.stats(), status=status.HTTP_200_OK)
@@ -2,8 +2,16 @@ from rest_framework.generics import ListAPIView
 
 from common.models import Tag
 from common.serializers.tag_serializer import TagSerializer
+from common.services.reference_data_service import reference_data_service
+from thesis_system.conditional import ReferenceListMixin
+from thesis_system.projection import ProjectionListMixin
+from thesis_system.query_plan import QueryPlanMixin
 
-class TagListView(ListAPIView):
+class TagListView(ReferenceListMixin, ProjectionListMixin, QueryPlanMixin, ListAPIView):
     queryset = Tag.objects.all()
     permission_classes = []
-    serializer_class = TagSerializer
\ No newline at end of file
+    serializer_class = TagSerializer
+    cache_control = {"public": True, "max_age": 300}
+
+    def get_reference(self):
+        return reference_data_service.get_tags()
\ No newline at end of file
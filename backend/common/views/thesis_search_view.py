@@ -1,42 +1,81 @@
 from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError
-from rest_framework.response import Response
 from rest_framework import status
 
 from common.search_service import SearchService
+from common.search_cache import search_cache, REFERENCE, TOPICS, USERS
 from thesis.serializers.thesis_list_serializer import ThesisListSerializer
+from thesis_system.compression import PrecompressedResponse, encode_json
+from thesis_system.sparse_fields import get_field_selection, narrow_serializer
 
 class ThesisSearchView(APIView):
     """
         Endpoint for filtering available theses.
+        Passing `cursor` (empty for the first page) switches to keyset pagination.
+        With `facets=true` the page comes together with counts per tag, thesis type,
+        language and department of all matching theses.
+        `fields` / `exclude` narrow the returned theses and the query behind them.
+        Responses are cached, rendered and compressed, until theses or supervisors change.
     """
     def get(self, request):
-        service = SearchService()
+        cursor_mode = "cursor" in request.GET
+        with_facets = request.GET.get("facets", "").lower() == "true"
+        fields = get_field_selection(request.GET, ThesisListSerializer)
 
         try:
-            first_name = request.GET.get("first_name")
-            last_name = request.GET.get("last_name")
-            academic_title = request.GET.get("academic_title")
-            tags = request.GET.getlist("tags") or None
-            department = request.GET.get("department")
-            thesis_type = request.GET.get("thesis_type")
-            language = request.GET.get("language")
-            limit = int(request.GET.get("limit", 10))
-            offset = int(request.GET.get("offset", 0))
-
-            theses = service.search_topics(
-                first_name=first_name,
-                last_name=last_name,
-                academic_title=academic_title,
-                tags=tags,
-                department=department,
-                thesis_type=thesis_type,
-                language=language,
-                limit=limit,
-                offset=offset,
+            filters = {
+                "q": request.GET.get("q"),
+                "first_name": request.GET.get("first_name"),
+                "last_name": request.GET.get("last_name"),
+                "academic_title": request.GET.get("academic_title"),
+                "tags": request.GET.getlist("tags") or None,
+                "department": request.GET.get("department"),
+                "thesis_type": request.GET.get("thesis_type"),
+                "language": request.GET.get("language"),
+                "limit": int(request.GET.get("limit", 10)),
+            }
+
+            if cursor_mode:
+                filters["cursor"] = request.GET.get("cursor") or None
+            else:
+                filters["offset"] = int(request.GET.get("offset", 0))
+
+            encoded, hit = search_cache.get_or_set(
+                [TOPICS, USERS, REFERENCE],
+                {
+                    "base_url": request.build_absolute_uri("/"),
+                    "facets": with_facets,
+                    "fields": fields and sorted(fields),
+                    **filters,
+                },
+                lambda: encode_json(self._search(request, filters, cursor_mode, with_facets, fields)),
             )
         except ValueError as e:
             raise ValidationError(str(e))
-        
-        serializer = ThesisListSerializer(theses, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+
+        response = PrecompressedResponse(encoded, status=status.HTTP_200_OK)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+    def _search(self, request, filters, cursor_mode, with_facets, fields):
+        service = SearchService()
+
+        if cursor_mode:
+            page = service.search_topics_page(**filters, fields=fields)
+            serializer = ThesisListSerializer(page.results, many=True, context={'request': request})
+            data = {"results": narrow_serializer(serializer, fields).data, "next_cursor": page.next_cursor}
+        else:
+            theses = service.search_topics(**filters, fields=fields)
+            serializer = ThesisListSerializer(theses, many=True, context={'request': request})
+            data = narrow_serializer(serializer, fields).data
+
+        if not with_facets:
+            return data
+
+        facet_filters = {
+            key: value for key, value in filters.items() if key not in ("limit", "offset", "cursor")
+        }
+        if not cursor_mode:
+            data = {"results": data}
+        data["facets"] = service.search_topic_facets(**facet_filters)
+        return data
@@ -1,43 +1,61 @@
 from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError
-from rest_framework.response import Response
 from rest_framework import status
 
 from common.search_service import SearchService
+from common.search_cache import search_cache, REFERENCE, USERS
 from users.serializers.user_serializer import UserSerializer
+from thesis_system.compression import PrecompressedResponse, encode_json
+from thesis_system.sparse_fields import get_field_selection, narrow_serializer
 
 class UserSearchView(APIView):
     """
         Endpoint for filtering and sorting users
+        Passing `cursor` (empty for the first page) switches to keyset pagination.
+        `fields` / `exclude` narrow the returned users and the query behind them.
+        Responses are cached, rendered and compressed, until users change.
     """
     def get(self, request):
-        service = SearchService()
+        cursor_mode = "cursor" in request.GET
+        fields = get_field_selection(request.GET, UserSerializer)
 
         try:
-            first_name = request.GET.get("first_name")
-            last_name = request.GET.get("last_name")
-            tags = request.GET.getlist("tags") or None
-            department = request.GET.get("department")
-            role = request.GET.get("role")
-            sort_by = request.GET.getlist("sort_by") or ["matching_tag_count",  "academic_title", "last_name", "first_name"]
-            orders = request.GET.getlist("orders") or ["desc", "desc", "asc", "asc"]
-            limit = int(request.GET.get("limit", 10))
-            offset = int(request.GET.get("offset", 0))
-
-            users = service.search_user(
-                first_name=first_name,
-                last_name=last_name,
-                tags=tags,
-                department=department,
-                role=role,
-                sort_by=sort_by,
-                orders=orders,
-                limit=limit,
-                offset=offset,
+            filters = {
+                "first_name": request.GET.get("first_name"),
+                "last_name": request.GET.get("last_name"),
+                "tags": request.GET.getlist("tags") or None,
+                "department": request.GET.get("department"),
+                "role": request.GET.get("role"),
+                "sort_by": request.GET.getlist("sort_by") or ["matching_tag_count",  "academic_title", "last_name", "first_name"],
+                "orders": request.GET.getlist("orders") or ["desc", "desc", "asc", "asc"],
+                "limit": int(request.GET.get("limit", 10)),
+                "fuzzy": request.GET.get("fuzzy", "").lower() == "true",
+            }
+
+            if cursor_mode:
+                filters["cursor"] = request.GET.get("cursor") or None
+            else:
+                filters["offset"] = int(request.GET.get("offset", 0))
+
+            encoded, hit = search_cache.get_or_set(
+                [USERS, REFERENCE],
+                {"fields": fields and sorted(fields), **filters},
+                lambda: encode_json(self._search(filters, cursor_mode, fields)),
             )
         except ValueError as e:
             raise ValidationError(str(e))
-        
-        serializer = UserSerializer(users, many=True)
-    
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+
+        response = PrecompressedResponse(encoded, status=status.HTTP_200_OK)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+    def _search(self, filters, cursor_mode, fields):
+        service = SearchService()
+
+        if cursor_mode:
+            page = service.search_user_page(**filters, fields=fields)
+            serializer = UserSerializer(page.results, many=True)
+            return {"results": narrow_serializer(serializer, fields).data, "next_cursor": page.next_cursor}
+
+        users = service.search_user(**filters, fields=fields)
+        return narrow_serializer(UserSerializer(users, many=True), fields).data
@@ -1,7 +1,12 @@
 from django.db import models
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.lookups import GreaterThanOrEqual, LessThan
 from django.utils import timezone
-from users.models import SupervisorProfile
-from common.models import Tag
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from users.models import User, SupervisorProfile, ACADEMIC_TITLE_SORT_ORDER
+from common.models import Tag, TaggedQuerySet, TaggedModelMixin
 
 class ThesisType(models.TextChoices):
     ENGINEERING = 'inżynierska', 'Inżynierska'
@@ -18,13 +23,134 @@ THESIS_TYPE_SORT_ORDER = {
 }
 
 
+def thesis_type_order_expression():
+    return models.Case(
+        *[
+            models.When(thesis_type=key, then=models.Value(value))
+            for key, value in THESIS_TYPE_SORT_ORDER.items()
+        ],
+        default=models.Value(0),
+        output_field=models.IntegerField()
+    )
+
+
+# PostgreSQL ships no Polish dictionary, so Polish text is indexed with the
+# 'simple' configuration (lowercased, unstemmed) next to stemmed English.
+THESIS_SEARCH_CONFIGS = ['simple', 'english']
+
+
+def thesis_search_vector():
+    vector = None
+    for config in THESIS_SEARCH_CONFIGS:
+        config_vector = (
+            SearchVector('name', config=config, weight='A')
+            + SearchVector('description', config=config, weight='B')
+        )
+        vector = config_vector if vector is None else vector + config_vector
+    return vector
+
+
 class ThesisStatus(models.TextChoices):
     APP_OPEN = 'otwarta', 'Otwarta'
     APP_CLOSED = 'w realizacji', 'W realizacji'
     FINISHED = 'zakończona', 'Zakończona'
 
 
-class Thesis(models.Model):
+class ThesisQuerySet(TaggedQuerySet):
+    def _supervisor_title_order_subquery(self):
+        return models.Subquery(
+            User.objects.filter(
+                pk=models.OuterRef('supervisor_id')
+            ).values('academic_title_order')[:1]
+        )
+
+    def sync_supervisor_title_order(self):
+        return self.update(supervisor_title_order=self._supervisor_title_order_subquery())
+
+    def stale_supervisor_title_order(self):
+        return self.exclude(supervisor_title_order=self._supervisor_title_order_subquery())
+
+    def _accepted_count_subquery(self):
+        from applications.models import Submission, SubmissionStatus
+
+        return Coalesce(models.Subquery(
+            Submission.objects.filter(
+                thesis=models.OuterRef('pk'),
+                status=SubmissionStatus.ACCEPTED
+            ).order_by().values('thesis').annotate(count=models.Count('pk')).values('count')
+        ), 0)
+
+    def sync_accepted_count(self):
+        return self.update(accepted_count=self._accepted_count_subquery())
+
+    def stale_accepted_count(self):
+        return self.exclude(accepted_count=self._accepted_count_subquery())
+
+    def take_place(self):
+        """
+            Counts one more accepted student on theses with a free place and
+            closes those it fills, in a single conditional UPDATE. Returns the
+            number of theses updated; 0 means the thesis is full.
+        """
+        fills = models.Q(accepted_count=models.F('max_students') - 1)
+        return self.filter(accepted_count__lt=models.F('max_students')).update(
+            accepted_count=models.F('accepted_count') + 1,
+            status=models.Case(
+                models.When(fills, then=models.Value(ThesisStatus.APP_CLOSED)),
+                default=models.F('status'),
+            ),
+            updated_at=models.Case(
+                models.When(fills, then=models.Value(timezone.now())),
+                default=models.F('updated_at'),
+            ),
+        )
+
+    def release_place(self):
+        """
+            Counts one accepted student less and reopens closed theses that
+            get a free place, in a single UPDATE.
+        """
+        reopens = models.Q(status=ThesisStatus.APP_CLOSED, accepted_count__lte=models.F('max_students'))
+        return self.update(
+            accepted_count=Greatest(models.F('accepted_count') - 1, 0),
+            status=models.Case(
+                models.When(reopens, then=models.Value(ThesisStatus.APP_OPEN)),
+                default=models.F('status'),
+            ),
+            updated_at=models.Case(
+                models.When(reopens, then=models.Value(timezone.now())),
+                default=models.F('updated_at'),
+            ),
+        )
+
+    def shift_accepted_count(self, deltas: dict[int, int]):
+        """
+            Adds a per-thesis delta to the accepted student count, closing the
+            theses it fills and reopening closed theses it frees, in a single
+            UPDATE. Capacity is checked by the caller, under a lock on the
+            thesis rows.
+        """
+        count = models.F('accepted_count') + models.Case(
+            *[models.When(pk=pk, then=models.Value(delta)) for pk, delta in deltas.items()],
+            default=models.Value(0),
+        )
+        closes = models.Q(GreaterThanOrEqual(count, models.F('max_students')), status=ThesisStatus.APP_OPEN)
+        reopens = models.Q(LessThan(count, models.F('max_students')), status=ThesisStatus.APP_CLOSED)
+        return self.filter(pk__in=deltas).update(
+            accepted_count=count,
+            status=models.Case(
+                models.When(closes, then=models.Value(ThesisStatus.APP_CLOSED)),
+                models.When(reopens, then=models.Value(ThesisStatus.APP_OPEN)),
+                default=models.F('status'),
+            ),
+            updated_at=models.Case(
+                models.When(closes | reopens, then=models.Value(timezone.now())),
+                default=models.F('updated_at'),
+            ),
+        )
+
+
+class Thesis(TaggedModelMixin, models.Model):
     supervisor_id = models.ForeignKey(
         SupervisorProfile,
         on_delete=models.CASCADE
@@ -62,6 +188,60 @@ class Thesis(models.Model):
         Tag,
         related_name='thesis'
     )
+    search_vector = models.GeneratedField(
+        expression=thesis_search_vector(),
+        output_field=SearchVectorField(),
+        db_persist=True
+    )
+    thesis_type_order = models.GeneratedField(
+        expression=thesis_type_order_expression(),
+        output_field=models.IntegerField(),
+        db_persist=True
+    )
+    supervisor_title_order = models.IntegerField(
+        default=0,
+        editable=False
+    )
+    tag_ids = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        editable=False
+    )
+    accepted_count = models.IntegerField(
+        default=0,
+        editable=False
+    )
+
+    objects = ThesisQuerySet.as_manager()
+    maintained_fields = ['tag_ids', 'accepted_count']
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='thesis_search_vector_idx'),
+            models.Index(
+                fields=['-supervisor_title_order', '-thesis_type_order', 'id'],
+                condition=models.Q(status=ThesisStatus.APP_OPEN),
+                name='thesis_open_default_order_idx'
+            ),
+            GinIndex(fields=['tag_ids'], name='thesis_tag_ids_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.supervisor_title_order = self._current_supervisor_title_order()
+        super().save(*args, **kwargs)
+
+    def _current_supervisor_title_order(self):
+        """
+            Title order of the supervisor, taken from the supervisor already
+            loaded with this thesis, or read as a single column otherwise.
+        """
+        if Thesis.supervisor_id.is_cached(self) and SupervisorProfile.user.is_cached(self.supervisor_id):
+            return ACADEMIC_TITLE_SORT_ORDER.get(self.supervisor_id.user.academic_title, 0)
+
+        title_order = User.objects.filter(pk=self.supervisor_id_id).values_list('academic_title_order', flat=True).first()
+        return title_order or 0
 
     def __str__(self):
         return f'Praca {self.thesis_type}, promotor: {self.supervisor_id}'
@@ -25,6 +25,7 @@ class ThesisListSerializer(serializers.ModelSerializer):
             'language',
             'tags'
         ]
+        prefetch_related = ['tags']
         read_only_fields = [
             'url',
             'supervisor_id',
@@ -24,6 +24,7 @@ class ThesisSerializer(serializers.ModelSerializer):
             'language',
             'tags'
         ]
+        prefetch_related = ['tags']
         read_only_fields = [
             'id',
             'supervisor_id',
@@ -21,6 +21,7 @@ class ThesisSimpleSerializer(serializers.ModelSerializer):
             'language',
             'tags'
         ]
+        prefetch_related = ['tags']
         read_only_fields = [
             'id',
             'thesis_type',
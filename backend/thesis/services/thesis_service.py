@@ -2,6 +2,7 @@ from django.utils import timezone
 from thesis.models import Thesis, ThesisStatus, ThesisType
 from users.models import User, SupervisorProfile, Logs, ACADEMIC_TITLE_SORT_ORDER, AcademicTitle
 from common.models import Tag
+from common.search_cache import search_cache, TOPICS
 from thesis.serializers.thesis_delete_serializer import ThesisDeleteSerializer
 
 
@@ -91,6 +92,8 @@ class ThesisService:
 
         setattr(supervisor, self.type_limits_dict[thesis_type], limit_left - 1)
         supervisor.save()
+        supervisor.user.updated_at = timezone.now()
+        supervisor.user.save(update_fields=['updated_at'])
 
         added_thesis = Thesis.objects.create(
             supervisor_id=supervisor,
@@ -102,6 +105,7 @@ class ThesisService:
             language=language
         )
         added_thesis.tags.set(tags)
+        search_cache.invalidate(TOPICS)
 
         log_description = f"""Promotor o ID {supervisor.pk} dodał
 nową pracę dyplomową (rodzaj: {thesis_type}) o ID {added_thesis.pk}"""
@@ -172,6 +176,7 @@ nową pracę dyplomową (rodzaj: {thesis_type}) o ID {added_thesis.pk}"""
         if updated:
             thesis_to_update.updated_at = timezone.now()
             thesis_to_update.save()
+            search_cache.invalidate(TOPICS)
 
             log_description = f"""Promotor o ID {supervisor.pk} zmienił
 pola w pracy dyplomowej o ID {thesis_to_update.pk}: """
@@ -198,18 +203,21 @@ pola w pracy dyplomowej o ID {thesis_to_update.pk}: """
         thesis_pk: int
     ):
         try:
-            supervisor = SupervisorProfile.objects.get(pk=supervisor.pk)
+            supervisor = SupervisorProfile.objects.select_related('user').get(pk=supervisor.pk)
             thesis_to_delete = Thesis.objects.get(pk=thesis_pk, supervisor_id=supervisor)
             serialized_thesis_data = ThesisDeleteSerializer(thesis_to_delete).data
-            Thesis.objects.get(pk=thesis_pk, supervisor_id=supervisor).delete()
+            thesis_to_delete.delete()
+            search_cache.invalidate(TOPICS)
 
             thesis_type = thesis_to_delete.thesis_type
             limit_before = getattr(supervisor, self.type_limits_dict[thesis_type])
             setattr(supervisor, self.type_limits_dict[thesis_type], limit_before + 1)
             supervisor.save()
+            supervisor.user.updated_at = timezone.now()
+            supervisor.user.save(update_fields=['updated_at'])
 
             log_description = f"""Promotor o ID {supervisor.pk} usunął
-pracę dyplomową (rodzaj: {thesis_type}) o ID {thesis_to_delete.pk}"""
+pracę dyplomową (rodzaj: {thesis_type}) o ID {thesis_pk}"""
 
             Logs.objects.create(
                 user_id=supervisor.user,
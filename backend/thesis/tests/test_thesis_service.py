@@ -339,6 +339,24 @@ class TestThesisService(TestCase):
         self.assertEqual(Thesis.objects.all().count(), 4)
 
 
+    def test_update_thesis_tags_only_bumps_updated_at(self):
+        updated_at = self.thesis_1.updated_at
+
+        self.thesis_service.update_thesis(
+            supervisor=self.supervisor_4,
+            thesis_pk=self.thesis_1.pk,
+            validated_data = {
+                "status": self.thesis_1.status,
+                "tags": [self.tag_python]
+            }
+        )
+
+        self.thesis_1.refresh_from_db()
+
+        self.assertEqual(list(self.thesis_1.tags.all()), [self.tag_python])
+        self.assertGreater(self.thesis_1.updated_at, updated_at)
+
+
     def test_delete_thesis_invalid_supervisor_id(self):
         with self.assertRaises(InvalidSupervisorIdException):
             self.thesis_service.delete_thesis(
@@ -0,0 +1,328 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from common.models import Department, Tag
+from common.search_cache import search_cache
+from thesis.models import Thesis, ThesisType, ThesisStatus
+from thesis.serializers.thesis_serializer import ThesisSerializer
+from thesis.serializers.thesis_list_serializer import ThesisListSerializer
+from thesis.views.thesis_views import AvailableThesisView
+from thesis_system.pagination import ProjectPagination
+from thesis_system.query_plan import get_query_plan, apply_query_plan
+from users.models import User, Role, AcademicTitle, SupervisorProfile
+
+
+class ThesisQueryPlanTests(APITestCase):
+    def setUp(self):
+        search_cache.cache.clear()
+
+        department = Department.objects.create(name="Wydział A")
+        tags = [Tag.objects.create(name=f"Tag {i}") for i in range(3)]
+
+        self.supervisors = []
+        for i in range(5):
+            supervisor = User.objects.create_user(
+                username=f"promotor{i}",
+                academic_title=AcademicTitle.DOCTOR,
+                role=Role.SUPERVISOR,
+                department=department,
+            )
+            supervisor.tags.add(*tags)
+            SupervisorProfile.objects.create(user=supervisor)
+            self.supervisors.append(supervisor)
+
+        for i in range(100):
+            thesis = Thesis.objects.create(
+                supervisor_id=self.supervisors[i % 5].supervisorprofile,
+                thesis_type=ThesisType.ENGINEERING,
+                name=f"Praca {i}",
+                max_students=1,
+                status=ThesisStatus.APP_OPEN,
+                language="Polski",
+            )
+            thesis.tags.add(*tags[:i % 3 + 1])
+
+        self.client.force_authenticate(user=self.supervisors[0])
+
+    def test_query_plans(self):
+        self.assertEqual(get_query_plan(ThesisListSerializer), ([], ['tags']))
+        self.assertEqual(
+            get_query_plan(ThesisSerializer),
+            (['supervisor_id__user__department'], ['tags', 'supervisor_id__user__tags']),
+        )
+
+    def test_query_plans_for_selected_fields(self):
+        self.assertEqual(get_query_plan(ThesisSerializer, frozenset({"id", "name"})), ([], []))
+        self.assertEqual(get_query_plan(ThesisSerializer, frozenset({"id", "tags"})), ([], ['tags']))
+        self.assertEqual(
+            get_query_plan(ThesisSerializer, frozenset({"supervisor_id"})),
+            (['supervisor_id__user__department'], ['supervisor_id__user__tags']),
+        )
+
+    def test_available_theses_list_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/thesis/available/', {"fields": "url,name", "limit": 100})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 100)
+        self.assertEqual(list(response.data["results"][0]), ["url", "name"])
+        self.assertNotIn("description", queries[-1]["sql"])
+        self.assertNotIn("thesis_thesis_tags", queries[-1]["sql"])
+
+    def test_available_theses_list_exclude(self):
+        response = self.client.get('/thesis/available/', {"exclude": "description,tags", "stream": 1})
+        rows = json.loads(b"".join(response.streaming_content))
+
+        self.assertEqual(len(rows), 100)
+        self.assertEqual(
+            list(rows[0]), ["url", "supervisor_id", "thesis_type", "name", "max_students", "language"]
+        )
+
+    def test_unknown_fields(self):
+        response = self.client.get('/thesis/available/', {"fields": "name,secret", "exclude": "password"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {"fields", "exclude"})
+
+        response = self.client.get('/thesis/available/', {"fields": "name", "exclude": "name"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_available_theses_list(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/thesis/available/', {"limit": 100})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 100)
+        self.assertFalse(response.data["has_more"])
+        self.assertIsNone(response.data["next"])
+
+    def test_available_theses_list_matches_serializer(self):
+        response = self.client.get('/thesis/available/', {"limit": 100})
+
+        theses = apply_query_plan(
+            Thesis.objects.filter(status=ThesisStatus.APP_OPEN).order_by("pk"), ThesisListSerializer
+        )
+        serialized = ThesisListSerializer(theses, many=True, context={'request': response.wsgi_request}).data
+
+        # The prefetch does not order tags, so their order depends on row ids.
+        for row in [*response.data["results"], *serialized]:
+            row["tags"] = sorted(row["tags"])
+        self.assertEqual(JSONRenderer().render(response.data["results"]), JSONRenderer().render(serialized))
+
+    def test_available_theses_default_page(self):
+        response = self.client.get('/thesis/available/')
+
+        self.assertEqual(len(response.data["results"]), ProjectPagination.default_limit)
+        self.assertTrue(response.data["has_more"])
+        self.assertNotIn("count", response.data)
+        self.assertNotIn("next_cursor", response.data)
+
+    def test_available_theses_offset_pages(self):
+        names = []
+        url = '/thesis/available/?limit=30'
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names.extend(thesis["name"] for thesis in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(len(names), 100)
+        self.assertEqual(len(set(names)), 100)
+
+    def test_available_theses_cursor_pages(self):
+        names = []
+        url = '/thesis/available/?limit=30&cursor='
+
+        while url:
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names.extend(thesis["name"] for thesis in response.data["results"])
+            self.assertEqual(response.data["has_more"], response.data["next_cursor"] is not None)
+            url = response.data["next"]
+
+        self.assertEqual(names, [f"Praca {i}" for i in range(100)])
+
+    def test_available_theses_count(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/thesis/available/', {"limit": 10, "count": "true"})
+
+        self.assertEqual(response.data["count"], 100)
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_available_theses_limit_is_capped(self):
+        with mock.patch.object(ProjectPagination, 'max_limit', 40):
+            response = self.client.get('/thesis/available/', {"limit": 1000})
+
+        self.assertEqual(len(response.data["results"]), 40)
+        self.assertTrue(response.data["has_more"])
+        self.assertIn("offset=40", response.data["next"])
+
+    def test_available_theses_invalid_page_parameters(self):
+        for params in ({"limit": "abc"}, {"offset": -1}, {"cursor": "nie-kursor"}):
+            response = self.client.get('/thesis/available/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_available_theses_stream(self):
+        expected = JSONRenderer().render(self.client.get('/thesis/available/', {"limit": 100}).data["results"])
+
+        with mock.patch.object(AvailableThesisView, 'stream_chunk_size', 7):
+            response = self.client.get('/thesis/available/', {"stream": 1})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(b"".join(response.streaming_content), expected)
+
+    def test_available_theses_ndjson(self):
+        expected = self.client.get('/thesis/available/', {"limit": 100}).json()["results"]
+
+        response = self.client.get('/thesis/available/', HTTP_ACCEPT="application/x-ndjson")
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+    def test_empty_stream(self):
+        Thesis.objects.update(status=ThesisStatus.APP_CLOSED)
+
+        response = self.client.get('/thesis/available/', {"stream": 1})
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
+
+    def test_available_thesis_detail(self):
+        thesis = Thesis.objects.first()
+
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/thesis/available/{thesis.pk}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["supervisor_id"]["user"]["department_name"], "Wydział A")
+        self.assertEqual(len(response.data["supervisor_id"]["user"]["tags"]), 3)
+
+    def test_available_thesis_detail_fields(self):
+        thesis = Thesis.objects.first()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/thesis/available/{thesis.pk}/', {"fields": "id,name"})
+
+        self.assertEqual(response.data, {"id": thesis.pk, "name": thesis.name})
+        # The version and the thesis itself, without description or joins.
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("description", queries[-1]["sql"])
+        self.assertNotIn("users_user", queries[-1]["sql"])
+
+    def test_available_thesis_detail_exclude(self):
+        thesis = Thesis.objects.first()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/thesis/available/{thesis.pk}/', {"exclude": "supervisor_id"})
+
+        self.assertNotIn("supervisor_id", response.data)
+        self.assertEqual(response.data["description"], thesis.description)
+        self.assertEqual(len(response.data["tags"]), 1)
+
+    def test_available_thesis_detail_not_modified(self):
+        thesis = Thesis.objects.first()
+        url = f'/thesis/available/{thesis.pk}/'
+        response = self.client.get(url)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+        not_modified = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_available_thesis_detail_etag_follows_supervisor(self):
+        thesis = Thesis.objects.first()
+        url = f'/thesis/available/{thesis.pk}/'
+        etag = self.client.get(url)["ETag"]
+
+        User.objects.filter(pk=thesis.supervisor_id_id).update(updated_at=timezone.now() + timedelta(seconds=1))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_available_theses_list_not_modified(self):
+        response = self.client.get('/thesis/available/')
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/thesis/available/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get('/thesis/available/', {"offset": 50}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        Thesis.objects.filter(pk=Thesis.objects.first().pk).update(status=ThesisStatus.APP_CLOSED)
+
+        response = self.client.get('/thesis/available/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # The newest row stays, so only the ETag can show the list changed.
+        response = self.client.get('/thesis/available/', HTTP_IF_MODIFIED_SINCE=http_date((timezone.now() + timedelta(minutes=1)).timestamp()))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_supervisor_theses(self):
+        with self.assertNumQueries(4):
+            response = self.client.get('/thesis/my-topics/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertFalse(response.data["has_more"])
+
+    def test_supervisor_theses_cursor_page(self):
+        response = self.client.get('/thesis/my-topics/', {"limit": 15, "cursor": ""})
+
+        self.assertEqual(len(response.data["results"]), 15)
+        self.assertTrue(response.data["has_more"])
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertFalse(response.data["has_more"])
+        self.assertIsNone(response.data["next_cursor"])
+
+    def test_search_topics(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/common/search-topics/', {"limit": 100})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 100)
+
+    def test_search_topics_fields(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/common/search-topics/', {"limit": 100, "fields": "url,name"})
+
+        self.assertEqual(len(response.data), 100)
+        self.assertEqual(list(response.data[0]), ["url", "name"])
+
+        with self.assertNumQueries(2):
+            response = self.client.get('/common/search-topics/', {"limit": 100, "cursor": "", "exclude": "tags"})
+
+        self.assertNotIn("tags", response.data["results"][0])
+
+        response = self.client.get('/common/search-topics/', {"fields": "id"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_topics_with_cursor(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/common/search-topics/', {"limit": 100, "cursor": ""})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 100)
@@ -7,6 +7,10 @@ from django.db.models import Q
 
 from thesis.models import Thesis, ThesisStatus
 from thesis_system.permissions import isSupervisor 
+from thesis_system.conditional import ConditionalGetMixin
+from thesis_system.query_plan import QueryPlanMixin, apply_query_plan
+from thesis_system.projection import ProjectionListMixin
+from thesis_system.sparse_fields import SparseFieldsMixin
 from thesis.services.thesis_service import ThesisService
 from thesis.serializers.thesis_add_serializer import ThesisAddSerializer
 from thesis.serializers.thesis_update_serializer import ThesisUpdateSerializer
@@ -42,7 +46,7 @@ class ThesisAddView(CreateAPIView):
         return Response({ "detail": "New thesis added successfully." }, status=status.HTTP_201_CREATED)
 
     
-class AvailableThesisView(viewsets.ReadOnlyModelViewSet):
+class AvailableThesisView(ConditionalGetMixin, SparseFieldsMixin, ProjectionListMixin, QueryPlanMixin, viewsets.ReadOnlyModelViewSet):
     """
     Endpoint for getting available theses.
     Allows users to browse theses open for application.
@@ -50,6 +54,7 @@ class AvailableThesisView(viewsets.ReadOnlyModelViewSet):
     queryset = Thesis.objects.filter(Q(status=ThesisStatus.APP_OPEN))
     permission_classes = [IsAuthenticated]
     lookup_field = 'pk'
+    version_fields = ['updated_at', 'supervisor_id__user__updated_at']
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -136,7 +141,8 @@ class SupervisorThesisView(ListAPIView):
             promotor_theses = service.get_promotor_theses(supervisor=supervisor)
         except Exception as e:
             raise NoSupervisorFoundException(str(e))
-        
-        if not promotor_theses:
+
+        promotor_theses = apply_query_plan(promotor_theses, self.get_serializer_class())
+        if not promotor_theses.exists():
             raise NoThesisFoundException()
         return promotor_theses
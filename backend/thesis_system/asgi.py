@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'thesis_system.settings')
 
 application = get_asgi_application()
+
+from common.services.reference_data_service import reference_data_service
+
+reference_data_service.warm()
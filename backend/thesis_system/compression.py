@@ -0,0 +1,116 @@
+import gzip
+from collections import namedtuple
+
+import brotli
+from django.conf import settings
+from django.utils.text import compress_sequence
+from rest_framework.response import Response
+
+from thesis_system.renderers import ORJSONRenderer
+
+
+BROTLI = "br"
+GZIP = "gzip"
+
+# Preferred first when the client weighs both the same.
+ENCODINGS = (BROTLI, GZIP)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/",
+)
+
+EncodedContent = namedtuple("EncodedContent", ["data", "content", "variants"])
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+        Returns the supported coding with the highest weight in an
+        `Accept-Encoding` header, or None when the client accepts neither.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.lower()] = q
+
+    def weight(encoding):
+        return weights.get(encoding, weights.get("*", 0.0))
+
+    encoding = max(ENCODINGS, key=weight)
+    return encoding if weight(encoding) > 0 else None
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    if encoding == BROTLI:
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+    for item in sequence:
+        # Flushed per chunk, so a streamed list reaches the client as it is read.
+        chunk = compressor.process(item) + compressor.flush()
+        if chunk:
+            yield chunk
+    yield compressor.finish()
+
+
+def compress_stream(sequence, encoding: str):
+    if encoding == BROTLI:
+        return _brotli_sequence(sequence)
+    return compress_sequence(sequence)
+
+
+def is_compressible(response) -> bool:
+    content_type = response.get("Content-Type", "")
+    return response.status_code == 200 and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def encode_json(data) -> EncodedContent:
+    """
+        Renders `data` as JSON and compresses it with every supported coding,
+        for cache entries served many times. Variants that would not be
+        smaller, or bodies under `COMPRESSION_MIN_SIZE`, are left out.
+    """
+    content = ORJSONRenderer().render(data)
+    variants = {}
+    if len(content) >= settings.COMPRESSION_MIN_SIZE:
+        for encoding in ENCODINGS:
+            compressed = compress(content, encoding)
+            if len(compressed) < len(content):
+                variants[encoding] = compressed
+    return EncodedContent(data, content, variants)
+
+
+class PrecompressedResponse(Response):
+    """
+        Response for an `EncodedContent`. Plain JSON requests get its rendered
+        bytes, and `CompressionMiddleware` sends the stored variant instead of
+        compressing them again; other formats are rendered from its data.
+    """
+    def __init__(self, encoded: EncodedContent, **kwargs):
+        super().__init__(encoded.data, **kwargs)
+        self.encoded = encoded
+
+    @property
+    def rendered_content(self):
+        renderer = getattr(self, "accepted_renderer", None)
+        if type(renderer) is not ORJSONRenderer \
+                or renderer.get_indent(self.accepted_media_type, self.renderer_context) is not None:
+            return super().rendered_content
+
+        self["Content-Type"] = self.content_type or renderer.media_type
+        self.precompressed = self.encoded.variants
+        return self.encoded.content
@@ -0,0 +1,124 @@
+import hashlib
+
+from django.db.models import Count, F, Max
+from django.db.models.functions import Greatest
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.settings import api_settings
+
+from thesis_system.compression import PrecompressedResponse
+from thesis_system.projection import is_stream_request
+from thesis_system.renderers import NDJSONRenderer
+
+
+def version_expression(fields: list[str]):
+    expressions = [F(field) for field in fields]
+    return Greatest(*expressions) if len(expressions) > 1 else expressions[0]
+
+
+class ConditionalGetMixin:
+    """
+        Generic view mixin answering `retrieve` and `list` with an ETag
+        derived from `updated_at`, and `retrieve` also with Last-Modified.
+        When the client already has the current version it gets 304 before
+        any object is loaded or serialized.
+
+        `version_fields` names every timestamp the representation depends on,
+        nested objects included. A list is versioned by its newest timestamp
+        and its number of rows. Lists send no Last-Modified, as deleting an
+        older row leaves their newest timestamp as it was.
+        `get_version_key_parts()` adds whatever else tells apart
+        representations sharing a version, e.g. whose they are.
+    """
+    version_fields = ["updated_at"]
+
+    def _version_queryset(self):
+        return self.filter_queryset(self.get_queryset()).prefetch_related(None)
+
+    def get_object_version(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        version = self._version_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).values_list(version_expression(self.version_fields), flat=True).first()
+
+        if version is None:
+            raise Http404
+        return version
+
+    def get_version_key_parts(self):
+        return ()
+
+    def get_list_version(self):
+        aggregate = self._version_queryset().aggregate(
+            version=Max(version_expression(self.version_fields)),
+            rows=Count("pk"),
+        )
+        return aggregate["version"], aggregate["rows"]
+
+    def _conditional_response(self, request, version, *key_parts, render, dated=False):
+        key = ":".join(str(part) for part in (
+            request.accepted_media_type, request.get_full_path(), version and version.isoformat(), *key_parts
+        ))
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        last_modified = int(version.timestamp()) if dated and version else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = render()
+
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(
+            request,
+            self.get_object_version(),
+            *self.get_version_key_parts(),
+            render=lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+            dated=True,
+        )
+
+    def list(self, request, *args, **kwargs):
+        version, rows = self.get_list_version()
+        return self._conditional_response(
+            request,
+            version,
+            rows,
+            *self.get_version_key_parts(),
+            render=lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+
+class ReferenceListMixin:
+    """
+        List view mixin serving a cached reference list. `get_reference()`
+        returns its encoded content and a digest of it, which becomes the
+        ETag; `cache_control` lets browsers and proxies keep the response.
+        Streams (`?stream=1`, NDJSON) go on to `ProjectionListMixin`.
+    """
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+    pagination_class = None
+    cache_control = {"private": True, "max_age": 300}
+
+    def get_reference(self):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        if is_stream_request(request):
+            return super().list(request, *args, **kwargs)
+
+        reference = self.get_reference()
+        etag = quote_etag(f"{reference.digest}-{request.accepted_renderer.format}")
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = PrecompressedResponse(reference.encoded)
+
+        response["ETag"] = etag
+        patch_cache_control(response, **self.cache_control)
+        patch_vary_headers(response, ["Accept"])
+        return response
@@ -0,0 +1,125 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+
+from thesis_system.compression import compress, compress_stream, is_compressible, negotiate_encoding
+from thesis_system.query_budget import QueryRecorder, get_query_budget
+
+
+logger = logging.getLogger("thesis_system.queries")
+
+
+class QueryInstrumentationMiddleware:
+    """
+        Records the SQL statements of every request. The totals are sent in the
+        `Server-Timing` header and logged as one JSON line per request; requests
+        over their query budget are logged as warnings.
+
+        Statements of a streamed body run after the headers are sent, so for
+        streamed responses the header only covers the work before the body and
+        the log line is written once the stream is closed.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request.query_recorder = recorder
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        queries = f"{recorder.count} queries before streaming" if response.streaming else f"{recorder.count} queries"
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={recorder.duration * 1000:.1f};desc="{queries}"',
+            f'db-dup;desc="{sum(recorder.duplicates().values())} repeated"',
+            f"total;dur={total * 1000:.1f}",
+        ])
+
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._record_stream(response.streaming_content, request, response, recorder, started)
+        else:
+            self._log(request, response, recorder, total)
+
+        return response
+
+    def _record_stream(self, content, request, response, recorder, started):
+        try:
+            with connection.execute_wrapper(recorder):
+                yield from content
+        finally:
+            self._log(request, response, recorder, time.perf_counter() - started)
+
+    def _log(self, request, response, recorder, total):
+        view_name = request.resolver_match.view_name if request.resolver_match else None
+        budget = get_query_budget(view_name, request.method)
+        over_budget = budget is not None and recorder.count > budget
+
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "view": view_name,
+                "status": response.status_code,
+                "queries": recorder.count,
+                "budget": budget,
+                "db_ms": round(recorder.duration * 1000, 1),
+                "total_ms": round(total * 1000, 1),
+                "duplicates": [{"sql": sql, "count": count} for sql, count in recorder.duplicates().items()],
+            }),
+        )
+
+
+class CompressionMiddleware:
+    """
+        Compresses JSON and text responses with brotli or gzip, whichever the
+        client prefers. Bodies under `COMPRESSION_MIN_SIZE` bytes are sent as
+        they are. A response carrying precompressed variants (see
+        `PrecompressedResponse`) is answered with the stored bytes.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.has_header("Content-Encoding") or not is_compressible(response):
+            return response
+        if response.streaming:
+            if response.is_async:
+                return response
+        elif len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ["Accept-Encoding"])
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response.headers["Content-Length"]
+        else:
+            precompressed = getattr(response, "precompressed", None)
+            if precompressed is not None:
+                content = precompressed.get(encoding)
+            else:
+                content = compress(response.content, encoding)
+            if content is None or len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        # The compressed body differs byte for byte, so a strong ETag becomes weak.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = f"W/{etag}"
+        response.headers["Content-Encoding"] = encoding
+        return response
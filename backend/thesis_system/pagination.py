@@ -0,0 +1,158 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from common.keyset_pagination import (
+    InvalidCursorException,
+    decode_cursor,
+    encode_cursor,
+    get_keyset_ordering,
+    get_row_values,
+    keyset_filter,
+)
+
+
+class ProjectPagination(BasePagination):
+    """
+        Limit/offset pagination, or keyset pagination when `cursor` is passed
+        (empty for the first page). Page sizes above `max_limit` are capped.
+
+        Rows are only counted with `count=true`; `has_more` comes from
+        fetching one row more than the page holds.
+    """
+    default_limit = 50
+    max_limit = 500
+
+    limit_query_param = "limit"
+    offset_query_param = "offset"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+
+    def _get_non_negative_int(self, request, name: str, default: int) -> int:
+        value = request.query_params.get(name)
+        if value in (None, ""):
+            return default
+
+        try:
+            number = int(value)
+        except ValueError:
+            raise ValidationError({name: "Wartość musi być liczbą całkowitą."})
+        if number < 0:
+            raise ValidationError({name: "Wartość nie może być ujemna."})
+        return number
+
+    def page_queryset(self, queryset, request):
+        """
+            Orders, filters and slices the queryset to the requested page plus
+            one row, without evaluating it. The fetched rows go to `trim_page`.
+        """
+        self.request = request
+        self.limit = min(
+            self._get_non_negative_int(request, self.limit_query_param, self.default_limit) or self.default_limit,
+            self.max_limit,
+        )
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        self.ordering = get_keyset_ordering(queryset)
+        queryset = queryset.order_by(*self.ordering)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ("1", "true"):
+            self.count = queryset.count()
+
+        if self.cursor_mode:
+            self.offset = None
+            cursor = request.query_params.get(self.cursor_query_param)
+            if cursor:
+                try:
+                    values = decode_cursor(cursor, self.ordering)
+                except InvalidCursorException as e:
+                    raise ValidationError({self.cursor_query_param: str(e)})
+                queryset = queryset.filter(keyset_filter(self.ordering, values))
+            return queryset[:self.limit + 1]
+
+        self.offset = self._get_non_negative_int(request, self.offset_query_param, 0)
+        return queryset[self.offset:self.offset + self.limit + 1]
+
+    def trim_page(self, rows: list, sort_values: list | None = None) -> list:
+        """
+            Drops the extra row fetched by `page_queryset`. `sort_values` holds
+            the ordering values of each row when the rows are not model
+            instances.
+        """
+        self.has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+
+        self.next_cursor = None
+        if self.cursor_mode and self.has_more:
+            last_values = sort_values[len(rows) - 1] if sort_values is not None \
+                else get_row_values(rows[-1], self.ordering)
+            self.next_cursor = encode_cursor(self.ordering, list(last_values))
+
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.trim_page(list(self.page_queryset(queryset, request)))
+
+    def get_next_link(self) -> str | None:
+        if not self.has_more:
+            return None
+
+        url = self.request.build_absolute_uri()
+        if self.cursor_mode:
+            return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        payload = {"has_more": self.has_more, "next": self.get_next_link()}
+        if self.cursor_mode:
+            payload["next_cursor"] = self.next_cursor
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["has_more", "next", "results"],
+            "properties": {
+                "has_more": {"type": "boolean"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "next_cursor": {"type": "string", "nullable": True},
+                "count": {"type": "integer"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.limit_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Rozmiar strony (domyślnie {self.default_limit}, maksymalnie {self.max_limit}).",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.offset_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Liczba pominiętych wierszy (tryb limit/offset).",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Kursor kolejnej strony; pusty dla pierwszej strony (tryb kursorowy).",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Dołącza liczbę wszystkich wierszy (dodatkowe zapytanie COUNT).",
+                "schema": {"type": "boolean"},
+            },
+        ]
@@ -0,0 +1,180 @@
+from itertools import islice
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from thesis_system.renderers import NDJSONRenderer, ORJSONRenderer
+
+
+_URL_PLACEHOLDER = 987654321987654321
+
+_PLAIN_FIELDS = (
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+_projections = {}
+
+
+class Projection:
+    """
+        Read-only rendering of a list serializer straight from `values_list()`
+        rows, producing the same JSON as the serializer without building model
+        instances or running field introspection per row.
+
+        Supported fields: plain model columns, to-one primary keys,
+        `HyperlinkedIdentityField` and a `tags` `SlugRelatedField` by name,
+        which is aggregated in SQL. A selection of `fields` leaves the other
+        fields, and their columns, out.
+    """
+    def __init__(self, serializer_class, fields=None):
+        self.keys = []
+        self.columns = []
+        self.url_fields = {}
+        self.aggregates_tag_names = False
+
+        for name, field in serializer_class().fields.items():
+            if fields is not None and name not in fields:
+                continue
+            self.keys.append(name)
+
+            if isinstance(field, serializers.HyperlinkedIdentityField):
+                self.url_fields[name] = field
+                self.columns.append(field.lookup_field)
+            elif isinstance(field, serializers.ManyRelatedField) and field.source == "tags" \
+                    and isinstance(field.child_relation, serializers.SlugRelatedField) \
+                    and field.child_relation.slug_field == "name":
+                self.aggregates_tag_names = True
+                self.columns.append("tag_names")
+            elif isinstance(field, _PLAIN_FIELDS) and "." not in field.source:
+                self.columns.append(field.source)
+            else:
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} ({type(field).__name__}) cannot be projected"
+                )
+
+    def _url_template(self, field, request) -> tuple[str, str]:
+        url = field.reverse(field.view_name, kwargs={field.lookup_url_kwarg: _URL_PLACEHOLDER}, request=request)
+        prefix, suffix = url.split(str(_URL_PLACEHOLDER))
+        return prefix, suffix
+
+    def _values(self, queryset, extra_columns=()):
+        queryset = queryset.prefetch_related(None)
+        if self.aggregates_tag_names:
+            queryset = queryset.with_tag_names()
+        return queryset.values_list(*self.columns, *extra_columns)
+
+    def _build_rows(self, request):
+        positions = {key: position for position, key in enumerate(self.keys)}
+        urls = [
+            (positions[name], *self._url_template(field, request))
+            for name, field in self.url_fields.items()
+        ]
+        keys = self.keys
+
+        def build(rows) -> list[dict]:
+            if not urls:
+                return [dict(zip(keys, row)) for row in rows]
+
+            results = []
+            for row in rows:
+                row = list(row)
+                for position, prefix, suffix in urls:
+                    row[position] = f"{prefix}{row[position]}{suffix}"
+                results.append(dict(zip(keys, row)))
+            return results
+
+        return build
+
+    def render(self, queryset, request) -> list[dict]:
+        return self._build_rows(request)(self._values(queryset))
+
+    def render_with_values(self, queryset, request, extra_columns) -> tuple[list[dict], list[tuple]]:
+        """
+            Renders the rows together with the values of `extra_columns`,
+            which are fetched in the same query but left out of the output.
+        """
+        width = len(self.columns)
+        rows = list(self._values(queryset, extra_columns))
+        return self._build_rows(request)(row[:width] for row in rows), [row[width:] for row in rows]
+
+    def render_chunks(self, queryset, request, chunk_size=500):
+        """
+            Yields the rendered rows in lists of at most `chunk_size`, reading
+            them from a server-side cursor so memory use does not depend on
+            the number of rows.
+        """
+        build = self._build_rows(request)
+        rows = self._values(queryset).iterator(chunk_size=chunk_size)
+
+        while chunk := list(islice(rows, chunk_size)):
+            yield build(chunk)
+
+
+def get_projection(serializer_class, fields=None) -> Projection:
+    key = (serializer_class, fields)
+    if key not in _projections:
+        _projections[key] = Projection(serializer_class, fields)
+    return _projections[key]
+
+
+def _json_array(chunks):
+    renderer = ORJSONRenderer()
+    separator = b""
+
+    yield b"["
+    for chunk in chunks:
+        yield separator + renderer.render(chunk)[1:-1]
+        separator = b","
+    yield b"]"
+
+
+def _ndjson_lines(chunks):
+    renderer = NDJSONRenderer()
+    for chunk in chunks:
+        yield renderer.render(chunk)
+
+
+def is_stream_request(request) -> bool:
+    return isinstance(request.accepted_renderer, NDJSONRenderer) \
+        or request.query_params.get("stream") in ("1", "true")
+
+
+class ProjectionListMixin:
+    """
+        List view mixin serving the `list` action through the serializer's
+        projection instead of serializing model instances.
+
+        Pages are cut by `ProjectPagination`. `?stream=1` streams the whole
+        list as a JSON array in chunks, `Accept: application/x-ndjson` as one
+        JSON object per line. The view's field selection, if any, narrows
+        the projection.
+    """
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        projection = get_projection(self.get_serializer_class(), self.get_field_selection())
+
+        if not is_stream_request(request):
+            paginator = self.paginator
+            if paginator is None:
+                return Response(projection.render(queryset, request))
+
+            page = paginator.page_queryset(queryset, request)
+            results, sort_values = projection.render_with_values(
+                page, request, [field.lstrip("-") for field in paginator.ordering]
+            )
+            return paginator.get_paginated_response(paginator.trim_page(results, sort_values))
+
+        chunks = projection.render_chunks(queryset, request, chunk_size=self.stream_chunk_size)
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            return StreamingHttpResponse(_ndjson_lines(chunks), content_type=NDJSONRenderer.media_type)
+        return StreamingHttpResponse(_json_array(chunks), content_type="application/json")
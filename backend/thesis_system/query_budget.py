@@ -0,0 +1,114 @@
+import re
+import time
+from collections import Counter
+
+
+# Maximum number of SQL statements per request, authentication included,
+# keyed by URL name. A budget is a number, or a dict of numbers per HTTP
+# method. Every endpoint below BUDGETED_PREFIXES must declare one.
+BUDGETED_PREFIXES = ("/users/", "/thesis/", "/common/", "/applications/")
+
+QUERY_BUDGETS = {
+    # users
+    "user-list": 3,
+    "user-detail": 4,
+    "my-profile": {"GET": 4, "PUT": 11, "PATCH": 11},
+    "update-tags": {"GET": 2, "PUT": 12},
+    "create-single-user": 10,
+    "update": 3,
+    "coordinator-user-detail": {"GET": 3, "PUT": 7, "PATCH": 7},
+    # thesis
+    "thesis-add-form": 9,
+    "update-thesis": 12,
+    "available-theses": 3,
+    "available-theses-detail": 5,
+    "delete-thesis": 13,
+    "supervisor-thesis": 5,
+    # common
+    "tag-list": 4,
+    "department-list": 4,
+    "search-users": 5,
+    "search-topics": 5,
+    "department-view": {"GET": 2, "PUT": 7, "PATCH": 7},
+    "search-cache-stats": 2,
+    "recommended-topics": 5,
+    "recommended-supervisors": 5,
+    "autocomplete": 5,
+    # applications
+    "submit_to_thesis": 10,
+    "cancel_submission": 6,
+    "student_submission_status": 5,
+    "submission_ticket": 3,
+    "thesis_submissions": 8,
+    "accept_submission": 7,
+    "reject_submission": 5,
+    "remove_student": 8,
+    "bulk_submission_actions": 8,
+    "thesis_preferences": {"GET": 2, "PUT": 8},
+    "applicant_ranking": 7,
+    "assignment_round": 10,
+}
+
+
+def get_query_budget(view_name: str, method: str) -> int | None:
+    budget = QUERY_BUDGETS.get(view_name)
+    if isinstance(budget, dict):
+        return budget.get(method)
+    return budget
+
+
+_IN_LIST = re.compile(r"\bIN \((?:%s, )*%s\)")
+_VALUES_LIST = re.compile(r"VALUES (\((?:%s, )*%s\))(?:, \((?:%s, )*%s\))*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+        SQL with variable length parameter lists collapsed, so the same query
+        run for different rows maps to one fingerprint.
+    """
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _VALUES_LIST.sub(r"VALUES \1, ...", sql)
+
+
+class QueryRecorder:
+    """
+        `connection.execute_wrapper` hook counting the statements run through
+        it, their total time and how often each fingerprint was seen.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self) -> dict[str, int]:
+        return {sql: count for sql, count in self.fingerprints.items() if count > 1}
+
+
+class QueryBudgetTestMixin:
+    """
+        TestCase mixin checking a response against the declared budget of
+        its endpoint. Requires `QueryInstrumentationMiddleware`.
+    """
+    def assertWithinQueryBudget(self, response):
+        request = response.wsgi_request
+        view_name = request.resolver_match.view_name
+        budget = get_query_budget(view_name, request.method)
+        self.assertIsNotNone(budget, f"No query budget declared for {request.method} {view_name}")
+
+        queries = request.query_recorder
+        self.assertLessEqual(
+            queries.count,
+            budget,
+            f"{view_name} ran {queries.count} queries, budget is {budget}. Repeated: {queries.duplicates()}",
+        )
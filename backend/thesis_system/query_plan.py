@@ -0,0 +1,150 @@
+from django.db.models import QuerySet, prefetch_related_objects
+from rest_framework import serializers
+
+from common.keyset_pagination import get_keyset_ordering
+
+
+_plans = {}
+_deferred = {}
+
+
+def _root(lookup: str) -> str:
+    return lookup.replace(".", "__").split("__")[0]
+
+
+def _source_root(field) -> str:
+    if isinstance(field, serializers.HyperlinkedIdentityField):
+        return field.lookup_field
+    return _root(field.source)
+
+
+def _reads_known_sources(fields: list) -> bool:
+    """
+        False when one of the fields is handed the whole object
+        (`source="*"`), so what it reads is unknown.
+    """
+    return all(_source_root(field) != "*" for field in fields)
+
+
+def _selected_fields(serializer_class, fields) -> list:
+    return [
+        field for name, field in serializer_class().fields.items()
+        if fields is None or name in fields
+    ]
+
+
+def get_query_plan(serializer_class, fields=None) -> tuple[list[str], list[str]]:
+    """
+        Returns the (select_related, prefetch_related) lookups a serializer needs
+        to render a row without extra queries.
+
+        A serializer declares its own lookups in `Meta.select_related` and
+        `Meta.prefetch_related`. Plans of nested serializers are added below
+        their source: to-one nesting extends select_related, to-many nesting
+        turns all nested lookups into prefetches.
+
+        With a selection of top-level `fields`, lookups of the left-out
+        fields are dropped. A selected field reading the whole object
+        (`source="*"`) keeps all of `Meta`'s lookups.
+    """
+    key = (serializer_class, fields)
+    if key in _plans:
+        return _plans[key]
+
+    selected = _selected_fields(serializer_class, fields)
+    meta = getattr(serializer_class, "Meta", None)
+    select_related = list(getattr(meta, "select_related", []))
+    prefetch_related = list(getattr(meta, "prefetch_related", []))
+
+    if fields is not None and _reads_known_sources(selected):
+        left_out = {_source_root(field) for field in serializer_class().fields.values()}
+        left_out -= {_source_root(field) for field in selected}
+        select_related = [lookup for lookup in select_related if _root(lookup) not in left_out]
+        prefetch_related = [lookup for lookup in prefetch_related if _root(lookup) not in left_out]
+
+    for field in selected:
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+        if not isinstance(nested, serializers.BaseSerializer) or field.source == "*":
+            continue
+
+        source = field.source.replace(".", "__")
+        nested_select, nested_prefetch = get_query_plan(type(nested))
+
+        if many:
+            prefetch_related.append(source)
+            prefetch_related += [f"{source}__{lookup}" for lookup in nested_select + nested_prefetch]
+        else:
+            select_related.append(source)
+            select_related += [f"{source}__{lookup}" for lookup in nested_select]
+            prefetch_related += [f"{source}__{lookup}" for lookup in nested_prefetch]
+
+    # Shorter lookups are implied by longer ones.
+    select_related = [
+        lookup for lookup in select_related
+        if not any(other.startswith(f"{lookup}__") for other in select_related)
+    ]
+
+    _plans[key] = (select_related, list(dict.fromkeys(prefetch_related)))
+    return _plans[key]
+
+
+def get_deferred_fields(serializer_class, fields) -> list[str]:
+    """
+        Returns the model columns no selected field reads, which can be left
+        out of the query. Primary and foreign keys are always loaded.
+    """
+    key = (serializer_class, fields)
+    if key in _deferred:
+        return _deferred[key]
+
+    model = getattr(getattr(serializer_class, "Meta", None), "model", None)
+    selected = _selected_fields(serializer_class, fields)
+
+    deferred = []
+    if fields is not None and model is not None and _reads_known_sources(selected):
+        sources = {_source_root(field) for field in selected}
+        deferred = [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key and not field.is_relation and field.name not in sources
+        ]
+
+    _deferred[key] = deferred
+    return deferred
+
+
+def apply_query_plan(rows, serializer_class, fields=None):
+    """
+        Applies the plan of `serializer_class` to a queryset, or fetches the
+        related rows of an already evaluated list of instances. A selection
+        of `fields` also defers the columns only left-out fields read.
+    """
+    select_related, prefetch_related = get_query_plan(serializer_class, fields)
+
+    if isinstance(rows, QuerySet):
+        if select_related:
+            rows = rows.select_related(*select_related)
+        if prefetch_related:
+            rows = rows.prefetch_related(*prefetch_related)
+
+        # Sort columns stay loaded, keyset pagination reads them from rows.
+        ordering = {_root(field.lstrip("-")) for field in get_keyset_ordering(rows)}
+        deferred = [name for name in get_deferred_fields(serializer_class, fields) if name not in ordering]
+        if deferred:
+            rows = rows.defer(*deferred)
+        return rows
+
+    prefetch_related_objects(rows, *select_related, *prefetch_related)
+    return rows
+
+
+class QueryPlanMixin:
+    """
+        Generic view mixin applying the query plan of the view's serializer
+        to `get_queryset()`.
+    """
+    def get_field_selection(self) -> frozenset[str] | None:
+        return None
+
+    def get_queryset(self):
+        return apply_query_plan(super().get_queryset(), self.get_serializer_class(), self.get_field_selection())
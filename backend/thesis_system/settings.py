@@ -59,6 +59,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework_simplejwt',
     'rest_framework',
     'drf_spectacular',
@@ -74,6 +75,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'thesis_system.middleware.CompressionMiddleware',
+    'thesis_system.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -113,6 +116,16 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'dj_rest_auth.jwt_auth.JWTCookieAuthentication', 
     ],
+    'DEFAULT_PAGINATION_CLASS': 'thesis_system.pagination.ProjectPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'thesis_system.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'thesis_system.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 # Database
@@ -129,6 +142,21 @@ DATABASES = {
     }
 }
 
+# Search entries are kept per process, their versions are shared through
+# the database (common.SearchCacheVersion).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'search': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'search-results',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -172,6 +200,39 @@ CORS_ALLOW_CREDENTIALS = True
 
 STATIC_URL = 'static/'
 
+# Responses of at least COMPRESSION_MIN_SIZE bytes are compressed by CompressionMiddleware.
+# Cached search and reference responses are stored compressed at the same settings.
+
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_GZIP_LEVEL = 6
+
+# Intake of /applications/submit/: 'direct' creates the submission during the request,
+# 'queued' stores a ticket that `manage.py process_submission_queue` workers drain in FIFO batches.
+
+SUBMISSION_INTAKE_MODE = os.environ.get('SUBMISSION_INTAKE_MODE', 'direct')
+SUBMISSION_QUEUE_BATCH_SIZE = 200
+
+# Per-request SQL statistics logged by QueryInstrumentationMiddleware.
+# Requests over their query budget are warnings; set QUERY_LOG_LEVEL=INFO to log every request.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'thesis_system.queries': {
+            'handlers': ['console'],
+            'level': os.environ.get('QUERY_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
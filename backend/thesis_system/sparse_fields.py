@@ -0,0 +1,70 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+
+
+def _names(value: str | None) -> list[str]:
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def get_field_selection(query_params, serializer_class) -> frozenset[str] | None:
+    """
+        Returns the names of the top-level serializer fields selected by
+        `?fields=a,b` and `?exclude=c`, or None when neither is passed.
+        Unknown names and an empty selection are rejected with 400.
+    """
+    if FIELDS_PARAM not in query_params and EXCLUDE_PARAM not in query_params:
+        return None
+
+    available = list(serializer_class().fields)
+    fields = _names(query_params.get(FIELDS_PARAM))
+    exclude = _names(query_params.get(EXCLUDE_PARAM))
+
+    errors = {}
+    for param, names in ((FIELDS_PARAM, fields), (EXCLUDE_PARAM, exclude)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = f"Nieznane pola: {', '.join(unknown)}."
+    if errors:
+        raise ValidationError(errors)
+
+    selection = frozenset(
+        name for name in available
+        if (not fields or name in fields) and name not in exclude
+    )
+    if not selection:
+        raise ValidationError({EXCLUDE_PARAM: "Nie można pominąć wszystkich pól."})
+    return selection
+
+
+def narrow_serializer(serializer, fields: frozenset[str] | None):
+    """
+        Drops the fields left out of the selection from a serializer, or from
+        the child of a `many=True` serializer.
+    """
+    if fields is None:
+        return serializer
+
+    target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+    for name in list(target.fields):
+        if name not in fields:
+            target.fields.pop(name)
+    return serializer
+
+
+class SparseFieldsMixin:
+    """
+        Generic view mixin narrowing the response to `?fields=` / `?exclude=`.
+        The selection also reaches the query plan and the projection, so
+        columns and relations of left-out fields are not fetched.
+    """
+    def get_field_selection(self) -> frozenset[str] | None:
+        if not hasattr(self, "_field_selection"):
+            self._field_selection = get_field_selection(self.request.query_params, self.get_serializer_class())
+        return self._field_selection
+
+    def get_serializer(self, *args, **kwargs):
+        return narrow_serializer(super().get_serializer(*args, **kwargs), self.get_field_selection())
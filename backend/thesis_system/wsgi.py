@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'thesis_system.settings')
 
 application = get_wsgi_application()
+
+from common.services.reference_data_service import reference_data_service
+
+reference_data_service.warm()
@@ -1,7 +1,10 @@
+from django.apps import apps
 from django.db import models
 from django.utils import timezone
-from django.contrib.auth.models import AbstractUser
-from common.models import Department, Tag
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from common.models import Department, Tag, TaggedQuerySet, TaggedModelMixin, fold_text
 
 class Role(models.TextChoices):
     STUDENT = 'student', 'Student'
@@ -27,8 +30,40 @@ ACADEMIC_TITLE_SORT_ORDER = {
     AcademicTitle.HABILITATED_DOCTOR: 5,
     AcademicTitle.PROFESSOR: 6,
 }
+
+
+def academic_title_order_expression(field='academic_title'):
+    return models.Case(
+        *[
+            models.When(**{field: key}, then=models.Value(value))
+            for key, value in ACADEMIC_TITLE_SORT_ORDER.items()
+        ],
+        default=models.Value(0),
+        output_field=models.IntegerField()
+    )
+
+
+def sync_supervisor_title_order(user_ids):
+    Thesis = apps.get_model('thesis', 'Thesis')
+    Thesis.objects.filter(supervisor_id__in=user_ids).sync_supervisor_title_order()
+
+
+class UserQuerySet(TaggedQuerySet):
+    def update(self, **kwargs):
+        if 'academic_title' not in kwargs:
+            return super().update(**kwargs)
+
+        user_ids = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        sync_supervisor_title_order(user_ids)
+        return rows
+
+
+class CustomUserManager(UserManager.from_queryset(UserQuerySet)):
+    pass
+
     
-class User(AbstractUser):
+class User(TaggedModelMixin, AbstractUser):
     role = models.CharField(
         null=True, 
         blank=True,
@@ -61,6 +96,65 @@ class User(AbstractUser):
         Tag,
         related_name='users'
     )
+    academic_title_order = models.GeneratedField(
+        expression=academic_title_order_expression(),
+        output_field=models.IntegerField(),
+        db_persist=True
+    )
+    tag_ids = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        editable=False
+    )
+    first_name_folded = models.GeneratedField(
+        expression=fold_text('first_name'),
+        output_field=models.TextField(),
+        db_persist=True
+    )
+    last_name_folded = models.GeneratedField(
+        expression=fold_text('last_name'),
+        output_field=models.TextField(),
+        db_persist=True
+    )
+
+    objects = CustomUserManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-academic_title_order', 'last_name', 'first_name', 'id'],
+                name='user_title_order_idx'
+            ),
+            models.Index(
+                fields=['role', '-academic_title_order', 'last_name', 'first_name', 'id'],
+                name='user_role_title_order_idx'
+            ),
+            GinIndex(fields=['tag_ids'], name='user_tag_ids_idx'),
+            GinIndex(fields=['first_name_folded'], opclasses=['gin_trgm_ops'], name='user_first_name_trgm_idx'),
+            GinIndex(fields=['last_name_folded'], opclasses=['gin_trgm_ops'], name='user_last_name_trgm_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+
+        # Theses copy the title order of their supervisor; a new user has none yet.
+        update_fields = kwargs.get('update_fields')
+        loaded_values = getattr(self, '_loaded_values', {})
+        title_changed = loaded_values.get('academic_title', models.DEFERRED) != self.academic_title
+        if not adding and self.role == Role.SUPERVISOR and title_changed \
+                and (update_fields is None or 'academic_title' in update_fields):
+            sync_supervisor_title_order([self.pk])
+
+        if update_fields is None or 'academic_title' in update_fields:
+            self._loaded_values = {**loaded_values, 'academic_title': self.academic_title}
     
     def __str__(self):
         try:
@@ -26,6 +26,8 @@ class UserThesisSerializer(serializers.ModelSerializer):
             'department_name', 
             'tags'
         ]
+        select_related = ['department']
+        prefetch_related = ['tags']
         read_only_fields = [
             'email',
             'first_name',
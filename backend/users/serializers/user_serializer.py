@@ -8,10 +8,11 @@ class UserSerializer(serializers.ModelSerializer):
         read_only=True,
         slug_field='name'
     )
-    department_name = serializers.SerializerMethodField() 
-
-    def get_department_name(self, obj):
-        return obj.department.name if obj.department else None 
+    department_name = serializers.CharField(
+        source='department.name',
+        read_only=True,
+        allow_null=True
+    )
 
     class Meta:
         model = User
@@ -40,3 +41,5 @@ class UserSerializer(serializers.ModelSerializer):
             'department_name', 
             'tags'
         ]
+        select_related = ['department']
+        prefetch_related = ['tags']
@@ -9,6 +9,7 @@ from django.core.mail import send_mail
 from django.contrib.auth import get_user_model 
 from users.models import StudentProfile, SupervisorProfile, Role, AcademicTitle, Logs, User
 from common.models import Department 
+from common.search_cache import search_cache, USERS
 
 class CoordinatorService:
     def clean_polish_chars(self, text: str) -> str:
@@ -118,6 +119,8 @@ Administracja
                     user=new_user,
                 )
 
+            search_cache.invalidate(USERS)
+
             changed_fields_str = f'Koordynator o ID {coordinator.id} utworzył konto użytkownika {new_user.first_name} {new_user.last_name} (ID: {new_user.id}) z rolą {new_user.role.label} w dziale {new_user.department.name}.'
 
             Logs.objects.create(
@@ -155,8 +158,11 @@ Administracja
             if old_value != new_value:
                 setattr(user, field, new_value)
                 changes.append(f'zmienił {field} z {old_value} na {new_value}')
-                
+
+        if changes:
+            user.updated_at = timezone.now()
         user.save()
+        search_cache.invalidate(USERS)
         
         changed_fields_str = f'Koordynator o ID {coordinator.id} zmienił następujące pola użytkownika o ID {user.id}: ' +  "; ".join(changes)
         
@@ -2,6 +2,7 @@ from django.db import transaction
 from users.models import User, StudentProfile, SupervisorProfile, Role, Logs
 from django.utils import timezone
 from common.logging_utils import compare_instance_changes
+from common.search_cache import search_cache, USERS
 from django.db.models.fields.related_descriptors import ManyToManyDescriptor 
 
 
@@ -12,8 +13,6 @@ class UserService:
             original_user = User.objects.select_related('studentprofile', 'supervisorprofile').get(pk=user.pk)
             original_student_profile = original_user.studentprofile if hasattr(original_user, 'studentprofile') else None
             original_supervisor_profile = original_user.supervisorprofile if hasattr(original_user, 'supervisorprofile') else None
-            
-            original_user_copy_for_comparison = User.objects.get(pk=user.pk) 
 
         except User.DoesNotExist:
             raise ValueError(f"User with id {user.pk} doesn't exist.")
@@ -54,21 +53,20 @@ class UserService:
                              
                     if profile_updated:
                          supervisor_profile.save()
+                         search_cache.invalidate(USERS)
 
             except SupervisorProfile.DoesNotExist:
                  print(f"Error in service: Supervisor {user.username} (ID: {user.id}) doesn't have a supervisor profile during limit update!")
                  pass
 
-        if user_updated:
+        if user_updated or profile_updated:
             user.updated_at = timezone.now()
             user.save()
-
-        if user_updated or profile_updated:
-             user.refresh_from_db()
+            search_cache.invalidate(USERS)
 
         all_changes = []
 
-        user_changes_for_logging = compare_instance_changes(original_user_copy_for_comparison, user, prefix='User')
+        user_changes_for_logging = compare_instance_changes(original_user, user, prefix='User')
         all_changes.extend(user_changes_for_logging)
 
         if user.role == Role.STUDENT and original_student_profile:
@@ -116,6 +114,10 @@ class UserService:
         if tags_to_remove:
              user.tags.remove(*tags_to_remove) 
 
+        user.updated_at = timezone.now()
+        user.save(update_fields=['updated_at'])
+        search_cache.invalidate(USERS)
+
         user.refresh_from_db() 
 
         updated_tags_list = list(user.tags.all())
@@ -1,10 +1,12 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
 from users.models import Role, AcademicTitle, StudentProfile, SupervisorProfile
 from common.models import Department, Tag
+from users.serializers.department_user_list_serializer import DepartmentUserListSerializer
 
 User = get_user_model()
 
@@ -93,8 +95,8 @@ class CoordinatorViewEndpointTests(APITestCase):
         response = self.client.get(self.coordinator_list_url)
         # Test dostosowany do obecnego zachowania (200 OK z pustą listą)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(response.data, list)
-        self.assertEqual(len(response.data), 0)
+        self.assertIsInstance(response.data['results'], list)
+        self.assertEqual(len(response.data['results']), 0)
 
 
     def test_get_coordinator_list_authenticated_coordinator_it(self):
@@ -102,17 +104,17 @@ class CoordinatorViewEndpointTests(APITestCase):
         response = self.client.get(self.coordinator_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertIsInstance(response.data, list)
-        self.assertEqual(len(response.data), 2)
+        self.assertIsInstance(response.data['results'], list)
+        self.assertEqual(len(response.data['results']), 2)
 
-        emails = {user_data['email'] for user_data in response.data}
+        emails = {user_data['email'] for user_data in response.data['results']}
         self.assertIn(self.student_it.email, emails)
         self.assertIn(self.supervisor_it.email, emails)
         self.assertNotIn(self.student_el.email, emails)
         self.assertNotIn(self.supervisor_el.email, emails)
         self.assertNotIn(self.user_coordinator_it.email, emails)
 
-        for user_data in response.data:
+        for user_data in response.data['results']:
             self.assertIn('url', user_data)
             self.assertIn('email', user_data)
             self.assertIn('role', user_data)
@@ -124,6 +126,33 @@ class CoordinatorViewEndpointTests(APITestCase):
             self.assertNotIn('department', user_data)
 
 
+    def test_get_coordinator_list_query_count(self):
+        for i in range(20):
+            User.objects.create_user(
+                username=f'student_it_{i}', email=f'student_it_{i}@example.com',
+                role=Role.STUDENT, department=self.department_it
+            )
+
+        self.client.force_authenticate(user=self.user_coordinator_it)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.coordinator_list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 22)
+
+
+    def test_get_coordinator_list_matches_serializer(self):
+        self.client.force_authenticate(user=self.user_coordinator_it)
+        response = self.client.get(self.coordinator_list_url)
+
+        users = User.objects.filter(
+            role__in=[Role.STUDENT, Role.SUPERVISOR], department=self.user_coordinator_it.department
+        ).order_by('pk')
+        serialized = DepartmentUserListSerializer(users, many=True, context={'request': response.wsgi_request}).data
+
+        self.assertEqual(JSONRenderer().render(response.data['results']), JSONRenderer().render(serialized))
+
+
     def test_get_coordinator_detail_unauthenticated(self):
         url = reverse('coordinator-user-detail', kwargs={'pk': self.student_it.pk})
         response = self.client.get(url)
@@ -86,6 +86,34 @@ class ProfileEndpointTests(APITestCase):
         self.assertEqual(response.data['master_limit'], 4)
         self.assertListEqual(sorted(user_data['tags']), sorted([self.tag_python.name, self.tag_django.name]))
 
+    def test_get_profile_not_modified(self):
+        self.client.force_authenticate(user=self.user_supervisor)
+        etag = self.client.get(self.profile_url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.profile_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_profile_etag_differs_between_users(self):
+        User.objects.update(updated_at=self.user_student.updated_at)
+        self.client.force_authenticate(user=User.objects.get(pk=self.user_supervisor.pk))
+        etag = self.client.get(self.profile_url)['ETag']
+
+        self.client.force_authenticate(user=User.objects.get(pk=self.user_student.pk))
+        response = self.client.get(self.profile_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'student_test')
+
+    def test_get_profile_etag_changes_after_update(self):
+        self.client.force_authenticate(user=self.user_supervisor)
+        etag = self.client.get(self.profile_url)['ETag']
+
+        self.client.patch(self.profile_url, {'master_limit': 7}, format='json')
+
+        response = self.client.get(self.profile_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['master_limit'], 7)
+
     def test_get_coordinator_profile_authenticated(self):
         self.client.force_authenticate(user=self.user_coordinator)
         response = self.client.get(self.profile_url)
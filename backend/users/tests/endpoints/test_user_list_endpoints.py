@@ -1,10 +1,13 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
 from users.models import Role, AcademicTitle, StudentProfile, SupervisorProfile
 from common.models import Department, Tag
+from users.serializers.user_list_serializer import UserListSerializer
+from users.services.user_service import user_service
 
 User = get_user_model()
 
@@ -75,15 +78,15 @@ class UserListEndpointTests(APITestCase):
         response = self.client.get(self.user_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertIsInstance(response.data, list)
-        self.assertEqual(len(response.data), 3)
+        self.assertIsInstance(response.data['results'], list)
+        self.assertEqual(len(response.data['results']), 3)
 
-        emails = {user_data['email'] for user_data in response.data}
+        emails = {user_data['email'] for user_data in response.data['results']}
         self.assertIn(self.user_student.email, emails)
         self.assertIn(self.user_supervisor_it.email, emails)
         self.assertIn(self.user_supervisor_el.email, emails)
 
-        for user_data in response.data:
+        for user_data in response.data['results']:
             self.assertIn('url', user_data)
             self.assertIn('email', user_data)
             self.assertIn('role', user_data)
@@ -96,10 +99,10 @@ class UserListEndpointTests(APITestCase):
         response = self.client.get(self.user_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertIsInstance(response.data, list)
-        self.assertEqual(len(response.data), 3)
+        self.assertIsInstance(response.data['results'], list)
+        self.assertEqual(len(response.data['results']), 3)
 
-        emails = {user_data['email'] for user_data in response.data}
+        emails = {user_data['email'] for user_data in response.data['results']}
         self.assertIn(self.user_student.email, emails)
         self.assertIn(self.user_supervisor_it.email, emails)
         self.assertIn(self.user_supervisor_el.email, emails)
@@ -110,10 +113,10 @@ class UserListEndpointTests(APITestCase):
         response = self.client.get(self.user_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertIsInstance(response.data, list)
-        self.assertEqual(len(response.data), 3)
+        self.assertIsInstance(response.data['results'], list)
+        self.assertEqual(len(response.data['results']), 3)
 
-        emails = {user_data['email'] for user_data in response.data}
+        emails = {user_data['email'] for user_data in response.data['results']}
         self.assertIn(self.user_student.email, emails)
         self.assertIn(self.user_supervisor_it.email, emails)
         self.assertIn(self.user_supervisor_el.email, emails)
@@ -125,15 +128,40 @@ class UserListEndpointTests(APITestCase):
         response = self.client.get(self.user_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertIsInstance(response.data, list)
-        self.assertEqual(len(response.data), 3)
+        self.assertIsInstance(response.data['results'], list)
+        self.assertEqual(len(response.data['results']), 3)
 
-        emails = {user_data['email'] for user_data in response.data}
+        emails = {user_data['email'] for user_data in response.data['results']}
         self.assertIn(self.user_student.email, emails)
         self.assertIn(self.user_supervisor_it.email, emails)
         self.assertIn(self.user_supervisor_el.email, emails)
 
 
+    def test_get_user_list_query_count(self):
+        for i in range(20):
+            User.objects.create_user(
+                username=f'student_{i}', email=f'student_{i}@example.com',
+                role=Role.STUDENT, department=self.department_el
+            )
+
+        self.client.force_authenticate(user=self.user_student)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.user_list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 23)
+
+
+    def test_get_user_list_matches_serializer(self):
+        self.client.force_authenticate(user=self.user_student)
+        response = self.client.get(self.user_list_url)
+
+        users = User.objects.filter(role__in=[Role.STUDENT, Role.SUPERVISOR], is_active=True).order_by('pk')
+        serialized = UserListSerializer(users, many=True, context={'request': response.wsgi_request}).data
+
+        self.assertEqual(JSONRenderer().render(response.data['results']), JSONRenderer().render(serialized))
+
+
     def test_get_user_detail_unauthenticated(self):
         url = reverse('user-detail', kwargs={'pk': self.user_student.pk})
         response = self.client.get(url)
@@ -168,6 +196,80 @@ class UserListEndpointTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_get_user_detail_query_count(self):
+        self.client.force_authenticate(user=self.user_student)
+        url = reverse('user-detail', kwargs={'pk': self.user_supervisor_it.pk})
+
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['department_name'], self.department_it.name)
+
+    def test_get_user_detail_fields(self):
+        self.client.force_authenticate(user=self.user_student)
+        url = reverse('user-detail', kwargs={'pk': self.user_supervisor_it.pk})
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'exclude': 'tags,department,department_name'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('tags', response.data)
+        self.assertEqual(response.data['username'], self.user_supervisor_it.username)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'fields': 'id,department_name'})
+
+        self.assertEqual(response.data, {'id': self.user_supervisor_it.pk, 'department_name': self.department_it.name})
+
+    def test_get_user_list_fields(self):
+        self.client.force_authenticate(user=self.user_student)
+        response = self.client.get(self.user_list_url, {'fields': 'url,last_name'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results'][0]), ['url', 'last_name'])
+
+    def test_get_user_detail_not_modified(self):
+        self.client.force_authenticate(user=self.user_student)
+        url = reverse('user-detail', kwargs={'pk': self.user_supervisor_it.pk})
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        user_service.update_user_tags(self.user_supervisor_it, {'to_add': [Tag.objects.create(name='Nowy tag')]})
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Nowy tag', response.data['tags'])
+
+    def test_get_user_detail_follows_tag_and_department_changes(self):
+        self.client.force_authenticate(user=self.user_student)
+        url = reverse('user-detail', kwargs={'pk': self.user_supervisor_it.pk})
+
+        def assert_changed(etag):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return response
+
+        etag = self.client.get(url)['ETag']
+        self.tag_python.name = 'Python 3'
+        self.tag_python.save()
+        response = assert_changed(etag)
+        self.assertIn('Python 3', response.data['tags'])
+
+        self.tag_django.delete()
+        response = assert_changed(response['ETag'])
+        self.assertEqual(response.data['tags'], ['Python 3'])
+
+        self.user_supervisor_it.tags.remove(self.tag_python)
+        response = assert_changed(response['ETag'])
+        self.assertEqual(response.data['tags'], [])
+
+        self.department_it.delete()
+        assert_changed(response['ETag'])
+
     def test_get_user_detail_nonexistent(self):
         self.client.force_authenticate(user=self.user_student)
         url = reverse('user-detail', kwargs={'pk': 999})
@@ -77,6 +77,14 @@ class UserModelTests(BaseModelTests):
         self.assertIsNone(user.department)
         self.assertEqual(user.tags.count(), 0)
 
+    def test_user_academic_title_order(self):
+        self.supervisor_user.refresh_from_db()
+        self.assertEqual(self.supervisor_user.academic_title_order, 4)
+
+        User.objects.filter(pk=self.supervisor_user.pk).update(academic_title=AcademicTitle.PROFESSOR)
+        self.supervisor_user.refresh_from_db()
+        self.assertEqual(self.supervisor_user.academic_title_order, 6)
+
     def test_user_nullable_fields(self):
         user = User.objects.create_user(
             username='nullable_user',
@@ -191,6 +191,14 @@ class UserServiceTests(TestCase):
         self.assertIn('SupervisorProfile.master_limit', log_entry.description)
         self.assertNotIn('SupervisorProfile.engineering_limit', log_entry.description)
 
+    def test_update_supervisor_limits_bumps_updated_at(self):
+        updated_at = self.user_supervisor.updated_at
+
+        user_service.update_user_data(self.user_supervisor, {'master_limit': 150})
+
+        self.user_supervisor.refresh_from_db()
+        self.assertGreater(self.user_supervisor.updated_at, updated_at)
+
     def test_update_supervisor_description_and_limits_together(self):
         initial_bacherol_limit = self.supervisor_profile.bacherol_limit
         new_description = "Combined update test"
@@ -388,6 +396,15 @@ class UserServiceTests(TestCase):
         self.assertIn('Dodano tagi: Django, REST API', log_entry.description)
         self.assertNotIn('Usunięto tagi:', log_entry.description)
 
+    def test_update_user_tags_bumps_updated_at(self):
+        user = self.user_student
+        updated_at = user.updated_at
+
+        user_service.update_user_tags(user, {'to_add': [self.tag_django]})
+
+        user.refresh_from_db()
+        self.assertGreater(user.updated_at, updated_at)
+
     def test_update_user_tags_removes_tags(self):
         user = self.user_supervisor
         initial_tag_names = sorted([tag.name for tag in user.tags.all()])
@@ -4,24 +4,27 @@ from rest_framework.response import Response
 from django.db.models import Q
 from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
 
+from thesis_system.conditional import ConditionalGetMixin
 from thesis_system.permissions import isCoordinator
+from thesis_system.query_plan import QueryPlanMixin
+from thesis_system.projection import ProjectionListMixin
 from users.serializers.department_user_list_serializer import DepartmentUserListSerializer
 from users.serializers.department_user_serializer import DepartmentUserSerializer
 from users.models import User, Role
 from users.services.coordinator_service import coordinator_service
 
 
-class DepartmentUserListViewSet(viewsets.ModelViewSet):
+class DepartmentUserListViewSet(ConditionalGetMixin, ProjectionListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     serializer_class = DepartmentUserListSerializer
     permission_classes = [IsAuthenticated, isCoordinator]
 
     def get_queryset(self):
         user = self.request.user
-        if not user.department:
+        if not user.department_id:
             return User.objects.none()
         return User.objects.filter(
             Q(role__in=[Role.STUDENT, Role.SUPERVISOR]),
-            department=user.department
+            department_id=user.department_id
         )
 
     def get_serializer_class(self):
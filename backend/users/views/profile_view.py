@@ -11,11 +11,19 @@ from users.serializers.user_serializer import UserSerializer
 from users.serializers.student_serializer import StudentProfileSerializer
 from users.serializers.supervisor_serializer import SupervisorProfileSerializer
 from users.services.user_service import user_service
+from thesis_system.conditional import ConditionalGetMixin
 
 
-class ProfileView(RetrieveUpdateAPIView):
+class ProfileView(ConditionalGetMixin, RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
 
+    def get_object_version(self):
+        return self.request.user.updated_at
+
+    def get_version_key_parts(self):
+        # The path is the same for everyone, two users can share `updated_at`.
+        return (self.request.user.pk,)
+
     def get_object(self):
         user = self.request.user
         if user.role == Role.STUDENT:
@@ -56,13 +64,10 @@ class ProfileView(RetrieveUpdateAPIView):
             validated_data = validated_data
         )
         if user_instance.role == Role.STUDENT:
-             updated_user_instance.studentprofile.refresh_from_db()
              return updated_user_instance.studentprofile
         elif user_instance.role == Role.SUPERVISOR:
-            updated_user_instance.supervisorprofile.refresh_from_db()
             return updated_user_instance.supervisorprofile
         elif user_instance.role in [Role.COORDINATOR, Role.ADMIN]:
-            updated_user_instance.refresh_from_db()
             return updated_user_instance
         else:
              raise NotImplementedError(f"Update logic for role '{user_instance.role}' is not defined in ProfileView.")
@@ -5,9 +5,13 @@ from django.db.models import Q
 from users.serializers.user_serializer import UserSerializer
 from users.serializers.user_list_serializer import UserListSerializer
 from users.models import User, Role, StudentProfile, SupervisorProfile
+from thesis_system.conditional import ConditionalGetMixin
+from thesis_system.query_plan import QueryPlanMixin
+from thesis_system.projection import ProjectionListMixin
+from thesis_system.sparse_fields import SparseFieldsMixin
 
 
-class UserListViewSet(viewsets.ReadOnlyModelViewSet):
+class UserListViewSet(ConditionalGetMixin, SparseFieldsMixin, ProjectionListMixin, QueryPlanMixin, viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.filter((Q(role=Role.STUDENT) | Q(role=Role.SUPERVISOR)) & Q(is_active=True))
     permission_classes = [IsAuthenticated]
     lookup_field = 'pk'
@@ -1,18 +1,26 @@
 export const getAllUsersPromotors = async () => {
     try {
-        const response = await fetch(`http://localhost:8000/users`, {
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            credentials: 'include',
-        });
+        const users = [];
+        let url: string | null = `http://localhost:8000/users/?limit=500`;
 
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}`);
+        while (url) {
+            const response = await fetch(url, {
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                credentials: 'include',
+            });
+
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+
+            const page = await response.json();
+            users.push(...page.results);
+            url = page.next;
         }
 
-        const data = await response.json();
-        return data;
+        return users;
     } catch (error) {
         console.error('donloading tags error:', error);
         throw error;
@@ -1,18 +1,26 @@
 export const getMyTheses = async () => {
     try {
-        const response = await fetch('http://localhost:8000/thesis/my-topics', {
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            credentials: 'include',
-        });
+        const theses = [];
+        let url: string | null = 'http://localhost:8000/thesis/my-topics/?limit=500';
 
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}`);
+        while (url) {
+            const response = await fetch(url, {
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                credentials: 'include',
+            });
+
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+
+            const page = await response.json();
+            theses.push(...page.results);
+            url = page.next;
         }
 
-        const data = await response.json();
-        return data;
+        return theses;
     } catch (error) {
         console.error('Błąd pobierania prac promotora:', error);
         throw error;